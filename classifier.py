@@ -14,6 +14,9 @@ vectorizer = joblib.load(VEC_PATH)
 
 stop_words = set(stopwords.words('english'))
 
+# Google Translate accepts up to 5000 characters per request
+TRANSLATE_CHUNK_CHARS = 4500
+
 CATEGORY_KEYWORDS = {
     "xenophobia": ["immigrants", "go back", "deport", "illegal alien", "invasion", "anchor baby"],
     "racism": ["white power", "black people", "slur", "ape", "nazi", "klan", "jews"],
@@ -41,9 +44,50 @@ def detect_language_and_translate(text):
         return text  # fallback
 
 
-def classify_text(text):
-    original_text = text
-    text = detect_language_and_translate(text)
+def _detect(text):
+    try:
+        return detect(text)
+    except:
+        return "en"
+
+
+def _translate_batch(texts):
+    """
+    Translate texts to English with as few requests as possible: texts are
+    joined one per line into chunks of up to TRANSLATE_CHUNK_CHARS. A chunk
+    whose line count does not survive translation falls back to per-text calls.
+    """
+    out = list(texts)
+    chunks, current, size = [], [], 0
+    for i, text in enumerate(texts):
+        line = re.sub(r'\s+', ' ', text).strip()
+        if current and size + len(line) + 1 > TRANSLATE_CHUNK_CHARS:
+            chunks.append(current)
+            current, size = [], 0
+        current.append((i, line))
+        size += len(line) + 1
+    if current:
+        chunks.append(current)
+
+    translator = GoogleTranslator(source='auto', target='en')
+    for chunk in chunks:
+        try:
+            translated = (translator.translate("\n".join(line for _, line in chunk)) or "").split("\n")
+        except Exception:
+            translated = []
+        if len(translated) == len(chunk):
+            for (i, _), line in zip(chunk, translated):
+                out[i] = line
+            continue
+        for i, line in chunk:
+            try:
+                out[i] = translator.translate(line) or texts[i]
+            except Exception:
+                pass  # fallback: classify the original text
+    return out
+
+
+def _classify_translated(original_text, text, original_language):
     cleaned = clean_text(text)
 
     matched_categories = []
@@ -63,5 +107,29 @@ def classify_text(text):
         "confidence": confidence,
         "category": matched_categories[0] if matched_categories else None,
         "explanation": f"Keyword(s) matched: {', '.join(set(matched_keywords))}" if matched_keywords else None,
-        "original_language": detect(original_text) if original_text != text else "en"
+        "original_language": original_language if original_text != text else "en"
+    }
+
+
+def classify_text(text):
+    original_text = text
+    text = detect_language_and_translate(text)
+    return _classify_translated(original_text, text, _detect(original_text) if original_text != text else "en")
+
+
+def classify_texts(texts):
+    """
+    classify_text for many texts at once. Language detection runs locally;
+    all non-English texts are translated together in batched requests instead
+    of one request per text. Returns results in input order.
+    """
+    texts = list(texts)
+    unique = list(dict.fromkeys(texts))
+    languages = {text: _detect(text) for text in unique}
+    foreign = [text for text in unique if languages[text] != "en"]
+    translations = dict(zip(foreign, _translate_batch(foreign))) if foreign else {}
+    results = {
+        text: _classify_translated(text, translations.get(text, text), languages[text])
+        for text in unique
     }
+    return [dict(results[text]) for text in texts]
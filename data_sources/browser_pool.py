@@ -0,0 +1,135 @@
+# osint_fastapi_app/data_sources/browser_pool.py
+import os
+import queue
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# Config
+# -------------------------
+POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+MAX_USES = int(os.getenv("BROWSER_MAX_USES", "50"))          # recycle a browser after this many pages
+PRELAUNCH = os.getenv("BROWSER_POOL_PRELAUNCH", "1").lower() in ("1", "true", "yes")
+ACQUIRE_TIMEOUT = float(os.getenv("BROWSER_ACQUIRE_TIMEOUT", "30"))
+PAGE_LOAD_TIMEOUT = 30
+
+
+@lru_cache(maxsize=1)
+def _driver_path() -> str:
+    """Resolve chromedriver once per process instead of once per request."""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def new_chrome() -> webdriver.Chrome:
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    driver = webdriver.Chrome(service=Service(_driver_path()), options=options)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    return driver
+
+
+# -------------------------
+# Pool
+# -------------------------
+class BrowserPool:
+    """
+    Up to `size` reusable headless browsers. `session()` lends one out and
+    always takes it back: a browser whose job raised is quit rather than
+    reused, and each browser is recycled after `max_uses` jobs, so crashed or
+    bloated Chrome processes never accumulate.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, max_uses: int = MAX_USES,
+                 factory: Callable[[], Any] = new_chrome):
+        self.size = size
+        self.max_uses = max_uses
+        self.factory = factory
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()  # (driver, uses); most recently used first
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.launched = self.recycled = self.discarded = 0
+
+    def _launch(self):
+        driver = self.factory()
+        with self._lock:
+            self.launched += 1
+        return driver
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Browser quit failed: {e}")
+
+    @contextmanager
+    def session(self, timeout: float = ACQUIRE_TIMEOUT) -> Iterator[Any]:
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("No browser available")
+        try:
+            try:
+                driver, uses = self._idle.get_nowait()
+            except queue.Empty:
+                driver, uses = self._launch(), 0
+            ok = False
+            try:
+                yield driver
+                ok = True
+            finally:
+                uses += 1
+                if ok and uses < self.max_uses:
+                    self._idle.put((driver, uses))
+                else:
+                    with self._lock:
+                        if ok:
+                            self.recycled += 1
+                        else:
+                            self.discarded += 1
+                    self._quit(driver)
+        finally:
+            self._slots.release()
+
+    def prelaunch(self, count: int = 1):
+        """Start `count` browsers in the background so the first request does not pay for it."""
+        def run():
+            for _ in range(max(0, min(count, self.size) - self._idle.qsize())):
+                try:
+                    self._idle.put((self._launch(), 0))
+                except Exception as e:
+                    logger.warning(f"Browser prelaunch failed: {e}")
+                    return
+        threading.Thread(target=run, name="browser-prelaunch", daemon=True).start()
+
+    def close(self):
+        while True:
+            try:
+                driver, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._quit(driver)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"size": self.size, "idle": self._idle.qsize(), "max_uses": self.max_uses,
+                    "launched": self.launched, "recycled": self.recycled, "discarded": self.discarded}
+
+
+browser_pool = BrowserPool()
+atexit.register(browser_pool.close)
+if PRELAUNCH:
+    browser_pool.prelaunch()
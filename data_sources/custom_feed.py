@@ -0,0 +1,161 @@
+# osint_fastapi_app/data_sources/custom_feed.py
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree.ElementTree import XMLPullParser, ParseError
+
+import requests
+import feedparser
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# Config
+# -------------------------
+MAX_BYTES = int(float(os.getenv("CUSTOM_FEED_MAX_MB", "5")) * 1024 * 1024)
+CACHE_TTL = float(os.getenv("CUSTOM_FEED_TTL", "300"))
+CACHE_ENTRIES = int(os.getenv("CUSTOM_FEED_CACHE_ENTRIES", "256"))
+TIMEOUT = float(os.getenv("CUSTOM_FEED_TIMEOUT", "10"))
+CHUNK_SIZE = 16 * 1024
+HEADERS = {"User-Agent": "Mozilla/5.0 (OSINT FastAPI feed reader)"}
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+ITEM_TAGS = {"item", f"{ATOM}entry", "{http://purl.org/rss/1.0/}item"}
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _item_to_dict(elem) -> Dict[str, str]:
+    """Entry fields from an RSS <item> or Atom <entry>, in the shape /api/rss/custom returns."""
+    out = {"title": "", "link": "", "summary": "", "published": ""}
+    for child in elem:
+        name = _local(child.tag)
+        text = (child.text or "").strip()
+        if name == "title":
+            out["title"] = text
+        elif name == "link":
+            href = child.get("href")
+            if href is None:
+                out["link"] = out["link"] or text
+            elif child.get("rel", "alternate") == "alternate" or not out["link"]:
+                out["link"] = href
+        elif name in ("description", "summary"):
+            out["summary"] = out["summary"] or text
+        elif name == "content" and not out["summary"]:
+            out["summary"] = text
+        elif name in ("pubDate", "published", "date", "updated"):
+            out["published"] = out["published"] or text
+    return out
+
+
+def _feedparser_fallback(body: bytes, limit: int) -> List[Dict[str, str]]:
+    """feedparser copes with the non-well-formed feeds the pull parser rejects."""
+    parsed = feedparser.parse(body)
+    return [
+        {
+            "title": e.get("title", ""),
+            "link": e.get("link", ""),
+            "summary": e.get("summary", ""),
+            "published": e.get("published", ""),
+        }
+        for e in parsed.entries[:limit]
+    ]
+
+
+def stream_entries(res: requests.Response, limit: int,
+                   max_bytes: int = MAX_BYTES) -> Tuple[List[Dict[str, str]], bool]:
+    """
+    Parse entries from a streamed response, reading only until `limit`
+    entries are parsed or `max_bytes` have arrived. Returns
+    (entries, complete) where `complete` means the whole document was read.
+    """
+    parser = XMLPullParser(events=("end",))
+    entries: List[Dict[str, str]] = []
+    received = bytearray()
+    complete = True
+    try:
+        for chunk in res.iter_content(chunk_size=CHUNK_SIZE):
+            received += chunk
+            parser.feed(chunk)
+            for _, elem in parser.read_events():
+                if elem.tag in ITEM_TAGS:
+                    entries.append(_item_to_dict(elem))
+                    elem.clear()
+            if len(entries) >= limit or len(received) >= max_bytes:
+                complete = False
+                break
+    except ParseError:
+        return _feedparser_fallback(bytes(received), limit), False
+    finally:
+        res.close()
+    return entries[:limit], complete
+
+
+# -------------------------
+# Cache
+# -------------------------
+class CustomFeedCache:
+    """
+    Per-URL cache of parsed custom feeds. Entries are fresh for `ttl`
+    seconds; after that the feed is revalidated with If-None-Match /
+    If-Modified-Since, and a 304 renews the cached entries without a download.
+    A cached parse only serves requests for up to as many entries as it
+    holds, unless it covered the whole feed.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL, max_entries: int = CACHE_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cached = self._entries.get(url)
+            if cached is not None:
+                self._entries.move_to_end(url)
+            return cached
+
+    def _put(self, url: str, cached: Dict[str, Any]):
+        with self._lock:
+            self._entries[url] = cached
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def fetch(self, url: str, max_posts: int) -> List[Dict[str, str]]:
+        cached = self._get(url)
+        usable = cached is not None and (cached["complete"] or len(cached["entries"]) >= max_posts)
+        if usable and time.time() - cached["fetched_at"] < self.ttl:
+            return cached["entries"][:max_posts]
+
+        headers = dict(HEADERS)
+        if usable:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("modified"):
+                headers["If-Modified-Since"] = cached["modified"]
+        res = requests.get(url, headers=headers, timeout=TIMEOUT, stream=True)
+        if res.status_code == 304 and usable:
+            res.close()
+            self._put(url, dict(cached, fetched_at=time.time()))
+            return cached["entries"][:max_posts]
+        res.raise_for_status()
+
+        entries, complete = stream_entries(res, max_posts)
+        self._put(url, {
+            "entries": entries,
+            "complete": complete,
+            "etag": res.headers.get("ETag"),
+            "modified": res.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        })
+        return entries
+
+
+custom_feed_cache = CustomFeedCache()
@@ -0,0 +1,299 @@
+# osint_fastapi_app/data_sources/feed_fetcher.py
+import os
+import json
+import time
+import logging
+import calendar
+import threading
+import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Any
+
+import requests
+import feedparser
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# Config
+# -------------------------
+MIN_INTERVAL = 60.0          # seconds between polls of a feed that keeps changing
+MAX_INTERVAL = 30 * 60.0     # ceiling for feeds that rarely change
+DEFAULT_INTERVAL = 5 * 60.0
+ERROR_INTERVAL = 2 * 60.0
+SPEEDUP = 0.5                # interval multiplier when new entries appear
+SLOWDOWN = 1.5               # multiplier when the feed is unchanged
+
+FETCH_CONCURRENCY = int(os.getenv("RSS_FETCH_CONCURRENCY", "16"))      # global cap on in-flight fetches
+PER_HOST_CONNECTIONS = int(os.getenv("RSS_PER_HOST_CONNECTIONS", "4"))  # pooled keep-alive connections per host
+FETCH_TIMEOUT = float(os.getenv("RSS_FETCH_TIMEOUT", "10"))             # per-feed connect/read timeout
+RSS_DEADLINE = float(os.getenv("RSS_DEADLINE", "8"))                    # max wait on feeds never fetched yet
+HEADERS = {"User-Agent": "Mozilla/5.0 (OSINT FastAPI feed reader)"}
+
+
+def load_feed_list(env_var: str, default: Dict[str, str]) -> Dict[str, str]:
+    """
+    Feed list from the file named by `env_var`, or `default` when it is unset.
+    The file is either JSON (an object of name -> url, or a list of urls)
+    or plain text with one `url` or `name = url` per line; # starts a comment.
+    """
+    path = os.getenv(env_var)
+    if not path:
+        return dict(default)
+    with open(path, encoding="utf-8") as f:
+        raw = f.read()
+    if path.endswith(".json"):
+        data = json.loads(raw)
+        return dict(data) if isinstance(data, dict) else {url: url for url in data}
+    feeds = {}
+    for line in raw.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        name, sep, url = line.partition("=")
+        if sep and not name.strip().startswith("http"):
+            feeds[name.strip()] = url.strip()
+        else:
+            feeds[line] = line
+    return feeds
+
+
+def _timestamp(entry) -> Optional[float]:
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    return float(calendar.timegm(parsed)) if parsed else None
+
+
+def entry_to_dict(entry) -> Dict[str, Any]:
+    """Plain, JSON-safe copy of a feedparser entry with the fields the endpoints use."""
+    return {
+        "id": entry.get("id") or entry.get("link", ""),
+        "title": entry.get("title", ""),
+        "link": entry.get("link", ""),
+        "summary": entry.get("summary", ""),
+        "published": entry.get("published", ""),
+        "published_ts": _timestamp(entry),
+    }
+
+
+# -------------------------
+# Feed state
+# -------------------------
+class FeedState:
+    def __init__(self, url: str):
+        self.url = url
+        self.etag: Optional[str] = None
+        self.modified: Optional[str] = None
+        self.entries: List[Dict[str, Any]] = []
+        self.fetched_at: Optional[float] = None
+        self.changed_at: Optional[float] = None
+        self.interval = DEFAULT_INTERVAL
+        self.next_due = 0.0
+        self.last_status: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "entries": len(self.entries),
+            "fetched_at": self.fetched_at,
+            "changed_at": self.changed_at,
+            "interval_seconds": round(self.interval),
+            "next_due": self.next_due,
+            "last_status": self.last_status,
+            "error": self.error,
+        }
+
+
+# -------------------------
+# Poller
+# -------------------------
+class FeedPoller:
+    """
+    Polls registered feeds in the background and keeps the parsed entries
+    in memory, so RSS endpoints only read a snapshot.
+
+    Due feeds are fetched concurrently on a pool of FETCH_CONCURRENCY
+    workers, each with its own timeout, over one keep-alive session per
+    host. A slow or dead feed therefore delays only itself.
+
+    Requests are conditional (ETag / Last-Modified): an unchanged feed
+    costs a 304 and no parsing. The poll interval adapts per feed: it
+    shrinks while new entries keep appearing and grows while the feed is
+    unchanged, within [MIN_INTERVAL, MAX_INTERVAL].
+    """
+
+    def __init__(self):
+        self.feeds: Dict[str, FeedState] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[str, List[Dict[str, Any]]], None]] = []
+        self._executor = ThreadPoolExecutor(max_workers=FETCH_CONCURRENCY, thread_name_prefix="feed-fetch")
+        self._inflight: Dict[str, Future] = {}
+        self._sessions: Dict[str, requests.Session] = {}
+
+    def subscribe(self, callback: Callable[[str, List[Dict[str, Any]]], None]):
+        """
+        Call `callback(url, entries)` with a feed's entries whenever a poll
+        returns new content. Snapshots already held are replayed immediately,
+        so subscribing after the first polls loses nothing.
+        """
+        with self._lock:
+            self._listeners.append(callback)
+            current = [(s.url, s.entries) for s in self.feeds.values() if s.entries]
+        for url, entries in current:
+            callback(url, entries)
+
+    def _notify(self, url: str, entries: List[Dict[str, Any]]):
+        for callback in list(self._listeners):
+            try:
+                callback(url, entries)
+            except Exception as e:
+                logger.error(f"Feed listener failed for {url}: {e}")
+
+    def register(self, urls: Iterable[str]):
+        with self._lock:
+            for url in urls:
+                if url not in self.feeds:
+                    self.feeds[url] = FeedState(url)
+        self.start()
+        self._wake.set()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="feed-poller", daemon=True)
+                self._thread.start()
+
+    # ----- Polling -----
+    def _session(self, url: str) -> requests.Session:
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=PER_HOST_CONNECTIONS)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update(HEADERS)
+                self._sessions[host] = session
+            return session
+
+    def _fetch(self, state: FeedState) -> Tuple[Optional[int], Optional[Any], Dict[str, str]]:
+        headers = {}
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.modified:
+            headers["If-Modified-Since"] = state.modified
+        res = self._session(state.url).get(state.url, headers=headers, timeout=FETCH_TIMEOUT)
+        if res.status_code == 304:
+            return 304, None, res.headers
+        parsed = feedparser.parse(res.content, response_headers={
+            "content-location": res.url,
+            "content-type": res.headers.get("Content-Type", ""),
+        })
+        return res.status_code, parsed, res.headers
+
+    def poll(self, state: FeedState):
+        """Fetch one feed (conditionally) and update its snapshot and interval."""
+        now = time.time()
+        parsed, headers, error = None, {}, None
+        try:
+            status, parsed, headers = self._fetch(state)
+        except Exception as e:
+            status, error = None, str(e)
+
+        if status == 304:
+            state.interval = min(state.interval * SLOWDOWN, MAX_INTERVAL)
+            state.error = None
+        elif parsed is not None and parsed.entries:
+            entries = [entry_to_dict(e) for e in parsed.entries]
+            known = {e["id"] for e in state.entries}
+            if any(e["id"] not in known for e in entries):
+                state.interval = max(state.interval * SPEEDUP, MIN_INTERVAL)
+                state.changed_at = now
+            else:
+                state.interval = min(state.interval * SLOWDOWN, MAX_INTERVAL)
+            state.entries = entries
+            state.etag = headers.get("ETag")
+            state.modified = headers.get("Last-Modified")
+            state.error = None
+            self._notify(state.url, entries)
+        else:
+            if parsed is not None:
+                error = str(parsed.get("bozo_exception") or f"no entries (HTTP {status})")
+            state.error = error
+            state.interval = ERROR_INTERVAL if not state.entries else state.interval
+            logger.warning(f"RSS poll failed for {state.url}: {state.error}")
+
+        state.last_status = status
+        state.fetched_at = now
+        state.next_due = now + (ERROR_INTERVAL if state.error else state.interval)
+
+    def _submit(self, state: FeedState) -> Future:
+        """Queue a poll of `state`, or return the one already in flight."""
+        with self._lock:
+            fut = self._inflight.get(state.url)
+            if fut is not None:
+                return fut
+            fut = self._executor.submit(self.poll, state)
+            self._inflight[state.url] = fut
+        # Outside the lock: the callback runs inline if the poll already finished
+        fut.add_done_callback(lambda _, url=state.url: self._finished(url))
+        return fut
+
+    def _finished(self, url: str):
+        with self._lock:
+            self._inflight.pop(url, None)
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            now = time.time()
+            with self._lock:
+                due = [s for s in self.feeds.values() if s.next_due <= now and s.url not in self._inflight]
+            for state in due:
+                self._submit(state)
+            with self._lock:
+                idle = [s.next_due for s in self.feeds.values() if s.url not in self._inflight]
+            next_due = min(idle, default=now + MAX_INTERVAL)
+            self._wake.wait(timeout=max(1.0, next_due - time.time()))
+            self._wake.clear()
+
+    # ----- Snapshots -----
+    def snapshot(self, urls: Iterable[str], deadline: float = RSS_DEADLINE) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str]]:
+        """
+        Current entries for each of `urls`. Feeds never fetched before are
+        fetched concurrently, waiting at most `deadline` seconds; those still
+        outstanding are returned (empty) in the second element.
+        """
+        urls = list(urls)
+        self.register(urls)
+        with self._lock:
+            states = [self.feeds[url] for url in urls]
+        cold = [self._submit(s) for s in states if s.fetched_at is None]
+        if cold:
+            wait(cold, timeout=deadline)
+        entries = {s.url: s.entries for s in states}
+        pending = [s.url for s in states if s.fetched_at is None]
+        return entries, pending
+
+    def entries(self, url: str) -> List[Dict[str, Any]]:
+        """Current entries for `url`; fetches inline only if the feed has never been polled."""
+        with self._lock:
+            state = self.feeds.get(url)
+        if state is None:
+            self.register([url])
+            state = self.feeds[url]
+        if state.fetched_at is None:
+            self._submit(state).result()
+        return state.entries
+
+    def status(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [s.as_dict() for s in self.feeds.values()]
+
+
+# Shared poller for every RSS endpoint
+feed_poller = FeedPoller()
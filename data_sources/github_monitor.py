@@ -1,15 +1,11 @@
 # osint_fastapi_app/data_sources/github_monitor.py
-import os, csv
-from datetime import datetime
+from typing import Optional
 import requests
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, HTTPException
 
-router = APIRouter()
+from osint_fastapi_app.data_sources.observation_store import observation_store, parse_time
 
-BASE_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
-DATA_DIR = os.path.join(BASE_DIR, "data")
-os.makedirs(DATA_DIR, exist_ok=True)
-CSV_PATH = os.path.join(DATA_DIR, "github_profiles.csv")
+router = APIRouter()
 
 @router.get("/profile-monitor")
 def monitor_github_profile(username: str = Query(..., description="GitHub username")):
@@ -26,11 +22,25 @@ def monitor_github_profile(username: str = Query(..., description="GitHub userna
             "avatar": data.get("avatar_url", ""),
             "profile": data.get("html_url", f"https://github.com/{username}")
         }
-        try:
-            with open(CSV_PATH, "a", newline="", encoding="utf-8") as f:
-                csv.writer(f).writerow([datetime.now()] + list(profile.values()))
-        except Exception:
-            pass
+        if "login" in data:
+            observation_store.record("github", profile["username"], profile)
         return profile
     except Exception as e:
         return {"error": str(e)}
+
+
+@router.get("/history")
+def github_history(username: Optional[str] = Query(None, description="Only observations of this user"),
+                   since: Optional[str] = Query(None, description="ISO date/time or epoch seconds"),
+                   until: Optional[str] = Query(None, description="ISO date/time or epoch seconds"),
+                   limit: int = Query(100, ge=1, le=1000)):
+    """Past profile observations, newest first (e.g. to follow follower counts over time)."""
+    try:
+        since_ts, until_ts = parse_time(since), parse_time(until)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="since/until must be ISO dates or epoch seconds")
+    return {
+        "username": username,
+        "stats": observation_store.stats("github"),
+        "results": observation_store.history("github", username, since_ts, until_ts, limit),
+    }
@@ -0,0 +1,218 @@
+# osint_fastapi_app/data_sources/graph_analytics.py
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Any, Hashable
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+# How many analysed graphs to keep results for
+CACHE_SIZE = 32
+
+
+# -------------------------
+# Sparse conversion
+# -------------------------
+def _edge_endpoints(graph: dict):
+    """Yield (source, target) for both graph shapes used in this app."""
+    for link in graph.get("links", []):
+        yield link["source"], link["target"]
+    for edge in graph.get("edges", []):
+        yield edge["from"], edge["to"]
+
+
+def graph_to_sparse(graph: dict) -> Tuple[List[str], Dict[str, dict], sparse.csr_matrix]:
+    """
+    Turn a {"nodes", "links"|"edges"} graph into an undirected, unweighted
+    CSR adjacency matrix. Returns (node ids, node lookup, matrix).
+    """
+    lookup = {n["id"]: n for n in graph.get("nodes", [])}
+    index: Dict[str, int] = {node_id: i for i, node_id in enumerate(lookup)}
+    rows, cols = [], []
+    for src, dst in _edge_endpoints(graph):
+        for node_id in (src, dst):
+            if node_id not in index:
+                index[node_id] = len(index)
+                lookup[node_id] = {"id": node_id, "label": node_id}
+        rows.append(index[src])
+        cols.append(index[dst])
+    ids = list(index)
+    return ids, lookup, edges_to_sparse(len(ids), rows, cols)
+
+
+def edges_to_sparse(n: int, rows, cols) -> sparse.csr_matrix:
+    """Symmetric 0/1 adjacency from edge index arrays; self-loops and duplicates dropped."""
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    keep = rows != cols
+    rows, cols = rows[keep], cols[keep]
+    data = np.ones(len(rows) * 2, dtype=np.float64)
+    adj = sparse.coo_matrix(
+        (data, (np.concatenate([rows, cols]), np.concatenate([cols, rows]))), shape=(n, n)
+    ).tocsr()
+    adj.data[:] = 1.0  # collapse parallel edges summed by tocsr()
+    return adj
+
+
+# -------------------------
+# Algorithms
+# -------------------------
+def pagerank(adj: sparse.csr_matrix, damping: float = 0.85, tol: float = 1e-8, max_iter: int = 100) -> np.ndarray:
+    """Power-iteration PageRank; dangling nodes redistribute uniformly."""
+    n = adj.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    out_degree = np.asarray(adj.sum(axis=1)).ravel()
+    dangling = out_degree == 0
+    inv_degree = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+    adj_t = adj.T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        spread = adj_t @ (rank * inv_degree)
+        new_rank = damping * (spread + rank[dangling].sum() / n) + (1.0 - damping) / n
+        if np.abs(new_rank - rank).sum() < tol:
+            return new_rank
+        rank = new_rank
+    return rank
+
+
+def _row_argmax(mat: sparse.csr_matrix) -> np.ndarray:
+    """
+    Column of the largest entry in every row (lowest column on ties). Sorting
+    all entries by (row, -value, column) once is far faster than scipy's
+    per-row sparse argmax. Every row must have at least one stored entry.
+    """
+    mat.sum_duplicates()
+    row_of = np.repeat(np.arange(mat.shape[0]), np.diff(mat.indptr))
+    order = np.lexsort((mat.indices, -mat.data, row_of))
+    return mat.indices[order][mat.indptr[:-1]]
+
+
+def label_propagation(adj: sparse.csr_matrix, max_iter: int = 20) -> np.ndarray:
+    """
+    Synchronous label propagation. Each round is one sparse product: row i of
+    (A + I) @ onehot(labels) counts the labels around node i, and the row
+    argmax becomes its new label. The identity term stops the oscillation
+    synchronous updates otherwise show on bipartite (user/site) graphs.
+    """
+    n = adj.shape[0]
+    labels = np.arange(n)
+    if n == 0:
+        return labels
+    walk = (adj + sparse.identity(n, format="csr")).tocsr()
+    rows = np.arange(n)
+    ones = np.ones(n)
+    for _ in range(max_iter):
+        onehot = sparse.csr_matrix((ones, (rows, labels)), shape=(n, n))
+        counts = (walk @ onehot).tocsr()
+        new_labels = _row_argmax(counts)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    # Renumber to 0..k-1
+    _, labels = np.unique(labels, return_inverse=True)
+    return labels
+
+
+def analyze(ids: List[str], lookup: Dict[str, dict], adj: sparse.csr_matrix,
+            communities: bool = True) -> Dict[str, Any]:
+    """Run every analysis once; callers slice the arrays per request."""
+    n = len(ids)
+    degree = np.asarray(adj.sum(axis=1)).ravel()
+    n_components, component = connected_components(adj, directed=False)
+    result = {
+        "ids": ids,
+        "lookup": lookup,
+        "degree": degree,
+        "degree_centrality": degree / (n - 1) if n > 1 else np.zeros(n),
+        "pagerank": pagerank(adj),
+        "n_components": int(n_components),
+        "component": component,
+        "community": label_propagation(adj) if communities else None,
+        "edges": int(adj.nnz // 2),
+    }
+    return result
+
+
+# -------------------------
+# Result cache
+# -------------------------
+class AnalyticsCache:
+    """Keeps analysis results per graph until the graph's version changes."""
+
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, version: Hashable, result: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = (version, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+analytics_cache = AnalyticsCache()
+
+
+# -------------------------
+# Summaries
+# -------------------------
+def _group_summary(labels: np.ndarray, scores: np.ndarray, ids: List[str], lookup: Dict[str, dict],
+                   top: int, members: int) -> List[Dict[str, Any]]:
+    sizes = np.bincount(labels)
+    groups = []
+    for label in np.argsort(-sizes, kind="stable")[:top]:
+        idx = np.flatnonzero(labels == label)
+        best = idx[np.argsort(-scores[idx], kind="stable")[:members]]
+        groups.append({
+            "id": int(label),
+            "size": int(sizes[label]),
+            "top_members": [lookup.get(ids[i], {}).get("label", ids[i]) for i in best],
+        })
+    return groups
+
+
+def summarize(result: Dict[str, Any], top: int = 20, members: int = 5) -> Dict[str, Any]:
+    ids = result["ids"]
+    lookup = result["lookup"]
+    pr = result["pagerank"]
+    ranked = np.argsort(-pr, kind="stable")[:top]
+    central = []
+    for i in ranked:
+        node = lookup.get(ids[i], {})
+        central.append({
+            "id": ids[i],
+            "label": node.get("label", ids[i]),
+            "type": node.get("type"),
+            "degree": int(result["degree"][i]),
+            "degree_centrality": round(float(result["degree_centrality"][i]), 6),
+            "pagerank": round(float(pr[i]), 6),
+            "component": int(result["component"][i]),
+            "community": int(result["community"][i]) if result["community"] is not None else None,
+        })
+    summary = {
+        "nodes": len(ids),
+        "edges": result["edges"],
+        "central_nodes": central,
+        "components": {
+            "count": result["n_components"],
+            "largest": _group_summary(result["component"], pr, ids, lookup, top, members),
+        },
+    }
+    if result["community"] is not None:
+        summary["communities"] = {
+            "count": int(result["community"].max()) + 1 if len(ids) else 0,
+            "largest": _group_summary(result["community"], pr, ids, lookup, top, members),
+        }
+    return summary
@@ -0,0 +1,206 @@
+# osint_fastapi_app/data_sources/graph_export.py
+"""
+Streaming graph exporters.
+
+Nodes and edges are pulled lazily from the source graph and written out in
+chunks, so an export never builds a second copy of the graph in memory.
+Node ids are interned to integers in first-seen order; edges are numbered
+sequentially. The original node id is kept as the node's "key".
+
+Binary format ("OSG1"), all integers unsigned LEB128 varints:
+    b"OSG1"
+    node record:  b"N" id  len  attrs-json(utf-8)
+    edge record:  b"E" id  source-id  target-id  len  attrs-json(utf-8)
+Node records always precede the edges that reference them. NDJSON lines
+carry "kind": "node" | "edge" alongside the graph's own attributes.
+"""
+import json
+from typing import Dict, Iterable, Iterator, Tuple, Any
+from xml.sax.saxutils import escape, quoteattr
+
+CHUNK_RECORDS = 512
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "graphml": "application/graphml+xml",
+    "binary": "application/octet-stream",
+}
+EXTENSIONS = {"ndjson": "ndjson", "graphml": "graphml", "binary": "osg"}
+
+# A node is (id, attrs); an edge is (source id, target id, attrs)
+NodeIter = Iterable[Tuple[str, Dict[str, Any]]]
+EdgeIter = Iterable[Tuple[str, str, Dict[str, Any]]]
+
+
+# -------------------------
+# Sources
+# -------------------------
+def dict_graph_source(graph: dict) -> Tuple[NodeIter, EdgeIter]:
+    """Node/edge iterators over a stored {"nodes", "links"|"edges"} graph."""
+    def nodes():
+        for n in graph.get("nodes", []):
+            yield n["id"], {k: v for k, v in n.items() if k != "id"}
+
+    def edges():
+        for link in graph.get("links", []):
+            yield link["source"], link["target"], {k: v for k, v in link.items() if k not in ("source", "target")}
+        for edge in graph.get("edges", []):
+            yield edge["from"], edge["to"], {k: v for k, v in edge.items() if k not in ("from", "to")}
+
+    return nodes(), edges()
+
+
+# -------------------------
+# Interning
+# -------------------------
+class _Interner:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def get(self, key: str) -> Tuple[int, bool]:
+        """Return (int id, is_new)."""
+        idx = self.ids.get(key)
+        if idx is not None:
+            return idx, False
+        idx = len(self.ids)
+        self.ids[key] = idx
+        return idx, True
+
+
+def _records(nodes: NodeIter, edges: EdgeIter) -> Iterator[Tuple]:
+    """
+    ("node", int id, key, attrs) and ("edge", int id, src, dst, attrs)
+    records. Edge endpoints that were never declared as nodes get a bare
+    node record first.
+    """
+    interner = _Interner()
+    for key, attrs in nodes:
+        idx, is_new = interner.get(key)
+        if is_new:
+            yield ("node", idx, key, attrs)
+    for edge_id, (src, dst, attrs) in enumerate(edges):
+        ends = []
+        for key in (src, dst):
+            idx, is_new = interner.get(key)
+            if is_new:
+                yield ("node", idx, key, {})
+            ends.append(idx)
+        yield ("edge", edge_id, ends[0], ends[1], attrs)
+
+
+def _chunked(parts: Iterator, joiner):
+    buf = []
+    for part in parts:
+        buf.append(part)
+        if len(buf) >= CHUNK_RECORDS:
+            yield joiner(buf)
+            buf = []
+    if buf:
+        yield joiner(buf)
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+# -------------------------
+# NDJSON
+# -------------------------
+def iter_ndjson(nodes: NodeIter, edges: EdgeIter) -> Iterator[bytes]:
+    def lines():
+        for rec in _records(nodes, edges):
+            if rec[0] == "node":
+                _, idx, key, attrs = rec
+                yield _dumps({**attrs, "kind": "node", "id": idx, "key": key}) + "\n"
+            else:
+                _, idx, src, dst, attrs = rec
+                yield _dumps({**attrs, "kind": "edge", "id": idx, "source": src, "target": dst}) + "\n"
+    return _chunked(lines(), lambda buf: "".join(buf).encode("utf-8"))
+
+
+# -------------------------
+# GraphML
+# -------------------------
+_GRAPHML_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+    '  <key id="key" for="node" attr.name="key" attr.type="string"/>\n'
+    '  <key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+    '  <key id="ntype" for="node" attr.name="type" attr.type="string"/>\n'
+    '  <key id="nattrs" for="node" attr.name="attrs" attr.type="string"/>\n'
+    '  <key id="etype" for="edge" attr.name="type" attr.type="string"/>\n'
+    '  <key id="eattrs" for="edge" attr.name="attrs" attr.type="string"/>\n'
+    '  <graph id="G" edgedefault="undirected">\n'
+)
+_GRAPHML_FOOTER = "  </graph>\n</graphml>\n"
+
+
+def _data(key: str, value) -> str:
+    return f'<data key="{key}">{escape(str(value))}</data>'
+
+
+def iter_graphml(nodes: NodeIter, edges: EdgeIter) -> Iterator[bytes]:
+    """GraphML with label/type as typed keys; remaining attributes as one JSON string."""
+    def elements():
+        yield _GRAPHML_HEADER
+        for rec in _records(nodes, edges):
+            if rec[0] == "node":
+                _, idx, key, attrs = rec
+                rest = {k: v for k, v in attrs.items() if k not in ("label", "type")}
+                parts = [_data("key", key)]
+                if "label" in attrs:
+                    parts.append(_data("label", attrs["label"]))
+                if "type" in attrs:
+                    parts.append(_data("ntype", attrs["type"]))
+                if rest:
+                    parts.append(_data("nattrs", _dumps(rest)))
+                yield f'    <node id="n{idx}">{"".join(parts)}</node>\n'
+            else:
+                _, idx, src, dst, attrs = rec
+                rest = {k: v for k, v in attrs.items() if k != "type"}
+                parts = []
+                if "type" in attrs:
+                    parts.append(_data("etype", attrs["type"]))
+                if rest:
+                    parts.append(_data("eattrs", _dumps(rest)))
+                yield (f'    <edge id={quoteattr("e%d" % idx)} source="n{src}" target="n{dst}">'
+                       f'{"".join(parts)}</edge>\n')
+        yield _GRAPHML_FOOTER
+    return _chunked(elements(), lambda buf: "".join(buf).encode("utf-8"))
+
+
+# -------------------------
+# Binary
+# -------------------------
+def _uvarint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def iter_binary(nodes: NodeIter, edges: EdgeIter) -> Iterator[bytes]:
+    def records():
+        yield b"OSG1"
+        for rec in _records(nodes, edges):
+            if rec[0] == "node":
+                _, idx, key, attrs = rec
+                payload = _dumps({**attrs, "key": key}).encode("utf-8")
+                yield b"N" + _uvarint(idx) + _uvarint(len(payload)) + payload
+            else:
+                _, idx, src, dst, attrs = rec
+                payload = _dumps(attrs).encode("utf-8") if attrs else b""
+                yield b"E" + _uvarint(idx) + _uvarint(src) + _uvarint(dst) + _uvarint(len(payload)) + payload
+    return _chunked(records(), b"".join)
+
+
+EXPORTERS = {
+    "ndjson": iter_ndjson,
+    "graphml": iter_graphml,
+    "binary": iter_binary,
+}
@@ -0,0 +1,238 @@
+# osint_fastapi_app/data_sources/graph_renderer.py
+import os
+import glob
+import queue
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple, Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# Config
+# -------------------------
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+GRAPHS_DIR = os.path.join(BASE_DIR, "static", "graphs")
+os.makedirs(GRAPHS_DIR, exist_ok=True)
+
+RENDER_QUOTA_BYTES = int(float(os.getenv("GRAPH_RENDER_QUOTA_MB", "200")) * 1024 * 1024)
+LARGE_GRAPH_NODES = 300   # above this, skip networkx and use the vectorized layout
+LAYOUT_ITERATIONS = 50
+FORMATS = ("png", "svg")
+MAX_TRACKED_RENDERS = 1000
+
+
+def graph_hash(edges: List[Tuple[str, str]], node_ids: List[str], fmt: str) -> str:
+    """Content hash of the drawn structure; labels are not drawn, so they are not hashed."""
+    h = hashlib.sha1(fmt.encode())
+    for node_id in sorted(node_ids):
+        h.update(b"n\0" + str(node_id).encode("utf-8") + b"\0")
+    for a, b in sorted(edges):
+        h.update(b"e\0" + str(a).encode("utf-8") + b"\0" + str(b).encode("utf-8") + b"\0")
+    return h.hexdigest()[:20]
+
+
+def _file_name(render_id: str, fmt: str) -> str:
+    return f"social_{render_id}.{fmt}"
+
+
+def image_url(render_id: str, fmt: str) -> str:
+    return f"/static/graphs/{_file_name(render_id, fmt)}"
+
+
+# -------------------------
+# Layout
+# -------------------------
+def fast_layout(n: int, src: np.ndarray, dst: np.ndarray,
+                iterations: int = LAYOUT_ITERATIONS, seed: int = 42) -> np.ndarray:
+    """
+    Fruchterman-Reingold with a one-level Barnes-Hut approximation: nodes are
+    bucketed into a grid and repulsion is computed against cell centroids
+    (weighted by cell population) instead of every other node. Attraction is
+    summed over the edge arrays. Every step is a numpy array operation.
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2))
+    if n < 2:
+        return pos
+    k = 1.0 / np.sqrt(n)
+    grid = int(min(16, max(2, np.sqrt(n) / 2)))
+    temperature = 0.1
+    cool = temperature / (iterations + 1)
+    chunk = 2048
+
+    for _ in range(iterations):
+        # --- repulsion against cell centroids ---
+        span = pos.max(axis=0) - pos.min(axis=0) + 1e-9
+        cell_xy = np.clip(((pos - pos.min(axis=0)) / span * grid).astype(int), 0, grid - 1)
+        cell = cell_xy[:, 0] * grid + cell_xy[:, 1]
+        counts = np.bincount(cell, minlength=grid * grid)
+        occupied = np.flatnonzero(counts)
+        centroids = np.stack([
+            np.bincount(cell, weights=pos[:, 0], minlength=grid * grid)[occupied],
+            np.bincount(cell, weights=pos[:, 1], minlength=grid * grid)[occupied],
+        ], axis=1) / counts[occupied, None]
+        weight = counts[occupied].astype(float)
+
+        disp = np.zeros_like(pos)
+        for start in range(0, n, chunk):
+            dx = pos[start:start + chunk, 0, None] - centroids[None, :, 0]
+            dy = pos[start:start + chunk, 1, None] - centroids[None, :, 1]
+            push = (k * k) * weight / np.maximum(dx * dx + dy * dy, 1e-6)
+            disp[start:start + chunk, 0] = (dx * push).sum(axis=1)
+            disp[start:start + chunk, 1] = (dy * push).sum(axis=1)
+
+        # --- attraction along edges ---
+        if len(src):
+            delta = pos[src] - pos[dst]
+            dist = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 1e-6)
+            pull = delta * (dist / k)[:, None]
+            np.add.at(disp, src, -pull)
+            np.add.at(disp, dst, pull)
+
+        length = np.maximum(np.sqrt((disp ** 2).sum(axis=1)), 1e-9)
+        pos += disp / length[:, None] * np.minimum(length, temperature)[:, None]
+        temperature -= cool
+    return pos
+
+
+def _layout(node_ids: List[str], edges: List[Tuple[str, str]]) -> np.ndarray:
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    src = np.array([index[a] for a, _ in edges], dtype=int)
+    dst = np.array([index[b] for _, b in edges], dtype=int)
+    if len(node_ids) <= LARGE_GRAPH_NODES:
+        import networkx as nx
+        G = nx.Graph()
+        G.add_nodes_from(range(len(node_ids)))
+        G.add_edges_from(zip(src.tolist(), dst.tolist()))
+        pos = nx.spring_layout(G, seed=42)
+        return np.array([pos[i] for i in range(len(node_ids))])
+    return fast_layout(len(node_ids), src, dst)
+
+
+# -------------------------
+# Drawing
+# -------------------------
+def draw(node_ids: List[str], edges: List[Tuple[str, str]], path: str, fmt: str):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    pos = _layout(node_ids, edges)
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    segments = [(pos[index[a]], pos[index[b]]) for a, b in edges]
+    size = 500 if len(node_ids) <= LARGE_GRAPH_NODES else max(4, 20000 / len(node_ids))
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.add_collection(LineCollection(segments, colors="k", linewidths=0.5, alpha=0.6, zorder=1))
+    ax.scatter(pos[:, 0], pos[:, 1], s=size, c="#1f78b4", zorder=2)
+    ax.set_axis_off()
+    ax.autoscale()
+    tmp_path = f"{path}.tmp"
+    fig.savefig(tmp_path, dpi=150, format=fmt)
+    plt.close(fig)
+    os.replace(tmp_path, path)  # atomic, so other workers never serve a half-written file
+
+
+def collect_garbage(quota_bytes: int = RENDER_QUOTA_BYTES) -> int:
+    """Delete least-recently-used renders until the directory fits the quota. Returns files removed."""
+    files = []
+    for fmt in FORMATS:
+        for path in glob.glob(os.path.join(GRAPHS_DIR, f"social_*.{fmt}")):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in files)
+    removed = 0
+    for _, size, path in sorted(files):
+        if total <= quota_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+# -------------------------
+# Background renderer
+# -------------------------
+class GraphRenderer:
+    """
+    Single background thread (matplotlib is not thread-safe) rendering graphs
+    into GRAPHS_DIR, keyed by content hash. A render already on disk is a cache
+    hit; its mtime is bumped so garbage collection evicts least-recently-used.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[Tuple[str, str, List[str], List[Tuple[str, str]]]]" = queue.Queue()
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="graph-renderer", daemon=True)
+                self._worker.start()
+
+    def _path(self, render_id: str, fmt: str) -> str:
+        return os.path.join(GRAPHS_DIR, _file_name(render_id, fmt))
+
+    def request(self, node_ids: List[str], edges: List[Tuple[str, str]], fmt: str = "png") -> Dict[str, Any]:
+        """Return the render's status, queueing it if it is neither on disk nor in progress."""
+        render_id = graph_hash(edges, node_ids, fmt)
+        path = self._path(render_id, fmt)
+        if os.path.exists(path):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return {"render_id": render_id, "status": "ready", "image_url": image_url(render_id, fmt)}
+        with self._lock:
+            current = self._status.get(render_id)
+            if current is None or current["status"] == "error":
+                self._status[render_id] = {"status": "pending", "format": fmt}
+                self._queue.put((render_id, fmt, list(node_ids), list(edges)))
+        self._ensure_worker()
+        return self.status(render_id)
+
+    def status(self, render_id: str) -> Dict[str, Any]:
+        with self._lock:
+            state = dict(self._status.get(render_id) or {})
+        for fmt in FORMATS:
+            if os.path.exists(self._path(render_id, fmt)) and state.get("format", fmt) == fmt:
+                return {"render_id": render_id, "status": "ready", "image_url": image_url(render_id, fmt)}
+        if not state:
+            return {"render_id": render_id, "status": "unknown", "image_url": None}
+        return {"render_id": render_id, "status": state["status"], "image_url": None,
+                "error": state.get("error")}
+
+    def _run(self):
+        while True:
+            render_id, fmt, node_ids, edges = self._queue.get()
+            try:
+                draw(node_ids, edges, self._path(render_id, fmt), fmt)
+                with self._lock:
+                    # The file on disk is now the source of truth
+                    self._status.pop(render_id, None)
+                collect_garbage()
+            except Exception as e:
+                logger.error(f"Graph render {render_id} failed: {e}")
+                with self._lock:
+                    self._status[render_id] = {"status": "error", "format": fmt, "error": str(e)}
+                    while len(self._status) > MAX_TRACKED_RENDERS:
+                        self._status.pop(next(iter(self._status)))
+            finally:
+                self._queue.task_done()
+
+
+renderer = GraphRenderer()
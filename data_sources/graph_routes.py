@@ -1,9 +1,14 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 import subprocess
 import re
 
+from osint_fastapi_app.data_sources.graph_store import IndexedGraph, graph_store
+from osint_fastapi_app.data_sources.identity_graph import identity_graph
+from osint_fastapi_app.data_sources import graph_analytics, graph_export
+
 # ✅ Use your Maigret runner (with a safe fallback import path)
 try:
     from osint_fastapi_app.data_sources.maigret_runner import run_maigret as maigret_run
@@ -23,20 +28,17 @@ class GraphInput(BaseModel):
     sherlock: List[SiteResult] = []
     maigret: List[SiteResult] = []
 
-# ----- IN-MEMORY STORAGE -----
-graphs: Dict[str, Dict] = {}
-
 # ----- GRAPH BUILDER -----
 def build_graph(username: str, sherlock: List[dict], maigret: List[dict]):
-    nodes = [{"id": username, "type": "user", "label": username}]
-    links = []
-    added_sites = set()
+    graph = IndexedGraph()
+    graph.add_node({"id": username, "type": "user", "label": username})
 
     def add_site(result: dict, source: str):
         site_id = result["site"]
         url = result["url"]
 
-        if site_id not in added_sites:
+        existing = graph.get_node(site_id)
+        if existing is None:
             node = {
                 "id": site_id,
                 "type": "site",
@@ -49,15 +51,12 @@ def build_graph(username: str, sherlock: List[dict], maigret: List[dict]):
                 if v is not None:
                     node[k] = v
 
-            nodes.append(node)
-            added_sites.add(site_id)
-        else:
+            graph.add_node(node)
+        elif "urls" in existing and url not in existing["urls"]:
             # append URL if new
-            for n in nodes:
-                if n["id"] == site_id and "urls" in n and url not in n["urls"]:
-                    n["urls"].append(url)
+            existing["urls"].append(url)
 
-        links.append({
+        graph.add_link({
             "source": username,
             "target": site_id,
             "type": source,
@@ -69,7 +68,7 @@ def build_graph(username: str, sherlock: List[dict], maigret: List[dict]):
     for m in maigret:
         add_site(m, "maigret")
 
-    return {"nodes": nodes, "links": links}
+    return graph.to_dict()
 
 # ----- SHERLOCK HELPER -----
 def run_sherlock(username: str):
@@ -143,6 +142,114 @@ def run_maigret(username: str):
     return results
 
 # ----- ROUTES -----
+# Fixed-prefix routes must be registered before the catch-all "/{tool}/{username}".
+@router.get("/stored")
+async def list_stored_graphs(prefix: str = Query("", description="Only keys starting with this prefix"),
+                             limit: int = Query(100, ge=1, le=1000)):
+    """List stored graph keys, most recently updated first."""
+    return {"graphs": graph_store.list(prefix, limit), "store": graph_store.stats()}
+
+def _parse_types(value: str) -> set:
+    return {t.strip().lower() for t in value.split(",") if t.strip()}
+
+@router.get("/identity/stats")
+async def identity_graph_stats():
+    """Size of the cross-investigation identity graph."""
+    return identity_graph.stats()
+
+@router.get("/identity/neighbors")
+def identity_neighbors(handle: str = Query(..., description="Username to start from"),
+                       k: int = Query(2, ge=1, le=6, description="Number of hops"),
+                       limit: int = Query(500, ge=1, le=20000, description="Maximum nodes returned"),
+                       exclude: str = Query("", description="Comma-separated node types not to traverse, e.g. 'site'"),
+                       max_degree: Optional[int] = Query(None, ge=1, description="Do not traverse nodes with more neighbours than this")):
+    """k-hop neighbourhood of a handle across every investigation ingested so far."""
+    result = identity_graph.neighbors(handle, k, limit, _parse_types(exclude), max_degree)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"'{handle}' is not in the identity graph")
+    return result
+
+@router.get("/identity/path")
+def identity_path(source: str = Query(..., description="First handle"),
+                  target: str = Query(..., description="Second handle"),
+                  max_depth: int = Query(6, ge=1, le=12),
+                  exclude: str = Query("", description="Comma-separated node types not to traverse, e.g. 'site'"),
+                  max_degree: Optional[int] = Query(None, ge=1, description="Do not traverse nodes with more neighbours than this")):
+    """Shortest chain of shared attributes linking two handles."""
+    path = identity_graph.shortest_path(source, target, max_depth, _parse_types(exclude), max_degree)
+    if path is None:
+        return {"source": source, "target": target, "connected": False, "path": []}
+    return {"source": source, "target": target, "connected": True, "hops": len(path) - 1, "path": path}
+
+@router.get("/identity/analytics")
+def identity_analytics(top: int = Query(20, ge=1, le=500),
+                       members: int = Query(5, ge=1, le=50),
+                       communities: bool = Query(True, description="Also run label-propagation community detection")):
+    """Centrality, components and communities over the whole identity graph."""
+    identity_graph.sync()
+    cache_key = ("identity", communities)
+    version = identity_graph.version
+    result = graph_analytics.analytics_cache.get(cache_key, version)
+    if result is None:
+        version, ids, lookup, rows, cols = identity_graph.edge_index()
+        adj = graph_analytics.edges_to_sparse(len(ids), rows, cols)
+        result = graph_analytics.analyze(ids, lookup, adj, communities)
+        graph_analytics.analytics_cache.put(cache_key, version, result)
+    return {"graph": "identity", "version": version, **graph_analytics.summarize(result, top, members)}
+
+@router.get("/stored/{key:path}/analytics")
+def stored_graph_analytics(key: str,
+                           top: int = Query(20, ge=1, le=500),
+                           members: int = Query(5, ge=1, le=50),
+                           communities: bool = Query(True, description="Also run label-propagation community detection")):
+    """Centrality, components and communities for one stored graph."""
+    version = graph_store.version(key)
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"No stored graph for '{key}'")
+    cache_key = ("stored", key, communities)
+    result = graph_analytics.analytics_cache.get(cache_key, version)
+    if result is None:
+        graph = graph_store.get(key)
+        if graph is None:
+            raise HTTPException(status_code=404, detail=f"No stored graph for '{key}'")
+        ids, lookup, adj = graph_analytics.graph_to_sparse(graph)
+        result = graph_analytics.analyze(ids, lookup, adj, communities)
+        graph_analytics.analytics_cache.put(cache_key, version, result)
+    return {"graph": key, "version": version, **graph_analytics.summarize(result, top, members)}
+
+def _export_response(name: str, fmt: str, nodes, edges) -> StreamingResponse:
+    safe = re.sub(r"[^a-zA-Z0-9_.-]+", "_", name)[:80]
+    return StreamingResponse(
+        graph_export.EXPORTERS[fmt](nodes, edges),
+        media_type=graph_export.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{safe}.{graph_export.EXTENSIONS[fmt]}"'},
+    )
+
+@router.get("/identity/export")
+def export_identity_graph(format: str = Query("ndjson", pattern="^(ndjson|graphml|binary)$")):
+    """Stream the whole identity graph as NDJSON, GraphML or the compact binary format."""
+    nodes, edges = identity_graph.export_source()
+    return _export_response("identity_graph", format, nodes, edges)
+
+@router.get("/stored/{key:path}/export")
+def export_stored_graph(key: str, format: str = Query("ndjson", pattern="^(ndjson|graphml|binary)$")):
+    """Stream a stored graph (Sherlock/Maigret builds or 'social:<query>' graphs)."""
+    graph = graph_store.get(key)
+    if graph is None:
+        raise HTTPException(status_code=404, detail=f"No stored graph for '{key}'")
+    nodes, edges = graph_export.dict_graph_source(graph)
+    return _export_response(key, format, nodes, edges)
+
+# Keys can contain "/" (e.g. social graphs of a URL), so they are matched as paths;
+# the plain lookup goes after "/analytics" and "/export", which it would swallow.
+@router.get("/stored/{key:path}")
+async def get_stored_graph(key: str):
+    """Fetch a previously built graph, e.g. 'maigret:alice' or a manual build's username."""
+    graph = graph_store.get(key)
+    if graph is None:
+        raise HTTPException(status_code=404, detail=f"No stored graph for '{key}'")
+    return {"key": key, "version": graph_store.version(key), "graph": graph}
+
 @router.get("/{tool}/{username}")
 async def get_graph_by_tool(tool: str, username: str):
     """Run either Sherlock or Maigret for a username and return the graph."""
@@ -160,12 +267,16 @@ async def get_graph_by_tool(tool: str, username: str):
     else:
         raise HTTPException(status_code=400, detail="Tool must be 'sherlock' or 'maigret'")
 
-    graphs[f"{tool_l}:{username}"] = graph
+    graph_store.put(f"{tool_l}:{username}", graph)
+    identity_graph.ingest(username, results, source=tool_l)
     return {"results": results, "graph": graph}
 
 # Manual build route
 @router.post("/build")
 async def build_social_graph(data: GraphInput):
-    graph = build_graph(data.username, data.sherlock, data.maigret)
-    graphs[data.username] = graph
+    sherlock = [s.model_dump() for s in data.sherlock]
+    maigret = [m.model_dump() for m in data.maigret]
+    graph = build_graph(data.username, sherlock, maigret)
+    graph_store.put(data.username, graph)
+    identity_graph.ingest(data.username, sherlock + maigret, source="build")
     return graph
@@ -0,0 +1,231 @@
+# osint_fastapi_app/data_sources/graph_store.py
+import os
+import json
+import zlib
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Any
+
+# -------------------------
+# Config
+# -------------------------
+BASE_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+os.makedirs(DATA_DIR, exist_ok=True)
+DB_PATH = os.getenv("GRAPH_STORE_PATH", os.path.join(DATA_DIR, "graph_store.sqlite3"))
+
+# Soft cap on the serialized size of graphs kept in this worker's memory.
+MAX_MEMORY_BYTES = int(os.getenv("GRAPH_STORE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+# -------------------------
+# Indexed graph
+# -------------------------
+class IndexedGraph:
+    """
+    Node/link lists in the {"nodes": [...], "links": [...]} shape the frontend
+    expects, plus O(1) indexes on node id and (source, target) pairs.
+    """
+
+    def __init__(self):
+        self.nodes: List[dict] = []
+        self.links: List[dict] = []
+        self._node_index: Dict[str, int] = {}
+        self._edge_index: Dict[Tuple[str, str], List[int]] = {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "IndexedGraph":
+        g = cls()
+        for n in data.get("nodes", []):
+            g.add_node(n)
+        for link in data.get("links", []):
+            g.add_link(link)
+        return g
+
+    def get_node(self, node_id: str) -> Optional[dict]:
+        idx = self._node_index.get(node_id)
+        return self.nodes[idx] if idx is not None else None
+
+    def has_node(self, node_id: str) -> bool:
+        return node_id in self._node_index
+
+    def add_node(self, node: dict) -> dict:
+        """Add a node unless its id is already present; returns the stored node."""
+        existing = self.get_node(node["id"])
+        if existing is not None:
+            return existing
+        self._node_index[node["id"]] = len(self.nodes)
+        self.nodes.append(node)
+        return node
+
+    def get_links(self, source: str, target: str) -> List[dict]:
+        return [self.links[i] for i in self._edge_index.get((source, target), [])]
+
+    def has_edge(self, source: str, target: str) -> bool:
+        return (source, target) in self._edge_index
+
+    def add_link(self, link: dict) -> dict:
+        key = (link["source"], link["target"])
+        self._edge_index.setdefault(key, []).append(len(self.links))
+        self.links.append(link)
+        return link
+
+    def to_dict(self) -> dict:
+        return {"nodes": self.nodes, "links": self.links}
+
+
+# -------------------------
+# Graph store
+# -------------------------
+class GraphStore:
+    """
+    Key -> graph store shared by all workers.
+
+    Every write goes to a local SQLite file (WAL mode), so graphs survive
+    restarts and are visible to other uvicorn workers. Each worker keeps an
+    LRU of decoded graphs capped at `max_memory_bytes`; evicted graphs are
+    simply re-read from disk on the next access. A per-key version counter
+    lets a worker notice that another process has replaced a graph.
+    """
+
+    def __init__(self, path: str = DB_PATH, max_memory_bytes: int = MAX_MEMORY_BYTES):
+        self.path = path
+        self.max_memory_bytes = max_memory_bytes
+        self._lru: "OrderedDict[str, Tuple[dict, int, int]]" = OrderedDict()  # key -> (graph, size, version)
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._init_db()
+
+    # ----- SQLite -----
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        conn = self._conn()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS graphs (
+                key TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                version INTEGER NOT NULL DEFAULT 1,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_graphs_updated ON graphs(updated_at)")
+        conn.commit()
+
+    # ----- LRU -----
+    def _remember(self, key: str, graph: dict, size: int, version: int):
+        with self._lock:
+            old = self._lru.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= old[1]
+            self._lru[key] = (graph, size, version)
+            self._memory_bytes += size
+            # Always keep the most recent entry, even if it alone exceeds the cap
+            while self._memory_bytes > self.max_memory_bytes and len(self._lru) > 1:
+                _, (_, evicted_size, _) = self._lru.popitem(last=False)
+                self._memory_bytes -= evicted_size
+
+    def _forget(self, key: str):
+        with self._lock:
+            old = self._lru.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= old[1]
+
+    # ----- Public API -----
+    def put(self, key: str, graph: dict) -> int:
+        """Store a graph under `key` and return its new version."""
+        payload = json.dumps(graph, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO graphs (key, data, size, version, updated_at) VALUES (?, ?, ?, 1, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    data = excluded.data,
+                    size = excluded.size,
+                    version = graphs.version + 1,
+                    updated_at = excluded.updated_at
+                """,
+                (key, zlib.compress(payload, 6), len(payload), time.time()),
+            )
+            version = conn.execute("SELECT version FROM graphs WHERE key = ?", (key,)).fetchone()[0]
+        self._remember(key, graph, len(payload), version)
+        return version
+
+    def version(self, key: str) -> Optional[int]:
+        row = self._conn().execute("SELECT version FROM graphs WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, key: str) -> Optional[dict]:
+        disk_version = self.version(key)
+        if disk_version is None:
+            self._forget(key)
+            return None
+
+        with self._lock:
+            cached = self._lru.get(key)
+            if cached is not None and cached[2] == disk_version:
+                self._lru.move_to_end(key)
+                return cached[0]
+
+        row = self._conn().execute(
+            "SELECT data, size, version FROM graphs WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        graph = json.loads(zlib.decompress(row[0]).decode("utf-8"))
+        self._remember(key, graph, row[1], row[2])
+        return graph
+
+    def delete(self, key: str) -> bool:
+        self._forget(key)
+        conn = self._conn()
+        with conn:
+            cur = conn.execute("DELETE FROM graphs WHERE key = ?", (key,))
+        return cur.rowcount > 0
+
+    def list(self, prefix: str = "", limit: int = 100) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT key, size, version, updated_at FROM graphs "
+            "WHERE key LIKE ? ESCAPE '\\' ORDER BY updated_at DESC LIMIT ?",
+            (_like_prefix(prefix), limit),
+        ).fetchall()
+        return [
+            {"key": k, "size": size, "version": v, "updated_at": updated_at}
+            for k, size, v, updated_at in rows
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        count, total = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM graphs"
+        ).fetchone()
+        with self._lock:
+            return {
+                "stored_graphs": count,
+                "stored_bytes": total,
+                "memory_graphs": len(self._lru),
+                "memory_bytes": self._memory_bytes,
+                "memory_cap_bytes": self.max_memory_bytes,
+            }
+
+
+def _like_prefix(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+# Shared instance used by the graph routes
+graph_store = GraphStore()
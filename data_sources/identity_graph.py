@@ -0,0 +1,305 @@
+# osint_fastapi_app/data_sources/identity_graph.py
+import os
+import re
+import json
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Set, Iterable, Any
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: fall back to the in-process lock only
+    fcntl = None
+
+# -------------------------
+# Config
+# -------------------------
+BASE_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+os.makedirs(DATA_DIR, exist_ok=True)
+LOG_PATH = os.getenv("IDENTITY_GRAPH_LOG", os.path.join(DATA_DIR, "identity_graph.jsonl"))
+
+# Maigret/Sherlock result fields that become shared attribute nodes
+ATTRIBUTE_FIELDS = {
+    "url": "url",
+    "image": "image",
+    "gravatar_url": "gravatar",
+    "fullname": "fullname",
+}
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def _norm_text(value: str) -> str:
+    return re.sub(r"\s+", " ", str(value)).strip().casefold()
+
+
+def _norm_url(value: str) -> str:
+    url = str(value).strip()
+    m = re.match(r"^(https?)://([^/?#]+)(.*)$", url, re.I)
+    if m:
+        url = f"{m.group(1).lower()}://{m.group(2).lower()}{m.group(3)}"
+    return url.rstrip("/")
+
+
+def user_id(username: str) -> str:
+    return f"user:{_norm_text(username)}"
+
+
+def _attribute_id(kind: str, value: Any) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    if kind in ("url", "image", "gravatar"):
+        norm = _norm_url(value)
+    else:
+        norm = _norm_text(value)
+    return f"{kind}:{norm}" if norm else None
+
+
+# -------------------------
+# Identity graph
+# -------------------------
+class IdentityGraph:
+    """
+    Accumulating graph that links usernames across investigations through
+    the sites, profile URLs, images, gravatars and full names they share.
+
+    Every ingest is appended to a JSONL log; each worker replays the log
+    incrementally (tracking its byte offset), so all workers converge on the
+    same graph and it survives restarts. Queries run against an in-memory
+    adjacency index (node id -> set of neighbour ids).
+    """
+
+    def __init__(self, log_path: str = LOG_PATH):
+        self.log_path = log_path
+        self.nodes: Dict[str, dict] = {}
+        self.adj: Dict[str, Set[str]] = {}
+        self.version = 0
+        self._offset = 0
+        self._lock = threading.RLock()
+        self.sync()
+
+    # ----- Inserts -----
+    def _add_node(self, node_id: str, node_type: str, label: str):
+        if node_id not in self.nodes:
+            self.nodes[node_id] = {"id": node_id, "type": node_type, "label": label}
+            self.adj[node_id] = set()
+
+    def _add_edge(self, a: str, b: str):
+        self.adj[a].add(b)
+        self.adj[b].add(a)
+
+    def _apply(self, record: dict):
+        username = record.get("username")
+        if not username:
+            return
+        uid = user_id(username)
+        self._add_node(uid, "user", username)
+        for result in record.get("results", []):
+            site = result.get("site")
+            if site:
+                sid = f"site:{_norm_text(site)}"
+                self._add_node(sid, "site", site)
+                self._add_edge(uid, sid)
+            for field, kind in ATTRIBUTE_FIELDS.items():
+                aid = _attribute_id(kind, result.get(field))
+                if aid:
+                    self._add_node(aid, kind, str(result[field]))
+                    self._add_edge(uid, aid)
+        self.version += 1
+
+    def sync(self):
+        """Apply records appended to the log (by any worker) since the last sync."""
+        if not os.path.exists(self.log_path):
+            return
+        with self._lock:
+            if os.path.getsize(self.log_path) <= self._offset:
+                return
+            with open(self.log_path, "rb") as f:
+                f.seek(self._offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # partially written line; pick it up next time
+                    self._offset += len(line)
+                    try:
+                        self._apply(json.loads(line))
+                    except ValueError:
+                        continue
+
+    def ingest(self, username: str, results: Iterable[dict], source: str = ""):
+        """Append one investigation's results to the log and fold them in."""
+        fields = ("site",) + tuple(ATTRIBUTE_FIELDS)
+        record = {
+            "username": username,
+            "source": source,
+            "results": [{k: r[k] for k in fields if r.get(k) is not None} for r in results],
+        }
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            with open(self.log_path, "ab") as f:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.write(line)
+                    f.flush()
+                finally:
+                    if fcntl:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+            self.sync()
+
+    # ----- Queries -----
+    def _expandable(self, node_id: str, exclude: Set[str], max_degree: Optional[int]) -> bool:
+        if self.nodes[node_id]["type"] in exclude:
+            return False
+        return max_degree is None or len(self.adj[node_id]) <= max_degree
+
+    def neighbors(self, handle: str, k: int = 2, limit: int = 200,
+                  exclude: Set[str] = frozenset(), max_degree: Optional[int] = None) -> Optional[dict]:
+        """
+        Breadth-first k-hop neighbourhood of a username. Nodes of an excluded
+        type, or with more than `max_degree` neighbours, are reported but not
+        expanded through, which keeps hub sites from flooding the result.
+        """
+        self.sync()
+        start = user_id(handle)
+        with self._lock:
+            if start not in self.nodes:
+                return None
+            depth = {start: 0}
+            queue = deque([start])
+            truncated = False
+            while queue:
+                cur = queue.popleft()
+                if depth[cur] >= k:
+                    continue
+                if cur != start and not self._expandable(cur, exclude, max_degree):
+                    continue
+                for nxt in self.adj[cur]:
+                    if nxt in depth:
+                        continue
+                    if len(depth) >= limit:
+                        truncated = True
+                        queue.clear()
+                        break
+                    depth[nxt] = depth[cur] + 1
+                    queue.append(nxt)
+
+            nodes = [dict(self.nodes[n], hops=d) for n, d in depth.items()]
+            links = []
+            for a in depth:
+                # Walk whichever is smaller: this node's adjacency or the result set
+                candidates = self.adj[a] if len(self.adj[a]) <= len(depth) else depth
+                links.extend(
+                    {"source": a, "target": b}
+                    for b in candidates
+                    if a < b and b in depth and b in self.adj[a]
+                )
+        return {"center": start, "k": k, "truncated": truncated, "nodes": nodes, "links": links}
+
+    def shortest_path(self, source: str, target: str, max_depth: int = 6,
+                      exclude: Set[str] = frozenset(), max_degree: Optional[int] = None) -> Optional[List[dict]]:
+        """Bidirectional BFS between two usernames; returns the node path or None."""
+        self.sync()
+        a, b = user_id(source), user_id(target)
+        with self._lock:
+            if a not in self.nodes or b not in self.nodes:
+                return None
+            if a == b:
+                return [self.nodes[a]]
+
+            parents_a: Dict[str, Optional[str]] = {a: None}
+            parents_b: Dict[str, Optional[str]] = {b: None}
+            frontier_a, frontier_b = [a], [b]
+            meet = None
+            hops = 0
+            while frontier_a and frontier_b and hops < max_depth and meet is None:
+                # Expand the smaller frontier first
+                if len(frontier_a) > len(frontier_b):
+                    frontier_a, frontier_b = frontier_b, frontier_a
+                    parents_a, parents_b = parents_b, parents_a
+                    a, b = b, a
+                next_frontier = []
+                for cur in frontier_a:
+                    if cur != a and not self._expandable(cur, exclude, max_degree):
+                        continue
+                    for nxt in self.adj[cur]:
+                        if nxt in parents_a:
+                            continue
+                        parents_a[nxt] = cur
+                        if nxt in parents_b and (nxt == b or self._expandable(nxt, exclude, max_degree)):
+                            meet = nxt
+                            break
+                        next_frontier.append(nxt)
+                    if meet is not None:
+                        break
+                frontier_a = next_frontier
+                hops += 1
+
+            if meet is None:
+                return None
+            path = []
+            n = meet
+            while n is not None:
+                path.append(n)
+                n = parents_a[n]
+            path.reverse()
+            n = parents_b[meet]
+            while n is not None:
+                path.append(n)
+                n = parents_b[n]
+            if path[0] != user_id(source):
+                path.reverse()
+            return [self.nodes[n] for n in path]
+
+    def edge_index(self):
+        """(version, node ids, node lookup, row indexes, col indexes) for matrix-based analytics."""
+        self.sync()
+        with self._lock:
+            ids = list(self.nodes)
+            position = {node_id: i for i, node_id in enumerate(ids)}
+            rows, cols = [], []
+            for node_id, neighbours in self.adj.items():
+                i = position[node_id]
+                for other in neighbours:
+                    j = position[other]
+                    if i < j:
+                        rows.append(i)
+                        cols.append(j)
+            return self.version, ids, dict(self.nodes), rows, cols
+
+    def export_source(self):
+        """Lazy (nodes, edges) iterators for graph_export; walks a snapshot of node ids."""
+        self.sync()
+        with self._lock:
+            ids = list(self.nodes)
+
+        def nodes():
+            for node_id in ids:
+                node = self.nodes[node_id]
+                yield node_id, {"label": node["label"], "type": node["type"]}
+
+        def edges():
+            for node_id in ids:
+                for other in tuple(self.adj[node_id]):
+                    if node_id < other:
+                        yield node_id, other, {}
+
+        return nodes(), edges()
+
+    def stats(self) -> Dict[str, Any]:
+        self.sync()
+        with self._lock:
+            by_type: Dict[str, int] = {}
+            for node in self.nodes.values():
+                by_type[node["type"]] = by_type.get(node["type"], 0) + 1
+            return {
+                "nodes": len(self.nodes),
+                "edges": sum(len(v) for v in self.adj.values()) // 2,
+                "by_type": by_type,
+                "version": self.version,
+            }
+
+
+# Shared instance used by the graph routes
+identity_graph = IdentityGraph()
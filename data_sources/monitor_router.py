@@ -2,10 +2,14 @@
 
 
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import StreamingResponse
 import os
-import requests
+import json
+import time
 from dotenv import load_dotenv
 
+from osint_fastapi_app.data_sources.twitter_client import twitter_client, TwitterRateLimited, TwitterAPIError
+
 load_dotenv()
 
 router = APIRouter(prefix="/monitor")
@@ -14,22 +18,26 @@ BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
 if not BEARER_TOKEN:
     raise Exception("Twitter Bearer Token not set in .env")
 
+TWEET_FIELDS = "created_at,public_metrics,author_id,lang,source"
+USER_FIELDS = "username,name,verified,created_at,description,public_metrics"
+
 @router.get("/twitter")
-async def monitor_twitter(keyword: str = Query(..., min_length=1)):
-    url = "https://api.twitter.com/2/tweets/search/recent"
+def monitor_twitter(keyword: str = Query(..., min_length=1)):
     params = {
         "query": keyword,
         "max_results": 10,
-        "tweet.fields": "created_at,public_metrics,author_id,lang,source",
+        "tweet.fields": TWEET_FIELDS,
         "expansions": "author_id",
-        "user.fields": "username,name,verified,created_at,description,public_metrics"
+        "user.fields": USER_FIELDS
     }
-    headers = {"Authorization": f"Bearer {BEARER_TOKEN}"}
-    response = requests.get(url, headers=headers, params=params)
-    if response.status_code != 200:
-        raise HTTPException(status_code=response.status_code, detail=response.text)
+    try:
+        data = twitter_client.search_recent(params)
+    except TwitterRateLimited as e:
+        raise HTTPException(status_code=429, detail=f"Rate limit reached. Retry in {e.retry_after} seconds.",
+                            headers={"Retry-After": str(e.retry_after)})
+    except TwitterAPIError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-    data = response.json()
     tweets = data.get("data", [])
     users = {u["id"]: u for u in data.get("includes", {}).get("users", [])}
 
@@ -50,3 +58,61 @@ async def monitor_twitter(keyword: str = Query(..., min_length=1)):
         })
 
     return {"keyword": keyword, "results": results}
+
+
+@router.get("/twitter/budget")
+def twitter_budget():
+    """Remaining Twitter API quota as reported by the API, plus local bucket and cache state."""
+    return twitter_client.budget()
+
+
+def _stream_tweets(keyword: str, max_tweets: int, deadline_seconds: float):
+    """
+    NDJSON: each author once as a "user" line the first time they appear,
+    tweets as "tweet" lines referencing author_id, then a "done" line.
+    """
+    params = {"query": keyword, "tweet.fields": TWEET_FIELDS,
+              "expansions": "author_id", "user.fields": USER_FIELDS}
+    deadline = time.monotonic() + deadline_seconds
+    seen_users = set()
+    count = pages = 0
+    next_token = None
+    stopped, error = "exhausted", None
+    try:
+        for page in twitter_client.iter_search_pages(params, max_tweets, deadline):
+            pages += 1
+            next_token = page.get("meta", {}).get("next_token")
+            for user in page.get("includes", {}).get("users", []):
+                if user["id"] not in seen_users:
+                    seen_users.add(user["id"])
+                    yield json.dumps({"type": "user", **user}) + "\n"
+            for t in page.get("data", []):
+                count += 1
+                yield json.dumps({
+                    "type": "tweet",
+                    "id": t.get("id"),
+                    "author_id": t.get("author_id"),
+                    "content": t.get("text"),
+                    "date": t.get("created_at"),
+                    "lang": t.get("lang"),
+                    "likes": t.get("public_metrics", {}).get("like_count"),
+                    "retweets": t.get("public_metrics", {}).get("retweet_count"),
+                }) + "\n"
+        if count >= max_tweets:
+            stopped = "limit"
+        elif next_token and time.monotonic() >= deadline:
+            stopped = "deadline"
+    except TwitterRateLimited as e:
+        stopped, error = "rate_limited", f"Rate limit reached. Retry in {e.retry_after} seconds."
+    except TwitterAPIError as e:
+        stopped, error = "error", e.detail
+    yield json.dumps({"type": "done", "keyword": keyword, "tweets": count, "users": len(seen_users),
+                      "pages": pages, "stopped": stopped, "next_token": next_token, "error": error}) + "\n"
+
+
+@router.get("/twitter/stream")
+def monitor_twitter_stream(keyword: str = Query(..., min_length=1),
+                           max_tweets: int = Query(1000, ge=10, le=10000),
+                           deadline: float = Query(60, ge=1, le=600)):
+    """Paginated recent search (100 tweets per page) streamed as NDJSON."""
+    return StreamingResponse(_stream_tweets(keyword, max_tweets, deadline), media_type="application/x-ndjson")
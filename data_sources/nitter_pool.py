@@ -0,0 +1,195 @@
+# osint_fastapi_app/data_sources/nitter_pool.py
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Any
+
+import requests
+
+# -------------------------
+# Config
+# -------------------------
+DEFAULT_INSTANCES = [
+    "https://nitter.net",
+    "https://nitter.snopyta.org",
+    "https://nitter.eu.org",
+]
+NITTER_INSTANCES = [
+    u.strip().rstrip("/")
+    for u in os.getenv("NITTER_INSTANCES", ",".join(DEFAULT_INSTANCES)).split(",")
+    if u.strip()
+]
+NITTER_RACE = os.getenv("NITTER_RACE", "0").lower() in ("1", "true", "yes")
+NITTER_TIMEOUT = float(os.getenv("NITTER_TIMEOUT", "8"))
+
+FAILURE_THRESHOLD = 3       # consecutive failures before the breaker opens
+OPEN_SECONDS = 60.0         # first cool-down; doubles on every failed probe
+MAX_OPEN_SECONDS = 15 * 60.0
+PROBE_INTERVAL = 30.0
+EWMA_ALPHA = 0.3
+
+
+class NitterUnavailable(Exception):
+    pass
+
+
+# -------------------------
+# Per-instance health
+# -------------------------
+class InstanceHealth:
+    def __init__(self, base: str):
+        self.base = base
+        self.latency: Optional[float] = None  # EWMA seconds; None until measured
+        self.success_rate = 1.0             # EWMA of 0/1 outcomes
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.open_seconds = OPEN_SECONDS
+        self.last_error: Optional[str] = None
+        self.requests = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.open_until > time.time()
+
+    def score(self) -> float:
+        # Lower is better: expected seconds per successful answer.
+        # Unmeasured instances sort first so each one gets tried.
+        if self.latency is None:
+            return 0.0
+        return self.latency / max(self.success_rate, 0.05)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "base": self.base,
+            "state": "open" if self.is_open else "closed",
+            "latency_ms": round(self.latency * 1000) if self.latency is not None else None,
+            "success_rate": round(self.success_rate, 3),
+            "consecutive_failures": self.consecutive_failures,
+            "retry_at": self.open_until if self.is_open else None,
+            "last_error": self.last_error,
+            "requests": self.requests,
+        }
+
+
+# -------------------------
+# Pool
+# -------------------------
+class NitterPool:
+    """
+    Nitter mirrors ranked by observed latency and success rate. After
+    FAILURE_THRESHOLD consecutive failures an instance's circuit opens and it
+    is skipped; a background thread re-probes open instances and closes the
+    circuit once one answers again. With `race=True` the two healthiest
+    instances are queried at once and the first good answer wins.
+    """
+
+    def __init__(self, instances: List[str], race: bool = NITTER_RACE,
+                 timeout: float = NITTER_TIMEOUT, headers: Optional[dict] = None):
+        self.health = {base: InstanceHealth(base) for base in instances}
+        self.race = race
+        self.timeout = timeout
+        self.headers = headers or {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="nitter")
+        self._prober: Optional[threading.Thread] = None
+
+    # ----- Health bookkeeping -----
+    def _record(self, base: str, ok: bool, latency: float, error: Optional[str] = None):
+        with self._lock:
+            h = self.health[base]
+            h.requests += 1
+            h.success_rate = (1 - EWMA_ALPHA) * h.success_rate + EWMA_ALPHA * (1.0 if ok else 0.0)
+            if not ok and h.latency is None:
+                h.latency = latency
+            if ok:
+                h.latency = latency if h.latency is None else (1 - EWMA_ALPHA) * h.latency + EWMA_ALPHA * latency
+                h.consecutive_failures = 0
+                h.open_until = 0.0
+                h.open_seconds = OPEN_SECONDS
+                h.last_error = None
+            else:
+                h.consecutive_failures += 1
+                h.last_error = error
+                if h.consecutive_failures >= FAILURE_THRESHOLD:
+                    h.open_until = time.time() + h.open_seconds
+                    h.open_seconds = min(h.open_seconds * 2, MAX_OPEN_SECONDS)
+
+    def ranked(self) -> List[str]:
+        """Closed-circuit instances, healthiest first."""
+        with self._lock:
+            healthy = [h for h in self.health.values() if not h.is_open]
+            return [h.base for h in sorted(healthy, key=InstanceHealth.score)]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return sorted((h.as_dict() for h in self.health.values()), key=lambda d: d["state"])
+
+    # ----- Requests -----
+    def _attempt(self, base: str, path: str, parse: Callable[[str, str], list]) -> Optional[list]:
+        """One request against one instance. Returns parsed items, or None on failure."""
+        start = time.monotonic()
+        try:
+            res = requests.get(f"{base}{path}", headers=self.headers, timeout=self.timeout)
+            if res.status_code != 200:
+                raise NitterUnavailable(f"HTTP {res.status_code}")
+            items = parse(res.text, base)
+        except Exception as e:
+            self._record(base, False, time.monotonic() - start, str(e))
+            return None
+        self._record(base, True, time.monotonic() - start)
+        return items
+
+    def fetch(self, path: str, parse: Callable[[str, str], list]) -> list:
+        """
+        GET `path` from the best instances until one yields a non-empty
+        parse result. An empty page is not counted against the instance,
+        but the next one is still tried, as before.
+        """
+        self._ensure_prober()
+        candidates = self.ranked()
+        if self.race and len(candidates) >= 2:
+            racers = {self._executor.submit(self._attempt, base, path, parse) for base in candidates[:2]}
+            candidates = candidates[2:]
+            while racers:
+                done, racers = wait(racers, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    items = fut.result()
+                    if items:
+                        return items
+        for base in candidates:
+            items = self._attempt(base, path, parse)
+            if items:
+                return items
+        return []
+
+    # ----- Background probing -----
+    def _ensure_prober(self):
+        if self._prober is not None:
+            return
+        with self._lock:
+            if self._prober is None:
+                self._prober = threading.Thread(target=self._probe_loop, name="nitter-prober", daemon=True)
+                self._prober.start()
+
+    def _probe_loop(self):
+        while True:
+            time.sleep(PROBE_INTERVAL)
+            with self._lock:
+                due = [h.base for h in self.health.values() if h.open_until and not h.is_open]
+            for base in due:
+                start = time.monotonic()
+                try:
+                    res = requests.get(base, headers=self.headers, timeout=self.timeout)
+                    ok = res.status_code == 200
+                    error = None if ok else f"HTTP {res.status_code}"
+                except Exception as e:
+                    ok, error = False, str(e)
+                if ok:
+                    self._record(base, True, time.monotonic() - start)
+                else:
+                    # Re-open straight away for the (doubled) cool-down
+                    with self._lock:
+                        h = self.health[base]
+                        h.consecutive_failures = max(h.consecutive_failures, FAILURE_THRESHOLD - 1)
+                    self._record(base, False, time.monotonic() - start, error)
@@ -0,0 +1,264 @@
+# osint_fastapi_app/data_sources/observation_store.py
+import os
+import csv
+import json
+import time
+import queue
+import atexit
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# Config
+# -------------------------
+BASE_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+os.makedirs(DATA_DIR, exist_ok=True)
+DB_PATH = os.getenv("OBSERVATION_STORE_PATH", os.path.join(DATA_DIR, "observations.sqlite3"))
+BATCH_SIZE = 200          # rows per insert transaction
+FLUSH_INTERVAL = 0.5      # seconds a queued row may wait for more to batch with
+QUEUE_SIZE = 10000        # past this, record() blocks instead of buffering more
+FLUSH_TIMEOUT = 5.0       # seconds a read waits for rows queued before it
+
+# Lookup logs written before the store existed: kind -> (path, columns after the timestamp, key column)
+LEGACY_CSVS = {
+    "phone": (os.path.join(DATA_DIR, "phone_lookups.csv"),
+              ("number", "name", "mobile", "country", "cnic", "address"), "number"),
+    "github": (os.path.join(DATA_DIR, "github_profiles.csv"),
+               ("name", "username", "bio", "followers", "location", "avatar", "profile"), "username"),
+}
+
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """ISO date/datetime (or epoch seconds) -> epoch seconds. Raises ValueError."""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+# -------------------------
+# Store
+# -------------------------
+class ObservationStore:
+    """
+    Append-only log of lookup results (phone numbers, GitHub profiles, ...)
+    in a local SQLite file (WAL mode, safe across workers), indexed by
+    (kind, key, time) and (kind, time).
+
+    record() only enqueues: a writer thread inserts queued rows in batches,
+    so a request never waits on the disk. Reads first wait (up to
+    FLUSH_TIMEOUT) for the rows queued before them, so a lookup is visible
+    in its history as soon as it returns; rows queued later don't hold
+    the read up.
+    """
+
+    def __init__(self, path: str = DB_PATH, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._put_lock = threading.Lock()
+        self._done = threading.Condition()
+        self.queued = self.processed = 0   # rows handed to / finished by the writer
+        self.written = self.failed = 0
+        self._init_db()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        conn = self._conn()
+        with conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS observations (
+                    id INTEGER PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    observed_at REAL NOT NULL,
+                    data TEXT NOT NULL
+                );
+                -- Also makes CSV imports idempotent
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_obs_key_time ON observations(kind, key, observed_at);
+                CREATE INDEX IF NOT EXISTS idx_obs_time ON observations(kind, observed_at);
+                CREATE TABLE IF NOT EXISTS imports (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    rows INTEGER NOT NULL
+                );
+                """
+            )
+
+    @staticmethod
+    def normalize_key(key: str) -> str:
+        return (key or "").strip().casefold()
+
+    # ----- Writes -----
+    def _insert(self, rows: Sequence[tuple]) -> int:
+        conn = self._conn()
+        with conn:
+            cur = conn.executemany(
+                "INSERT OR IGNORE INTO observations (kind, key, observed_at, data) VALUES (?, ?, ?, ?)", rows
+            )
+        return cur.rowcount
+
+    def _ensure_writer(self):
+        if self._writer is None:
+            with self._start_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name="observation-writer", daemon=True)
+                    self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self.written += self._insert(batch)
+            except Exception as e:
+                # Keep the thread alive whatever the failure; readers wait on it
+                self.failed += len(batch)
+                logger.error(f"Dropped {len(batch)} observations: {e}")
+            with self._done:
+                self.processed += len(batch)
+                self._done.notify_all()
+
+    def record(self, kind: str, key: str, data: Dict[str, Any], observed_at: Optional[float] = None):
+        """Queue one observation for the writer thread."""
+        self._ensure_writer()
+        row = (kind, self.normalize_key(key), observed_at or time.time(),
+               json.dumps(data, ensure_ascii=False, default=str))
+        # Counted in queue order, so the first `queued` rows are exactly those put so far
+        with self._put_lock:
+            self._queue.put(row)
+            self.queued += 1
+
+    def flush(self, timeout: float = FLUSH_TIMEOUT) -> bool:
+        """
+        Wait until the rows queued before this call are written (or dropped).
+        Returns False if that took longer than `timeout` or the writer is gone.
+        """
+        if self._writer is None:
+            return True
+        target = self.queued
+        deadline = time.monotonic() + timeout
+        with self._done:
+            while self.processed < target:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._writer.is_alive():
+                    logger.warning(f"Observation flush gave up with {target - self.processed} rows pending")
+                    return False
+                self._done.wait(min(remaining, 1.0))
+        return True
+
+    # ----- Queries -----
+    def history(self, kind: str, key: Optional[str] = None, since: Optional[float] = None,
+                until: Optional[float] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Observations of `kind` (optionally for one key), newest first."""
+        self.flush()
+        sql = "SELECT key, observed_at, data FROM observations WHERE kind = ?"
+        args: List[Any] = [kind]
+        if key is not None:
+            sql += " AND key = ?"
+            args.append(self.normalize_key(key))
+        if since is not None:
+            sql += " AND observed_at >= ?"
+            args.append(since)
+        if until is not None:
+            sql += " AND observed_at < ?"
+            args.append(until)
+        sql += " ORDER BY observed_at DESC LIMIT ?"
+        args.append(limit)
+        return [
+            {"key": r["key"], "observed_at": datetime.fromtimestamp(r["observed_at"]).isoformat(),
+             **json.loads(r["data"])}
+            for r in self._conn().execute(sql, args)
+        ]
+
+    def stats(self, kind: str) -> Dict[str, Any]:
+        self.flush()
+        row = self._conn().execute(
+            "SELECT COUNT(*), COUNT(DISTINCT key), MIN(observed_at), MAX(observed_at) "
+            "FROM observations WHERE kind = ?", (kind,)
+        ).fetchone()
+        return {"observations": row[0], "keys": row[1],
+                "first": datetime.fromtimestamp(row[2]).isoformat() if row[2] else None,
+                "last": datetime.fromtimestamp(row[3]).isoformat() if row[3] else None,
+                "queued": self._queue.qsize(), "written": self.written, "failed": self.failed}
+
+    # ----- CSV import -----
+    def import_csv(self, kind: str, path: str, columns: Sequence[str], key_column: str) -> int:
+        """
+        Import a legacy `timestamp,<columns...>` CSV log. Unchanged files are
+        skipped, and rows already imported are ignored, so this is safe to
+        run on every start. Returns the number of new rows.
+        """
+        if not os.path.exists(path):
+            return 0
+        st = os.stat(path)
+        conn = self._conn()
+        seen = conn.execute("SELECT size, mtime FROM imports WHERE path = ?", (path,)).fetchone()
+        if seen and seen["size"] == st.st_size and seen["mtime"] == st.st_mtime:
+            return 0
+
+        rows = []
+        with open(path, newline="", encoding="utf-8") as f:
+            for line_no, fields in enumerate(csv.reader(f), 1):
+                if len(fields) != len(columns) + 1:
+                    logger.warning(f"{path}:{line_no}: expected {len(columns) + 1} fields, got {len(fields)}")
+                    continue
+                try:
+                    observed_at = datetime.fromisoformat(fields[0]).timestamp()
+                except ValueError:
+                    continue  # header or damaged line
+                data = dict(zip(columns, fields[1:]))
+                rows.append((kind, self.normalize_key(data[key_column]), observed_at,
+                             json.dumps(data, ensure_ascii=False)))
+        added = self._insert(rows) if rows else 0
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO imports (path, size, mtime, rows) VALUES (?, ?, ?, ?)",
+                         (path, st.st_size, st.st_mtime, len(rows)))
+        return added
+
+    def import_legacy_csvs(self) -> Dict[str, int]:
+        return {kind: self.import_csv(kind, path, columns, key_column)
+                for kind, (path, columns, key_column) in LEGACY_CSVS.items()}
+
+
+observation_store = ObservationStore()
+atexit.register(observation_store.flush)
+
+try:
+    observation_store.import_legacy_csvs()
+except (OSError, sqlite3.Error) as e:
+    logger.warning(f"Legacy CSV import failed: {e}")
+
+
+if __name__ == "__main__":
+    # The import above already ran; report what the store now holds
+    print(json.dumps({kind: observation_store.stats(kind) for kind in LEGACY_CSVS}, indent=1))
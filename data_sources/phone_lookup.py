@@ -1,17 +1,14 @@
 # osint_fastapi_app/data_sources/phone_lookup.py
-import os, csv, re
-from datetime import datetime
+import os, re
+from typing import Optional
 import requests
 from bs4 import BeautifulSoup
-from fastapi import APIRouter, Form, Response
+from fastapi import APIRouter, Form, Response, Query, HTTPException
 from fastapi.responses import HTMLResponse
 
-router = APIRouter()
+from osint_fastapi_app.data_sources.observation_store import observation_store, parse_time
 
-BASE_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
-DATA_DIR = os.path.join(BASE_DIR, "data")
-os.makedirs(DATA_DIR, exist_ok=True)
-CSV_PATH = os.path.join(DATA_DIR, "phone_lookups.csv")
+router = APIRouter()
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0",
@@ -43,11 +40,7 @@ def lookup_number(number: str):
         "address": _extract(soup, "Address: ")
     }
 
-    try:
-        with open(CSV_PATH, "a", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow([datetime.now(), number, *result.values()])
-    except Exception:
-        pass
+    observation_store.record("phone", number, {"number": number, **result})
 
     return result
 
@@ -83,3 +76,19 @@ def homepage_submit(number: str = Form(...)):
 @router.post("/phone-lookup")
 def phone_lookup_json(number: str = Form(...)):
     return lookup_number(number)
+
+@router.get("/history")
+def phone_history(number: Optional[str] = Query(None, description="Only lookups of this number"),
+                  since: Optional[str] = Query(None, description="ISO date/time or epoch seconds"),
+                  until: Optional[str] = Query(None, description="ISO date/time or epoch seconds"),
+                  limit: int = Query(100, ge=1, le=1000)):
+    """Past lookups, newest first."""
+    try:
+        since_ts, until_ts = parse_time(since), parse_time(until)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="since/until must be ISO dates or epoch seconds")
+    return {
+        "number": number,
+        "stats": observation_store.stats("phone"),
+        "results": observation_store.history("phone", number, since_ts, until_ts, limit),
+    }
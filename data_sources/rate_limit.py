@@ -0,0 +1,91 @@
+# osint_fastapi_app/data_sources/rate_limit.py
+import time
+import asyncio
+import threading
+from typing import Any, Dict, Optional
+
+
+class RateLimiter:
+    """
+    Token bucket shared by threads and coroutines. `rate` tokens are added
+    per second up to `burst`. Callers reserve tokens up front and then wait
+    out their reservation, so concurrent callers queue fairly instead of
+    polling.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, n: float = 1, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Take `n` tokens and return how long the caller must wait before using
+        them, or None (taking nothing) if that would exceed `max_wait`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, (n - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= n
+            return wait
+
+    def set_rate(self, rate: float):
+        """Change the refill rate; tokens accrued so far are kept."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def acquire(self, n: float = 1, max_wait: Optional[float] = None) -> bool:
+        wait = self.reserve(n, max_wait)
+        if wait is None:
+            return False
+        if wait:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, n: float = 1, max_wait: Optional[float] = None) -> bool:
+        wait = self.reserve(n, max_wait)
+        if wait is None:
+            return False
+        if wait:
+            await asyncio.sleep(wait)
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {"rate_per_second": self.rate, "burst": self.burst, "tokens": round(self._tokens, 2)}
+
+
+class RequestBudget:
+    """Per-request cap on upstream calls and wall-clock time."""
+
+    def __init__(self, max_requests: int, seconds: float):
+        self.max_requests = max_requests
+        self.used = 0
+        self.deadline = time.monotonic() + seconds
+        self._lock = threading.Lock()
+
+    @property
+    def remaining_seconds(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def take(self, n: int = 1) -> int:
+        """Grant up to `n` requests from what is left; returns the number granted."""
+        with self._lock:
+            granted = max(0, min(n, self.max_requests - self.used))
+            self.used += granted
+            return granted
+
+    def give_back(self, n: int):
+        with self._lock:
+            self.used = max(0, self.used - n)
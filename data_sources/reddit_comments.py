@@ -0,0 +1,112 @@
+# osint_fastapi_app/data_sources/reddit_comments.py
+import os
+import asyncio
+import inspect
+from datetime import datetime
+from typing import Any, Dict, List
+
+from osint_fastapi_app.data_sources.rate_limit import RateLimiter, RequestBudget
+
+# -------------------------
+# Config
+# -------------------------
+# Reddit allows 100 OAuth requests per minute per client; stay a little under
+RATE_PER_MINUTE = float(os.getenv("REDDIT_RATE_PER_MINUTE", "90"))
+CRAWL_CONCURRENCY = int(os.getenv("REDDIT_COMMENT_CONCURRENCY", "4"))
+
+# Shared by every crawl in this process
+reddit_limiter = RateLimiter(rate=RATE_PER_MINUTE / 60.0, burst=10)
+
+
+def comment_to_dict(comment, submission) -> Dict[str, Any]:
+    """Flat comment record with links to its submission and parent."""
+    base = f"https://www.reddit.com{submission.permalink}"
+    parent_id = comment.parent_id
+    return {
+        "id": comment.id,
+        "submission_id": submission.id,
+        "submission_title": submission.title,
+        "parent_id": parent_id,
+        "parent_link": base if parent_id.startswith("t3_") else f"{base}{parent_id[3:]}/",
+        "permalink": f"https://www.reddit.com{comment.permalink}",
+        "author": str(comment.author),
+        "body": comment.body,
+        "depth": getattr(comment, "depth", None),
+        "score": getattr(comment, "score", None),
+        "created": datetime.utcfromtimestamp(comment.created_utc).isoformat(),
+    }
+
+
+async def _maybe_await(value):
+    return await value if inspect.isawaitable(value) else value
+
+
+async def _crawl_submission(reddit, submission_id: str, more_limit: int, max_comments: int,
+                            budget: RequestBudget, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    async with semaphore:
+        if not budget.take(1):
+            return {"submission_id": submission_id, "skipped": "request budget exhausted", "comments": []}
+        if not await reddit_limiter.acquire_async(1, max_wait=budget.remaining_seconds):
+            budget.give_back(1)
+            return {"submission_id": submission_id, "skipped": "rate limit wait exceeds deadline", "comments": []}
+        submission = await reddit.submission(submission_id)
+
+        # Each MoreComments expansion is one more API call: reserve them up front
+        granted = budget.take(more_limit)
+        if granted and not await reddit_limiter.acquire_async(granted, max_wait=budget.remaining_seconds):
+            budget.give_back(granted)
+            granted = 0
+        forest = submission.comments
+        await forest.replace_more(limit=granted)
+        comments = await _maybe_await(forest.list())
+        return {
+            "submission_id": submission.id,
+            "expanded": granted,
+            "comments": [comment_to_dict(c, submission) for c in comments[:max_comments]],
+        }
+
+
+async def crawl_comments(reddit, submission_ids: List[str], more_limit: int, max_comments: int,
+                         budget: RequestBudget, concurrency: int = CRAWL_CONCURRENCY) -> Dict[str, Any]:
+    """
+    Fetch and flatten the comment trees of `submission_ids`, at most
+    `concurrency` at a time, within `budget`. Submissions still running at
+    the deadline are cancelled and reported in `unfinished`.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = {
+        asyncio.ensure_future(_crawl_submission(reddit, sid, more_limit, max_comments, budget, semaphore)): sid
+        for sid in submission_ids
+    }
+    done, pending = await asyncio.wait(tasks, timeout=budget.remaining_seconds) if tasks else (set(), set())
+    for task in pending:
+        task.cancel()
+
+    comments: List[Dict[str, Any]] = []
+    submissions: List[Dict[str, Any]] = []
+    for task, sid in tasks.items():
+        if task not in done:
+            continue
+        try:
+            result = task.result()
+        except Exception as e:
+            submissions.append({"submission_id": sid, "error": str(e)})
+            continue
+        found = result.pop("comments")
+        comments.extend(found)
+        submissions.append(dict(result, comments=len(found)))
+    return {
+        "comments": comments,
+        "submissions": submissions,
+        "unfinished": [tasks[t] for t in pending],
+        "requests_used": budget.used,
+    }
+
+
+async def search_submission_ids(reddit, keyword: str, limit: int, budget: RequestBudget) -> List[str]:
+    """Newest submissions for `keyword`; one API call per 100 results."""
+    pages = budget.take(max(1, (limit + 99) // 100))
+    if not pages or not await reddit_limiter.acquire_async(pages, max_wait=budget.remaining_seconds):
+        return []
+    subreddit = await reddit.subreddit("all")
+    return [s.id async for s in subreddit.search(keyword, sort="new", limit=limit)]
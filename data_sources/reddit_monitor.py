@@ -1,7 +1,18 @@
+import json
+import time
+import asyncio
+from typing import Optional
 import praw
-from fastapi import APIRouter
-from datetime import datetime
-from osint_fastapi_app.classifier import classify_text  # 👈 Hate classifier
+import asyncpraw
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from osint_fastapi_app.classifier import classify_text, classify_texts  # 👈 Hate classifier
+from osint_fastapi_app.data_sources.reddit_store import (
+    reddit_store, RedditIngestor, submission_to_row, LIVE_SEARCH_TTL
+)
+from osint_fastapi_app.data_sources.reddit_comments import crawl_comments, search_submission_ids, reddit_limiter
+from osint_fastapi_app.data_sources.rate_limit import RequestBudget
 
 reddit_router = APIRouter()
 
@@ -17,29 +28,54 @@ reddit = praw.Reddit(
     user_agent=REDDIT_USER_AGENT
 )
 
+# Async client for the streaming monitor, created on first use inside the event loop
+async_reddit = None
+
+MAX_STREAM_LIMIT = 1000
+BATCH_SIZE = 100  # one Reddit listing page; asyncpraw already requests full pages
+CLASSIFY_CHUNK = 50  # comments per classifier call in the comment crawl
+
+# Background stream of configured subreddits into the local store
+reddit_ingestor = RedditIngestor(reddit, reddit_store, classify_text)
+reddit_ingestor.start()
+
+
+def _classify_and_store(submissions):
+    """Posts for `submissions`, classifying only the ones the store has not seen (in one batch)."""
+    known = reddit_store.get_many([s.id for s in submissions])
+    unseen = [s for s in submissions if s.id not in known]
+    classifications = classify_texts([s.title for s in unseen]) if unseen else []
+    rows = [submission_to_row(s, c) for s, c in zip(unseen, classifications)]
+    reddit_store.add(rows)
+    new = reddit_store.get_many([row["id"] for row in rows])
+    return [known.get(s.id) or new[s.id] for s in submissions if s.id in known or s.id in new]
+
+
+def _live_search(keyword: str, limit: int):
+    """Search Reddit, classify the new posts and store them."""
+    submissions = list(reddit.subreddit("all").search(keyword, sort="new", limit=limit))
+    posts = _classify_and_store(submissions)
+    reddit_store.mark_searched(keyword)
+    return posts
+
+
 # 🔍 Live Monitor: Search keyword across Reddit
 @reddit_router.get("/monitor/reddit")
 def monitor_reddit_by_keyword(keyword: str, limit: int = 50):
+    """
+    Recent posts for `keyword` from the local store. Reddit is searched live
+    unless the keyword was searched within REDDIT_LIVE_SEARCH_TTL or the
+    background stream follows r/all for it.
+    """
     try:
-        posts = []
-        for submission in reddit.subreddit("all").search(keyword, sort="new", limit=limit):
-            classification = classify_text(submission.title)
-
-            posts.append({
-                "title": submission.title,
-                "author": str(submission.author),
-                "url": submission.url,
-                "created": datetime.utcfromtimestamp(submission.created_utc).isoformat(),
-                "is_hate_speech": classification["is_hate_speech"],
-                "confidence": classification["confidence"],
-                "category": classification["category"],
-                "explanation": classification.get("explanation"),
-                "original_language": classification.get("original_language", "en")
-            })
+        last = reddit_store.last_searched(keyword)
+        fresh = last is not None and (time.time() - last < LIVE_SEARCH_TTL or reddit_ingestor.covers(keyword))
+        posts = reddit_store.search(keyword, limit=limit) if fresh else _live_search(keyword, limit)
 
         return {
             "status": "success",
             "keyword": keyword,
+            "source": "index" if fresh else "live",
             "posts": posts
         }
     except Exception as e:
@@ -47,3 +83,121 @@ def monitor_reddit_by_keyword(keyword: str, limit: int = 50):
             "status": "error",
             "message": str(e)
         }
+
+
+@reddit_router.get("/monitor/reddit/ingest-status")
+def reddit_ingest_status():
+    return {"stream": reddit_ingestor.status(), "store": reddit_store.stats()}
+
+
+def _get_async_reddit():
+    global async_reddit
+    if async_reddit is None:
+        async_reddit = asyncpraw.Reddit(
+            client_id=REDDIT_CLIENT_ID,
+            client_secret=REDDIT_CLIENT_SECRET,
+            user_agent=REDDIT_USER_AGENT
+        )
+    return async_reddit
+
+
+async def _stream_posts(keyword: str, limit: int):
+    """
+    NDJSON lines: one per post, then a summary line. Pages are fetched by a
+    producer task while the previous page is being classified in the thread
+    pool, so network and classification overlap.
+    """
+    pages: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+    async def produce():
+        try:
+            subreddit = await _get_async_reddit().subreddit("all")
+            batch = []
+            async for submission in subreddit.search(keyword, sort="new", limit=limit):
+                batch.append(submission)
+                if len(batch) >= BATCH_SIZE:
+                    await pages.put(batch)
+                    batch = []
+            if batch:
+                await pages.put(batch)
+            await pages.put(None)
+        except Exception as e:
+            await pages.put(e)
+
+    producer = asyncio.create_task(produce())
+    count = 0
+    try:
+        while True:
+            page = await pages.get()
+            if page is None:
+                await run_in_threadpool(reddit_store.mark_searched, keyword)
+                yield json.dumps({"status": "success", "keyword": keyword, "count": count}) + "\n"
+                break
+            if isinstance(page, Exception):
+                yield json.dumps({"status": "error", "message": str(page), "count": count}) + "\n"
+                break
+            for post in await run_in_threadpool(_classify_and_store, page):
+                count += 1
+                yield json.dumps(post) + "\n"
+    finally:
+        producer.cancel()
+
+
+# 🔍 Streaming Monitor: NDJSON, posts arrive while later pages load
+@reddit_router.get("/monitor/reddit/stream")
+async def stream_reddit_by_keyword(keyword: str, limit: int = Query(500, ge=1, le=MAX_STREAM_LIMIT)):
+    return StreamingResponse(_stream_posts(keyword, limit), media_type="application/x-ndjson")
+
+
+# 💬 Comment Crawl: flattened, classified comment trees within a request budget
+@reddit_router.get("/monitor/reddit/comments")
+async def crawl_reddit_comments(
+    keyword: Optional[str] = None,
+    submission_ids: Optional[str] = Query(None, description="Comma-separated submission ids"),
+    submissions: int = Query(5, ge=1, le=25, description="Submissions to crawl for a keyword search"),
+    more_limit: int = Query(4, ge=0, le=32, description="'load more comments' expansions per submission"),
+    max_comments: int = Query(300, ge=1, le=2000, description="Comments kept per submission"),
+    max_requests: int = Query(30, ge=1, le=100, description="Reddit API calls this request may make"),
+    deadline: float = Query(20, ge=1, le=60, description="Seconds before unfinished submissions are dropped"),
+):
+    budget = RequestBudget(max_requests, deadline)
+    ids = [i.strip().removeprefix("t3_") for i in (submission_ids or "").split(",") if i.strip()]
+    try:
+        if keyword:
+            ids += await search_submission_ids(_get_async_reddit(), keyword, submissions, budget)
+        if not ids:
+            return {"status": "error", "message": "Provide a keyword with results or submission_ids"}
+        result = await crawl_comments(_get_async_reddit(), list(dict.fromkeys(ids)),
+                                      more_limit, max_comments, budget)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+    # Classification shares the deadline: comments still unclassified when it passes are returned as such
+    comments = result["comments"]
+    classified = 0
+    for start in range(0, len(comments), CLASSIFY_CHUNK):
+        chunk = comments[start:start + CLASSIFY_CHUNK]
+        if budget.remaining_seconds <= 0:
+            break
+        try:
+            classifications = await asyncio.wait_for(
+                run_in_threadpool(classify_texts, [c["body"] for c in chunk]), timeout=budget.remaining_seconds
+            )
+        except asyncio.TimeoutError:
+            break
+        for comment, classification in zip(chunk, classifications):
+            comment.update({
+                "classified": True,
+                "is_hate_speech": classification["is_hate_speech"],
+                "confidence": classification["confidence"],
+                "category": classification["category"],
+                "explanation": classification.get("explanation"),
+                "original_language": classification.get("original_language", "en"),
+            })
+        classified += len(chunk)
+    for comment in comments[classified:]:
+        comment["classified"] = False
+    partial = (bool(result["unfinished"]) or any("skipped" in s for s in result["submissions"])
+               or classified < len(comments))
+    return {"status": "success", "keyword": keyword, "partial": partial, "classified": classified,
+            "rate_limiter": reddit_limiter.snapshot(), **result}
@@ -0,0 +1,382 @@
+# osint_fastapi_app/data_sources/reddit_store.py
+import os
+import re
+import time
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: every worker may run its own stream
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# Config
+# -------------------------
+BASE_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+os.makedirs(DATA_DIR, exist_ok=True)
+DB_PATH = os.getenv("REDDIT_STORE_PATH", os.path.join(DATA_DIR, "reddit_posts.sqlite3"))
+LOCK_PATH = DB_PATH + ".ingest.lock"
+
+
+def _csv_env(name: str) -> List[str]:
+    return [v.strip() for v in os.getenv(name, "").split(",") if v.strip()]
+
+
+# Subreddits whose new submissions are streamed, e.g. "worldnews,pakistan" (or "all")
+STREAM_SUBREDDITS = _csv_env("REDDIT_STREAM_SUBREDDITS")
+# Only posts whose title matches a watch keyword are kept; empty keeps everything.
+# Keywords searched through /monitor/reddit are added to the watch list.
+WATCH_KEYWORDS = _csv_env("REDDIT_WATCH_KEYWORDS")
+# A live search answers for this long before the store alone is trusted for a keyword
+LIVE_SEARCH_TTL = float(os.getenv("REDDIT_LIVE_SEARCH_TTL", "600"))
+RETENTION_SECONDS = float(os.getenv("REDDIT_STORE_RETENTION_DAYS", "30")) * 86400
+RESTART_BACKOFF = 5.0
+HEARTBEAT_INTERVAL = 30.0
+# A stream whose last heartbeat is older than this is treated as stopped
+HEARTBEAT_STALE = 120.0
+MAX_BACKOFF = 300.0
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_keyword(keyword: str) -> str:
+    return re.sub(r"\s+", " ", (keyword or "").strip()).casefold()
+
+
+def submission_to_row(submission, classification: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a PRAW submission plus its classification into a store row."""
+    return {
+        "id": submission.id,
+        "subreddit": str(submission.subreddit),
+        "title": submission.title,
+        "author": str(submission.author),
+        "url": submission.url,
+        "permalink": f"https://www.reddit.com{submission.permalink}",
+        "created_utc": float(submission.created_utc),
+        "is_hate_speech": int(bool(classification["is_hate_speech"])),
+        "confidence": classification["confidence"],
+        "category": classification["category"],
+        "explanation": classification.get("explanation"),
+        "original_language": classification.get("original_language", "en"),
+    }
+
+
+def row_to_post(row: sqlite3.Row) -> Dict[str, Any]:
+    """Store row in the shape /monitor/reddit returns."""
+    return {
+        "title": row["title"],
+        "author": row["author"],
+        "url": row["url"],
+        "created": datetime.utcfromtimestamp(row["created_utc"]).isoformat(),
+        "is_hate_speech": bool(row["is_hate_speech"]),
+        "confidence": row["confidence"],
+        "category": row["category"],
+        "explanation": row["explanation"],
+        "original_language": row["original_language"],
+    }
+
+
+# -------------------------
+# Store
+# -------------------------
+class RedditStore:
+    """
+    Classified Reddit submissions in a local SQLite file (WAL mode, shared by
+    all workers), with an FTS5 index over titles for keyword queries and an
+    index on creation time for recency ordering.
+    """
+
+    COLUMNS = ("id", "subreddit", "title", "author", "url", "permalink", "created_utc",
+               "is_hate_speech", "confidence", "category", "explanation", "original_language")
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._init_db()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        conn = self._conn()
+        with conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS posts (
+                    id TEXT PRIMARY KEY,
+                    subreddit TEXT,
+                    title TEXT NOT NULL,
+                    author TEXT,
+                    url TEXT,
+                    permalink TEXT,
+                    created_utc REAL NOT NULL,
+                    is_hate_speech INTEGER NOT NULL,
+                    confidence REAL,
+                    category TEXT,
+                    explanation TEXT,
+                    original_language TEXT,
+                    ingested_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_posts_created ON posts(created_utc);
+                CREATE INDEX IF NOT EXISTS idx_posts_subreddit ON posts(subreddit, created_utc);
+                CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+                    title, content='posts', content_rowid='rowid'
+                );
+                CREATE TRIGGER IF NOT EXISTS posts_ai AFTER INSERT ON posts BEGIN
+                    INSERT INTO posts_fts(rowid, title) VALUES (new.rowid, new.title);
+                END;
+                CREATE TRIGGER IF NOT EXISTS posts_ad AFTER DELETE ON posts BEGIN
+                    INSERT INTO posts_fts(posts_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+                END;
+                CREATE TABLE IF NOT EXISTS searches (
+                    keyword TEXT PRIMARY KEY,
+                    searched_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS stream_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    subreddits TEXT NOT NULL,
+                    keywords TEXT NOT NULL,
+                    heartbeat_at REAL NOT NULL
+                );
+                """
+            )
+
+    # ----- Writes -----
+    def has(self, post_id: str) -> bool:
+        return self._conn().execute("SELECT 1 FROM posts WHERE id = ?", (post_id,)).fetchone() is not None
+
+    def add(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Insert rows, skipping ids already stored. Returns the number inserted."""
+        now = time.time()
+        values = [tuple(row[c] for c in self.COLUMNS) + (now,) for row in rows]
+        if not values:
+            return 0
+        conn = self._conn()
+        with conn:
+            cur = conn.executemany(
+                f"INSERT OR IGNORE INTO posts ({', '.join(self.COLUMNS)}, ingested_at) "
+                f"VALUES ({', '.join('?' * (len(self.COLUMNS) + 1))})",
+                values,
+            )
+        return cur.rowcount
+
+    def purge(self, older_than: float = RETENTION_SECONDS) -> int:
+        conn = self._conn()
+        with conn:
+            cur = conn.execute("DELETE FROM posts WHERE created_utc < ?", (time.time() - older_than,))
+        return cur.rowcount
+
+    # ----- Keyword bookkeeping -----
+    def mark_searched(self, keyword: str):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO searches (keyword, searched_at) VALUES (?, ?) "
+                "ON CONFLICT(keyword) DO UPDATE SET searched_at = excluded.searched_at",
+                (normalize_keyword(keyword), time.time()),
+            )
+
+    def last_searched(self, keyword: str) -> Optional[float]:
+        row = self._conn().execute(
+            "SELECT searched_at FROM searches WHERE keyword = ?", (normalize_keyword(keyword),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def searched_keywords(self) -> List[str]:
+        return [r[0] for r in self._conn().execute("SELECT keyword FROM searches")]
+
+    # ----- Stream state (shared by every worker) -----
+    def heartbeat(self, subreddits: List[str], keywords: List[str]):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO stream_state (id, subreddits, keywords, heartbeat_at) VALUES (1, ?, ?, ?)",
+                (",".join(subreddits), ",".join(keywords), time.time()),
+            )
+
+    def stream_state(self) -> Optional[Dict[str, Any]]:
+        """The running stream's configuration, or None if no stream has sent a recent heartbeat."""
+        row = self._conn().execute("SELECT * FROM stream_state WHERE id = 1").fetchone()
+        if row is None or time.time() - row["heartbeat_at"] > HEARTBEAT_STALE:
+            return None
+        return {
+            "subreddits": [s for s in row["subreddits"].split(",") if s],
+            "keywords": [k for k in row["keywords"].split(",") if k],
+            "heartbeat_at": row["heartbeat_at"],
+        }
+
+    # ----- Queries -----
+    def get_many(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not ids:
+            return {}
+        rows = self._conn().execute(
+            f"SELECT * FROM posts WHERE id IN ({', '.join('?' * len(ids))})", ids
+        )
+        return {r["id"]: row_to_post(r) for r in rows}
+
+    def search(self, keyword: str, limit: int = 50, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Newest stored posts whose title contains every token of `keyword`."""
+        tokens = _TOKEN.findall(normalize_keyword(keyword))
+        if not tokens:
+            return []
+        match = " ".join('"' + t.replace('"', '""') + '"' for t in tokens)
+        sql = (
+            "SELECT posts.* FROM posts_fts JOIN posts ON posts.rowid = posts_fts.rowid "
+            "WHERE posts_fts MATCH ?"
+        )
+        params: List[Any] = [match]
+        if since is not None:
+            sql += " AND posts.created_utc >= ?"
+            params.append(since)
+        sql += " ORDER BY posts.created_utc DESC LIMIT ?"
+        params.append(limit)
+        return [row_to_post(r) for r in self._conn().execute(sql, params)]
+
+    def stats(self) -> Dict[str, Any]:
+        row = self._conn().execute(
+            "SELECT COUNT(*), MIN(created_utc), MAX(created_utc) FROM posts"
+        ).fetchone()
+        return {"posts": row[0], "oldest": row[1], "newest": row[2],
+                "keywords_searched": len(self.searched_keywords())}
+
+
+# -------------------------
+# Stream ingestor
+# -------------------------
+class RedditIngestor:
+    """
+    Background thread consuming PRAW submission streams for STREAM_SUBREDDITS.
+    Each new post is classified once and written to the store if it matches
+    a watch keyword (configured, or searched through /monitor/reddit).
+
+    Only one process per store runs the stream: the others fail to take the
+    lock file and rely on the shared SQLite file.
+    """
+
+    def __init__(self, reddit, store: RedditStore, classify: Callable[[str], Dict[str, Any]],
+                 subreddits: List[str] = STREAM_SUBREDDITS, keywords: List[str] = WATCH_KEYWORDS):
+        self.reddit = reddit
+        self.store = store
+        self.classify = classify
+        self.subreddits = subreddits
+        self.keywords = [normalize_keyword(k) for k in keywords]
+        self.started_at: Optional[float] = None
+        self.ingested = 0
+        self.last_error: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock_file = None
+        self._watch_refreshed = 0.0
+        self._watch: List[str] = list(self.keywords)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _acquire(self) -> bool:
+        if fcntl is None:
+            return True
+        self._lock_file = open(LOCK_PATH, "a")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            self._lock_file.close()
+            self._lock_file = None
+            return False
+
+    def start(self) -> bool:
+        """Start streaming if configured and no other process holds the stream."""
+        if not self.subreddits or self.running or not self._acquire():
+            return False
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="reddit-ingest", daemon=True)
+        self._thread.start()
+        return True
+
+    def covers(self, keyword: str) -> bool:
+        """
+        True if every new Reddit post for `keyword` is being captured by the
+        stream, whichever process runs it: the stream must be alive (recent
+        heartbeat in the store), follow r/all and keep this keyword.
+        Otherwise the store only holds a sample and live searches are needed.
+        """
+        state = self.store.stream_state()
+        if state is None or "all" not in {s.lower() for s in state["subreddits"]}:
+            return False
+        keyword = normalize_keyword(keyword)
+        if not keyword:
+            return False
+        if not state["keywords"]:
+            return True  # the stream keeps every post
+        return keyword in state["keywords"] or keyword in self.store.searched_keywords()
+
+    def watch_list(self) -> List[str]:
+        if time.time() - self._watch_refreshed > 30:
+            self._watch = sorted(set(self.keywords) | set(self.store.searched_keywords()))
+            self._watch_refreshed = time.time()
+        return self._watch
+
+    def _wanted(self, title: str) -> bool:
+        if not self.keywords:
+            return True
+        words = set(_TOKEN.findall(normalize_keyword(title)))
+        return any(all(t in words for t in _TOKEN.findall(k)) for k in self.watch_list())
+
+    def _run(self):
+        backoff = RESTART_BACKOFF
+        purged_at = time.time()
+        beat_at = 0.0
+        while True:
+            try:
+                stream = self.reddit.subreddit("+".join(self.subreddits)).stream
+                # pause_after=-1 yields None when there is nothing new, so quiet streams still heartbeat
+                for submission in stream.submissions(skip_existing=True, pause_after=-1):
+                    if time.time() - beat_at > HEARTBEAT_INTERVAL:
+                        self.store.heartbeat(self.subreddits, self.keywords)
+                        beat_at = time.time()
+                    if submission is None:
+                        continue
+                    backoff = RESTART_BACKOFF
+                    if not self._wanted(submission.title) or self.store.has(submission.id):
+                        continue
+                    row = submission_to_row(submission, self.classify(submission.title))
+                    self.ingested += self.store.add([row])
+                    if time.time() - purged_at > 3600:
+                        self.store.purge()
+                        purged_at = time.time()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning(f"Reddit stream stopped ({e}); restarting in {backoff:.0f}s")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+
+    def status(self) -> Dict[str, Any]:
+        state = self.store.stream_state()
+        return {
+            "running": self.running,  # in this worker
+            "stream_alive": state is not None,  # in any worker
+            "heartbeat_at": state["heartbeat_at"] if state else None,
+            "subreddits": self.subreddits,
+            "watch_keywords": self.watch_list() if self.keywords else "all",
+            "started_at": self.started_at,
+            "ingested": self.ingested,
+            "last_error": self.last_error,
+        }
+
+
+# Shared store for every Reddit endpoint
+reddit_store = RedditStore()
@@ -0,0 +1,201 @@
+# osint_fastapi_app/data_sources/rss_index.py
+import os
+import re
+import math
+import time
+import heapq
+import hashlib
+import threading
+from html import unescape
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from osint_fastapi_app.data_sources.url_canon import canonicalize_url
+from osint_fastapi_app.data_sources.feed_fetcher import feed_poller
+
+# -------------------------
+# Config
+# -------------------------
+RETENTION_SECONDS = float(os.getenv("RSS_INDEX_RETENTION_DAYS", "14")) * 86400
+MAX_ENTRIES = int(os.getenv("RSS_INDEX_MAX_ENTRIES", "50000"))
+PURGE_INTERVAL = 60.0
+TITLE_WEIGHT = 3      # a title token counts as this many summary tokens
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in",
+    "is", "it", "its", "of", "on", "or", "that", "the", "to", "was", "were", "will", "with",
+}
+
+_TAG = re.compile(r"<[^>]+>")
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens of `text` with HTML tags and stopwords removed."""
+    text = unescape(_TAG.sub(" ", text or "")).casefold()
+    return [t for t in _TOKEN.findall(text) if t not in STOPWORDS]
+
+
+# -------------------------
+# Index
+# -------------------------
+class _Doc:
+    __slots__ = ("entry", "feeds", "ts", "length", "terms", "digest")
+
+    def __init__(self, entry: Dict[str, Any], ts: float, length: int, terms: Dict[str, int], digest: str):
+        self.entry = entry
+        self.feeds: Set[str] = set()
+        self.ts = ts
+        self.length = length
+        self.terms = terms
+        self.digest = digest
+
+
+class RSSIndex:
+    """
+    In-memory inverted index over feed entries, ranked with BM25 (title
+    tokens weighted TITLE_WEIGHT times). Entries are keyed by canonical link
+    so the same story from several feeds is indexed once. Entries expire
+    RETENTION_SECONDS after publication (or first sighting, when the feed
+    gives no date), and the oldest are dropped beyond `max_entries`.
+    """
+
+    def __init__(self, retention: float = RETENTION_SECONDS, max_entries: int = MAX_ENTRIES):
+        self.retention = retention
+        self.max_entries = max_entries
+        self._docs: Dict[str, _Doc] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> {doc key: weighted tf}
+        self._expiry: List = []                          # heap of (ts, doc key)
+        self._total_length = 0
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+
+    # ----- Ingest -----
+    @staticmethod
+    def _key(entry: Dict[str, Any]) -> str:
+        link = entry.get("link") or ""
+        return canonicalize_url(link) if link else "id:" + (entry.get("id") or entry.get("title", ""))
+
+    def add_entries(self, feed_url: str, entries: Iterable[Dict[str, Any]]):
+        """Index new or changed entries of `feed_url`; unchanged ones are skipped."""
+        now = time.time()
+        with self._lock:
+            for entry in entries:
+                ts = entry.get("published_ts") or now
+                if ts < now - self.retention:
+                    continue
+                key = self._key(entry)
+                digest = hashlib.sha1(
+                    f"{entry.get('title', '')}\0{entry.get('summary', '')}".encode("utf-8")
+                ).hexdigest()
+                doc = self._docs.get(key)
+                if doc is not None and doc.digest == digest:
+                    doc.feeds.add(feed_url)
+                    continue
+                feeds = doc.feeds if doc is not None else set()
+                if doc is not None:
+                    ts = doc.ts if not entry.get("published_ts") else ts
+                    self._remove(key)
+                self._add(key, entry, ts, digest, feeds | {feed_url})
+            self._purge(now, force=len(self._docs) > self.max_entries)
+
+    def _add(self, key: str, entry: Dict[str, Any], ts: float, digest: str, feeds: Set[str]):
+        terms: Dict[str, int] = {}
+        for token in tokenize(entry.get("title", "")):
+            terms[token] = terms.get(token, 0) + TITLE_WEIGHT
+        for token in tokenize(entry.get("summary", "")):
+            terms[token] = terms.get(token, 0) + 1
+        length = sum(terms.values())
+        doc = _Doc(entry, ts, length, terms, digest)
+        doc.feeds = feeds
+        self._docs[key] = doc
+        self._total_length += length
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[key] = tf
+        heapq.heappush(self._expiry, (ts, key))
+
+    def _remove(self, key: str):
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        for term in doc.terms:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self._postings[term]
+        # The heap entry goes stale and is skipped when it surfaces
+
+    def _purge(self, now: float, force: bool = False):
+        if not force and now - self._last_purge < PURGE_INTERVAL:
+            return
+        self._last_purge = now
+        cutoff = now - self.retention
+        while self._expiry:
+            ts, key = self._expiry[0]
+            if ts >= cutoff and len(self._docs) <= self.max_entries:
+                break
+            heapq.heappop(self._expiry)
+            doc = self._docs.get(key)
+            if doc is not None and doc.ts == ts:
+                self._remove(key)
+        if len(self._expiry) > 2 * len(self._docs) + 1000:
+            self._expiry = [(d.ts, k) for k, d in self._docs.items()]
+            heapq.heapify(self._expiry)
+
+    # ----- Search -----
+    def search(self, query: str, limit: int = 10, since: Optional[float] = None,
+               until: Optional[float] = None, feeds: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Entries containing every query token, best BM25 score first (newest
+        first on ties), optionally restricted to a publish-time window and a
+        set of feeds.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        feed_set = set(feeds) if feeds is not None else None
+        with self._lock:
+            self._purge(time.time())
+            postings = [self._postings.get(t) for t in terms]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+            n_docs = len(self._docs)
+            avg_length = self._total_length / max(n_docs, 1)
+            scored = []
+            for key in postings[0]:
+                if not all(key in p for p in postings[1:]):
+                    continue
+                doc = self._docs[key]
+                if since is not None and doc.ts < since:
+                    continue
+                if until is not None and doc.ts > until:
+                    continue
+                if feed_set is not None and not (doc.feeds & feed_set):
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * doc.length / avg_length)
+                score = 0.0
+                for p in postings:
+                    tf = p[key]
+                    idf = math.log(1 + (n_docs - len(p) + 0.5) / (len(p) + 0.5))
+                    score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+                scored.append((score, doc.ts, key))
+            top = heapq.nlargest(limit, scored)
+            return [dict(self._docs[key].entry, score=round(score, 4)) for score, _, key in top]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._docs),
+                "terms": len(self._postings),
+                "max_entries": self.max_entries,
+                "retention_days": self.retention / 86400,
+            }
+
+
+# Shared index, fed by the background feed poller
+rss_index = RSSIndex()
+feed_poller.subscribe(rss_index.add_entries)
@@ -1,29 +1,44 @@
-import feedparser
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from osint_fastapi_app.data_sources.feed_fetcher import feed_poller, load_feed_list, RSS_DEADLINE
 
 rss_router = APIRouter()
 
-RSS_FEEDS = {
+DEFAULT_RSS_FEEDS = {
     "BBC": "http://feeds.bbci.co.uk/news/rss.xml",
     "Al Jazeera": "https://www.aljazeera.com/xml/rss/all.xml",
     "Dawn": "https://www.dawn.com/feeds/home",
     "CNN": "http://rss.cnn.com/rss/edition.rss"
 }
+# Point RSS_FEEDS_FILE at a JSON or text feed list to monitor more sources
+RSS_FEEDS = load_feed_list("RSS_FEEDS_FILE", DEFAULT_RSS_FEEDS)
+
+# Feeds are refreshed in the background; requests read the latest snapshot
+feed_poller.register(RSS_FEEDS.values())
 
 @rss_router.get("/trends/rss")
-def get_rss_trends():
+def get_rss_trends(deadline: Optional[float] = Query(None, description="Max seconds to wait for feeds never fetched yet")):
+    deadline = RSS_DEADLINE if deadline is None else max(0.0, min(deadline, 60.0))
+    snapshots, pending = feed_poller.snapshot(RSS_FEEDS.values(), deadline=deadline)
     results = []
     for source, url in RSS_FEEDS.items():
-        feed = feedparser.parse(url)
-        for entry in feed.entries[:5]:  # Limit to top 5 per source
+        for entry in snapshots[url][:5]:  # Limit to top 5 per source
             results.append({
                 "source": source,
-                "title": entry.title,
-                "link": entry.link,
-                "summary": entry.summary if "summary" in entry else "",
-                "published": entry.published if "published" in entry else ""
+                "title": entry["title"],
+                "link": entry["link"],
+                "summary": entry["summary"],
+                "published": entry["published"]
             })
-    return {"items": results}
+    pending_sources = [source for source, url in RSS_FEEDS.items() if url in pending]
+    return {"items": results, "partial": bool(pending_sources), "pending_sources": pending_sources}
+
+@rss_router.get("/trends/rss/status")
+def get_rss_status():
+    """Poll state of every feed the background fetcher knows about."""
+    return {"feeds": feed_poller.status()}
 
 
 #HAVENT DISPLAYED IN FRONTEND YET
\ No newline at end of file
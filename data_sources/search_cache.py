@@ -0,0 +1,174 @@
+# osint_fastapi_app/data_sources/search_cache.py
+import os
+import re
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# Config
+# -------------------------
+# Seconds an entry is served as fresh, per source
+SOURCE_TTLS = {
+    "youtube": 15 * 60,   # each search costs 100 API quota units
+    "reddit": 5 * 60,
+    "nitter": 3 * 60,
+    "twitter": 60,        # recent search is near-real-time; the TTL mainly absorbs repeats
+    "trends24": 5 * 60,   # each scrape drives a headless browser
+    "youtube_scrape": 10 * 60,
+}
+DEFAULT_TTL = 5 * 60
+# After the TTL an entry is still served for this many extra seconds while a
+# background refresh runs (stale-while-revalidate)
+STALE_GRACE = float(os.getenv("SEARCH_CACHE_STALE_SECONDS", "600"))
+# Sources whose results go out of date quickly get a shorter grace
+SOURCE_STALE_GRACE = {
+    "twitter": 30,
+}
+MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "2000"))
+
+CacheKey = Tuple[str, str, str]
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", (query or "").strip()).casefold()
+
+
+def make_key(source: str, query: str, params: Optional[Dict[str, Any]] = None) -> CacheKey:
+    return source, normalize_query(query), json.dumps(params or {}, sort_keys=True, default=str)
+
+
+# -------------------------
+# Cache
+# -------------------------
+class QueryCache:
+    """
+    Source-agnostic cache for upstream search calls, keyed by
+    (source, normalized query, params).
+
+    - fresh entries (younger than the source TTL) are returned directly
+    - stale entries (within the source's stale grace after the TTL) are
+      returned and refreshed in the background
+    - identical concurrent misses share one upstream call (single flight)
+    - the least recently used entries are evicted past `max_entries`
+    """
+
+    def __init__(self, ttls: Dict[str, float] = None, default_ttl: float = DEFAULT_TTL,
+                 stale_grace: float = STALE_GRACE, max_entries: int = MAX_ENTRIES,
+                 stale_graces: Dict[str, float] = None):
+        self.ttls = dict(ttls or SOURCE_TTLS)
+        self.default_ttl = default_ttl
+        self.stale_grace = stale_grace
+        self.stale_graces = dict(SOURCE_STALE_GRACE if stale_graces is None else stale_graces)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()  # key -> (stored_at, value)
+        self._inflight: Dict[CacheKey, Future] = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="search-cache")
+        self.hits = self.stale_hits = self.misses = self.coalesced = 0
+
+    def ttl(self, source: str) -> float:
+        return self.ttls.get(source, self.default_ttl)
+
+    def grace(self, source: str) -> float:
+        return self.stale_graces.get(source, self.stale_grace)
+
+    def _store(self, key: CacheKey, value: Any):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _load(self, key: CacheKey, loader: Callable[[], Any], cache_if: Callable[[Any], bool]) -> Future:
+        """Start (or join) the single upstream call for `key`."""
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                return fut
+            fut = Future()
+            self._inflight[key] = fut
+        try:
+            value = loader()
+        except BaseException as e:
+            fut.set_exception(e)
+        else:
+            if cache_if(value):
+                self._store(key, value)
+            fut.set_result(value)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return fut
+
+    def _refresh(self, key: CacheKey, loader: Callable[[], Any], cache_if: Callable[[Any], bool]):
+        with self._lock:
+            if key in self._inflight:
+                return
+        def run():
+            try:
+                self._load(key, loader, cache_if).result()
+            except Exception as e:
+                logger.warning(f"Background refresh of {key[0]}:{key[1]} failed: {e}")
+        self._refresher.submit(run)
+
+    def get_or_fetch(self, source: str, query: str, params: Optional[Dict[str, Any]],
+                     loader: Callable[[], Any], cache_if: Callable[[Any], bool] = bool) -> Any:
+        """
+        Return the cached value for (source, query, params), calling `loader`
+        on a miss. Only results for which `cache_if` is true are stored, so
+        empty results from a failed upstream call are retried next time.
+        """
+        key = make_key(source, query, params)
+        now = time.time()
+        ttl = self.ttl(source)
+        grace = self.grace(source)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry[0]
+                if age < ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                if age < ttl + grace:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    stale = entry[1]
+                else:
+                    stale = None
+                    del self._entries[key]
+            else:
+                stale = None
+            if stale is None:
+                self.misses += 1
+        if stale is not None:
+            self._refresh(key, loader, cache_if)
+            return stale
+        return self._load(key, loader, cache_if).result()
+
+    def invalidate(self, source: str, query: str, params: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self._entries.pop(make_key(source, query, params), None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+            }
+
+
+# Shared instance for every search integration
+search_cache = QueryCache()
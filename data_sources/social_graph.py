@@ -5,7 +5,7 @@ import re
 import time
 import math
 import urllib.parse
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Dict, List, Any, Optional
 
 import requests
@@ -13,6 +13,13 @@ from bs4 import BeautifulSoup
 from fastapi import APIRouter, Query
 from pydantic import BaseModel
 
+from osint_fastapi_app.data_sources.graph_store import graph_store
+from osint_fastapi_app.data_sources.nitter_pool import NitterPool, NITTER_INSTANCES
+from osint_fastapi_app.data_sources.graph_renderer import renderer, FORMATS
+from osint_fastapi_app.data_sources.search_cache import search_cache, normalize_query
+from osint_fastapi_app.data_sources.url_canon import dedupe_items
+from osint_fastapi_app.data_sources.youtube_client import youtube_client
+
 # -------------------------
 # Config
 # -------------------------
@@ -28,13 +35,25 @@ STATIC_DIR = os.path.join(BASE_DIR, "static")
 GRAPHS_DIR = os.path.join(STATIC_DIR, "graphs")
 os.makedirs(GRAPHS_DIR, exist_ok=True)
 
+# Fan-out limits for /social-graph/auto. Pools are shared by all requests, so
+# the caps bound concurrent calls per upstream across the whole worker.
+PLATFORM_CONCURRENCY = {
+    "YouTube": int(os.getenv("SOCIAL_GRAPH_YOUTUBE_CONCURRENCY", "4")),
+    "Twitter": int(os.getenv("SOCIAL_GRAPH_TWITTER_CONCURRENCY", "3")),
+    "Reddit": int(os.getenv("SOCIAL_GRAPH_REDDIT_CONCURRENCY", "2")),
+}
+AUTO_DEADLINE_SECONDS = float(os.getenv("SOCIAL_GRAPH_DEADLINE", "20"))
+
+# Nitter mirrors, tried healthiest-first (see nitter_pool.py)
+nitter_pool = NitterPool(NITTER_INSTANCES, headers=HEADERS)
+
 
 # -------------------------
 # Helpers
 # -------------------------
 def expand_query_variants(query: str) -> List[str]:
     q = query.strip()
-    variants = {q, q.lower(), q.title()}
+    variants = [q, q.lower(), q.title()]
     RELATED = {
         "ai": ["artificial intelligence", "machine learning", "generative ai", "llm", "chatgpt"],
         "cybersecurity": ["cyber security", "info sec", "threat intel", "ransomware"],
@@ -42,30 +61,32 @@ def expand_query_variants(query: str) -> List[str]:
     }
     key = q.lower()
     if key in RELATED:
-        variants.update(RELATED[key])
+        variants.extend(RELATED[key])
     parts = re.split(r"[\s\-]+", q)
     for p in parts:
         if len(p) > 2:
-            variants.add(p)
-    return list(variants)[:8]
+            variants.append(p)
+
+    # Searches are case-insensitive, so "AI", "ai" and "Ai" would fetch the same
+    # results; keep the first spelling of each normalized variant, query first.
+    unique, seen = [], set()
+    for v in variants:
+        norm = normalize_query(v)
+        if norm and norm not in seen:
+            seen.add(norm)
+            unique.append(v)
+    return unique[:8]
+
+
+def youtube_search_json(query: str, max_results: int = 8) -> Dict[str, Any]:
+    """Raw search.list response, shared through the search cache with the YouTube monitors."""
+    return youtube_client.search(query, max_results)
 
 
 def search_youtube(query: str, max_results: int = 8) -> List[Dict[str, Any]]:
     results = []
     try:
-        res = requests.get(
-            "https://www.googleapis.com/youtube/v3/search",
-            params={
-                "part": "snippet",
-                "q": query,
-                "type": "video",
-                "maxResults": max_results,
-                "key": os.getenv("YOUTUBE_API_KEY", "")
-            },
-            headers=HEADERS,
-            timeout=12
-        )
-        data = res.json()
+        data = youtube_search_json(query, max_results)
         for item in data.get("items", []):
             vid = item.get("id", {}).get("videoId")
             snip = item.get("snippet", {})
@@ -81,6 +102,12 @@ def search_youtube(query: str, max_results: int = 8) -> List[Dict[str, Any]]:
 
 
 def search_reddit(query: str, max_results: int = 8) -> List[Dict[str, Any]]:
+    return search_cache.get_or_fetch(
+        "reddit", query, {"max_results": max_results}, lambda: _fetch_reddit(query, max_results)
+    )
+
+
+def _fetch_reddit(query: str, max_results: int) -> List[Dict[str, Any]]:
     results = []
     try:
         q = urllib.parse.quote_plus(query)
@@ -108,46 +135,117 @@ def search_reddit(query: str, max_results: int = 8) -> List[Dict[str, Any]]:
     return results[:max_results]
 
 
-def search_twitter(query: str, max_results: int = 8) -> List[Dict[str, Any]]:
+def _parse_nitter_search(html: str, base: str, max_results: int) -> List[Dict[str, Any]]:
     results = []
-    nitter_instances = [
-        "https://nitter.net",
-        "https://nitter.snopyta.org",
-        "https://nitter.eu.org"
-    ]
+    soup = BeautifulSoup(html, "html.parser")
+    tweet_nodes = soup.select("div.tweet") or soup.select("div.timeline-item")
+    for t in tweet_nodes:
+        text_tag = t.select_one("div.tweet-content") or t.select_one("p")
+        author_tag = t.select_one("a.username")
+        link_tag = t.select_one("a[href*='/status/']")
+        text = text_tag.text.strip() if text_tag else None
+        author = author_tag.text.strip() if author_tag else ""
+        link = urllib.parse.urljoin(base, link_tag["href"]) if link_tag else ""
+        if text:
+            results.append({"text": text, "author": author, "link": link})
+        if len(results) >= max_results:
+            break
+    return results
+
+
+def search_twitter(query: str, max_results: int = 8) -> List[Dict[str, Any]]:
+    return search_cache.get_or_fetch(
+        "nitter", query, {"max_results": max_results}, lambda: _fetch_twitter(query, max_results)
+    )
+
+
+def _fetch_twitter(query: str, max_results: int) -> List[Dict[str, Any]]:
     q = urllib.parse.quote_plus(query)
-    for base in nitter_instances:
-        try:
-            url = f"{base}/search?f=tweets&q={q}"
-            res = requests.get(url, headers=HEADERS, timeout=8)
-            if res.status_code != 200:
-                continue
-            soup = BeautifulSoup(res.text, "html.parser")
-            tweet_nodes = soup.select("div.tweet") or soup.select("div.timeline-item")
-            for t in tweet_nodes:
-                text_tag = t.select_one("div.tweet-content") or t.select_one("p")
-                author_tag = t.select_one("a.username")
-                link_tag = t.select_one("a[href*='/status/']")
-                text = text_tag.text.strip() if text_tag else None
-                author = author_tag.text.strip() if author_tag else ""
-                link = urllib.parse.urljoin(base, link_tag["href"]) if link_tag else ""
-                if text:
-                    results.append({"text": text, "author": author, "link": link})
-                if len(results) >= max_results:
-                    break
-            if results:
-                break
-        except Exception:
-            continue
+    results = nitter_pool.fetch(
+        f"/search?f=tweets&q={q}",
+        lambda html, base: _parse_nitter_search(html, base, max_results),
+    )
     return results[:max_results]
 
 
+PLATFORM_SEARCHES = {
+    "YouTube": search_youtube,
+    "Twitter": search_twitter,
+    "Reddit": search_reddit,
+}
+_platform_pools = {
+    platform: ThreadPoolExecutor(max_workers=cap, thread_name_prefix=f"social-{platform.lower()}")
+    for platform, cap in PLATFORM_CONCURRENCY.items()
+}
+
+
+def fan_out_searches(variants: List[str], max_items: int, deadline: float) -> Dict[str, Any]:
+    """
+    Run every variant x platform search concurrently on the per-platform pools.
+    Once a platform has `max_items` results its queued searches are cancelled;
+    when `deadline` seconds pass, whatever has arrived is returned.
+    Items are canonicalized and deduplicated across variants, and only
+    distinct items count towards the quota. Results keep variant order, so
+    the original query's hits come first.
+    """
+    by_variant: Dict[str, Dict[int, List[Dict[str, Any]]]] = {p: {} for p in PLATFORM_SEARCHES}
+    seen = {p: set() for p in PLATFORM_SEARCHES}
+    pending = {}
+    for idx, variant in enumerate(variants):
+        for platform, search in PLATFORM_SEARCHES.items():
+            fut = _platform_pools[platform].submit(search, variant, max_items)
+            pending[fut] = (platform, idx)
+
+    end = time.monotonic() + deadline
+    timed_out = False
+    while pending:
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            timed_out = True
+            break
+        done, _ = wait(list(pending), timeout=remaining, return_when=FIRST_COMPLETED)
+        for fut in done:
+            entry = pending.pop(fut, None)
+            if entry is None:
+                continue  # already dropped when its platform hit the quota
+            platform, idx = entry
+            if fut.cancelled():
+                continue
+            try:
+                items = fut.result()
+            except Exception:
+                items = []
+            by_variant[platform][idx] = items
+            dedupe_items(items, seen[platform], NITTER_INSTANCES)
+            if len(seen[platform]) >= max_items:
+                # Quota met: drop this platform's remaining searches
+                for other, (other_platform, _) in list(pending.items()):
+                    if other_platform == platform:
+                        other.cancel()
+                        del pending[other]
+
+    for fut in pending:
+        fut.cancel()
+
+    results = {
+        platform: dedupe_items(
+            (item for idx in sorted(chunks) for item in chunks[idx]), nitter_hosts=NITTER_INSTANCES
+        )[:max_items]
+        for platform, chunks in by_variant.items()
+    }
+    results["partial"] = timed_out
+    results["pending_platforms"] = sorted({platform for platform, _ in pending.values()})
+    return results
+
+
 # -------------------------
 # Models
 # -------------------------
 class SocialAutoIn(BaseModel):
     query: str
     max_items: Optional[int] = 10
+    deadline_seconds: Optional[float] = None
+    image_format: Optional[str] = "png"  # "png" or "svg"
 
 
 # -------------------------
@@ -160,20 +258,10 @@ def social_graph_auto(payload: SocialAutoIn):
         return {"error": "query is required"}
     max_items = int(payload.max_items or 10)
     variants = expand_query_variants(query)
-    if query not in variants:
-        variants.insert(0, query)
 
-    youtube_items, twitter_items, reddit_items = [], [], []
-    for v in variants:
-        if len(youtube_items) < max_items:
-            youtube_items.extend(search_youtube(v, max_items))
-        if len(twitter_items) < max_items:
-            twitter_items.extend(search_twitter(v, max_items))
-        if len(reddit_items) < max_items:
-            reddit_items.extend(search_reddit(v, max_items))
-        if len(youtube_items) >= max_items and len(twitter_items) >= max_items and len(reddit_items) >= max_items:
-            break
-        time.sleep(0.2)
+    deadline = max(1.0, min(float(payload.deadline_seconds or AUTO_DEADLINE_SECONDS), 120.0))
+    found = fan_out_searches(variants, max_items, deadline)
+    youtube_items, twitter_items, reddit_items = found["YouTube"], found["Twitter"], found["Reddit"]
 
     youtube_items = youtube_items[:max_items] or [{"title": f"No results for '{query}' on YouTube", "link": "#"}]
     twitter_items = twitter_items[:max_items] or [{"text": f"No results for '{query}' on Twitter", "link": "#"}]
@@ -205,27 +293,34 @@ def social_graph_auto(payload: SocialAutoIn):
             nodes_json.append({"id": item_id, "label": label, "type": "item", "platform": platform, "meta": meta})
             edges_json.append({"from": hub_id, "to": item_id})
 
-    # Optional: Save image visualization
-    try:
-        import networkx as nx
-        import matplotlib.pyplot as plt
-        G = nx.Graph()
-        G.add_node(center_id)
-        for e in edges_json:
-            G.add_edge(e["from"], e["to"])
-        pos = nx.spring_layout(G)
-        nx.draw(G, pos, with_labels=False, node_size=500, font_size=8)
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe = re.sub(r"[^a-zA-Z0-9]+", "_", query)[:40]
-        img_name = f"social_{safe}_{ts}.png"
-        img_path = os.path.join(GRAPHS_DIR, img_name)
-        plt.savefig(img_path, dpi=150)
-        plt.close()
-        image_url = f"/static/graphs/{img_name}"
-    except Exception:
-        image_url = None
+    # Image rendering happens on the background renderer; poll /social-graph/render if pending
+    render = renderer.request(
+        [n["id"] for n in nodes_json],
+        [(e["from"], e["to"]) for e in edges_json],
+        payload.image_format if payload.image_format in FORMATS else "png",
+    )
+    image_url = render["image_url"]
+
+    # Keep a copy in the graph store so it can be fetched/exported later
+    graph_key = f"social:auto:{query}"
+    graph_store.put(graph_key, {"nodes": nodes_json, "edges": edges_json})
+
+    return {"status": "ok", "query": query, "nodes": nodes_json, "edges": edges_json,
+            "image_url": image_url, "image_status": render["status"], "render_id": render["render_id"],
+            "graph_key": graph_key,
+            "partial": found["partial"], "pending_platforms": found["pending_platforms"]}
+
+
+@router.get("/social-graph/render")
+def social_graph_render(render_id: str = Query(..., description="render_id returned by /social-graph/auto")):
+    """Status of a background graph render; includes image_url once it is ready."""
+    return renderer.status(render_id)
+
 
-    return {"status": "ok", "query": query, "nodes": nodes_json, "edges": edges_json, "image_url": image_url}
+@router.get("/social-graph/nitter-health")
+def nitter_health():
+    """Latency, success rate and circuit state of each Nitter mirror."""
+    return {"race": nitter_pool.race, "instances": nitter_pool.snapshot()}
 
 
 @router.get("/social-graph")
@@ -233,9 +328,9 @@ def social_graph(query: str = Query(...), max_items: int = 6):
     q = (query or "").strip()
     if not q:
         return {"error": "query required"}
-    youtube = search_youtube(q, max_items)
-    twitter = search_twitter(q, max_items)
-    reddit = search_reddit(q, max_items)
+    youtube = dedupe_items(search_youtube(q, max_items))
+    twitter = dedupe_items(search_twitter(q, max_items), nitter_hosts=NITTER_INSTANCES)
+    reddit = dedupe_items(search_reddit(q, max_items))
 
     center_id = f"center_{re.sub(r'[^a-zA-Z0-9]', '_', q)[:40]}"
     nodes, edges = [{"id": center_id, "label": q, "type": "center"}], []
@@ -249,4 +344,6 @@ def social_graph(query: str = Query(...), max_items: int = 6):
             label = item.get("title") if platform != "Twitter" else item.get("text")
             nodes.append({"id": item_id, "label": label or str(item), "type": "item", "platform": platform, "meta": {"link": item.get("link", "#")}})
             edges.append({"from": hub_id, "to": item_id})
-    return {"status": "ok", "query": q, "nodes": nodes, "edges": edges}
+    graph_key = f"social:{q}"
+    graph_store.put(graph_key, {"nodes": nodes, "edges": edges})
+    return {"status": "ok", "query": q, "nodes": nodes, "edges": edges, "graph_key": graph_key}
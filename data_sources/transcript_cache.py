@@ -0,0 +1,175 @@
+# osint_fastapi_app/data_sources/transcript_cache.py
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+import requests
+from yt_dlp import YoutubeDL
+
+# -------------------------
+# Config
+# -------------------------
+BASE_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+os.makedirs(DATA_DIR, exist_ok=True)
+DB_PATH = os.getenv("YOUTUBE_TRANSCRIPT_STORE", os.path.join(DATA_DIR, "youtube_transcripts.sqlite3"))
+# A video without captions is not asked again for this long
+MISSING_TTL = float(os.getenv("YOUTUBE_TRANSCRIPT_MISSING_TTL", "86400"))
+CAPTION_LANGUAGES = [l.strip() for l in os.getenv("YOUTUBE_CAPTION_LANGUAGES", "en,ur,hi").split(",") if l.strip()]
+TIMEOUT = 15
+
+_VIDEO_ID_RE = re.compile(r"(?:v=|youtu\.be/|/shorts/|/embed/|/live/)([\w-]{11})")
+_VTT_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def video_id_from_url(url: str) -> Optional[str]:
+    match = _VIDEO_ID_RE.search(url or "")
+    return match.group(1) if match else None
+
+
+def _pick_track(info: Dict[str, Any]):
+    """(language, track) for the preferred caption track: manual before automatic, json3 before vtt."""
+    for kind in ("subtitles", "automatic_captions"):
+        tracks = info.get(kind) or {}
+        languages = [l for l in CAPTION_LANGUAGES if l in tracks] + [l for l in tracks if l not in CAPTION_LANGUAGES]
+        for language in languages:
+            by_ext = {t.get("ext"): t for t in tracks[language]}
+            for ext in ("json3", "vtt"):
+                if ext in by_ext:
+                    return language, by_ext[ext], kind
+    return None, None, None
+
+
+def _parse_track(body: str, ext: str) -> str:
+    if ext == "json3":
+        events = json.loads(body).get("events", [])
+        parts = ["".join(seg.get("utf8", "") for seg in ev.get("segs", [])) for ev in events]
+    else:
+        parts = []
+        for line in body.splitlines():
+            line = line.strip()
+            if not line or "-->" in line or line.startswith(("WEBVTT", "Kind:", "Language:")) or line.isdigit():
+                continue
+            parts.append(_VTT_TAG_RE.sub("", line))
+        # Auto captions repeat each line as the next one scrolls in
+        parts = [p for i, p in enumerate(parts) if i == 0 or p != parts[i - 1]]
+    return re.sub(r"\s+", " ", " ".join(parts)).strip()
+
+
+def fetch_captions(video_id: str) -> Dict[str, Any]:
+    """Caption text of a video via yt-dlp metadata (no media download)."""
+    with YoutubeDL({"quiet": True, "skip_download": True}) as ydl:
+        info = ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+    language, track, kind = _pick_track(info)
+    if track is None:
+        return {"text": "", "language": None, "source": "none"}
+    res = requests.get(track["url"], timeout=TIMEOUT)
+    res.raise_for_status()
+    return {"text": _parse_track(res.text, track["ext"]), "language": language,
+            "source": "captions" if kind == "subtitles" else "auto_captions"}
+
+
+# -------------------------
+# Cache
+# -------------------------
+class TranscriptCache:
+    """
+    Video transcripts by video id in a local SQLite file (WAL mode, shared
+    by all workers). Captions are fetched once per video; concurrent
+    requests for the same video share one fetch. Whisper transcripts from
+    /youtube/transcribe are stored here too and win over captions.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    video_id TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    language TEXT,
+                    source TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+                """
+            )
+
+    def put(self, video_id: str, text: str, language: Optional[str], source: str):
+        """Store a transcript; a stored Whisper transcript is only ever replaced by another one."""
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO transcripts (video_id, text, language, source, fetched_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(video_id) DO UPDATE SET text = excluded.text, language = excluded.language, "
+                "source = excluded.source, fetched_at = excluded.fetched_at "
+                "WHERE transcripts.source != 'whisper' OR excluded.source = 'whisper'",
+                (video_id, text, language, source, time.time()),
+            )
+
+    def lookup(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Stored transcript, or None if missing (or a 'no captions' marker that has expired)."""
+        row = self._conn().execute("SELECT * FROM transcripts WHERE video_id = ?", (video_id,)).fetchone()
+        if row is None or (row["source"] == "none" and time.time() - row["fetched_at"] > MISSING_TTL):
+            return None
+        return {"video_id": video_id, "text": row["text"], "language": row["language"],
+                "source": row["source"], "cached": True}
+
+    def get(self, video_id: str) -> Dict[str, Any]:
+        """Transcript for `video_id`, fetching captions on a miss. `text` is empty when none exist."""
+        cached = self.lookup(video_id)
+        if cached is not None:
+            return cached
+        with self._lock:
+            fut = self._inflight.get(video_id)
+            owner = fut is None
+            if owner:
+                fut = self._inflight[video_id] = Future()
+        if not owner:
+            return fut.result()
+        try:
+            fetched = fetch_captions(video_id)
+            self.put(video_id, fetched["text"], fetched["language"], fetched["source"])
+            # A Whisper transcript stored during the fetch is kept; return that one
+            stored = self.lookup(video_id)
+            if stored is not None and stored["source"] == "whisper":
+                result = stored
+            else:
+                result = dict(fetched, video_id=video_id, cached=False)
+            fut.set_result(result)
+            return result
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(video_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        rows = self._conn().execute("SELECT source, COUNT(*) FROM transcripts GROUP BY source").fetchall()
+        return {"path": self.path, "by_source": {r[0]: r[1] for r in rows}}
+
+
+transcript_cache = TranscriptCache()
@@ -0,0 +1,251 @@
+# osint_fastapi_app/data_sources/tweet_harvester.py
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import snscrape.modules.twitter as sntwitter
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: fall back to the in-process lock only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# Config
+# -------------------------
+BASE_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+os.makedirs(DATA_DIR, exist_ok=True)
+STORE_PATH = os.getenv("TWEET_HARVEST_STORE", os.path.join(DATA_DIR, "tweet_harvest.jsonl"))
+CHECKPOINT_PATH = os.getenv("TWEET_HARVEST_CHECKPOINTS", os.path.join(DATA_DIR, "tweet_harvest_checkpoints.json"))
+MAX_WORKERS = int(os.getenv("TWEET_HARVEST_WORKERS", "4"))
+CHECKPOINT_EVERY = 50   # tweets between checkpoint writes for a running query
+MAX_JOBS = 100
+
+
+def tweet_to_record(tweet, query: str) -> Dict[str, Any]:
+    return {
+        "id": tweet.id,
+        "query": query,
+        "text": tweet.content,
+        "created_at": tweet.date.strftime("%Y-%m-%d %H:%M:%S"),
+        "author_id": tweet.user.username,
+        "lang": tweet.lang,
+        "url": tweet.url,
+        "harvested_at": time.time(),
+    }
+
+
+# -------------------------
+# Harvester
+# -------------------------
+class TweetHarvester:
+    """
+    Runs many snscrape searches concurrently into one append-only JSONL
+    store, deduplicating tweets across queries by id.
+
+    Each query keeps a checkpoint (written atomically): `newest_id` of the
+    last finished run, and for a run in progress the newest and oldest ids
+    seen so far. snscrape returns newest first, so a run that was
+    interrupted or stopped at its limit is continued below its oldest id
+    (max_id:), still bounded by `newest_id` (since_id:). Only a run that
+    reaches `newest_id` finishes and moves the mark up to its own newest
+    id. Nothing is fetched twice and nothing in between is skipped.
+    """
+
+    def __init__(self, store_path: str = STORE_PATH, checkpoint_path: str = CHECKPOINT_PATH):
+        self.store_path = store_path
+        self.checkpoint_path = checkpoint_path
+        self._lock = threading.Lock()
+        self._seen: Set[int] = set()
+        self._checkpoints: Dict[str, Dict[str, Any]] = {}
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._running: Dict[str, str] = {}  # query -> job id harvesting it; a query's checkpoint has one writer
+        self._load()
+
+    # ----- Persistence -----
+    def _load(self):
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                self._checkpoints = json.load(f)
+        if os.path.exists(self.store_path):
+            with open(self.store_path, "rb") as f:
+                for line in f:
+                    try:
+                        self._seen.add(int(json.loads(line)["id"]))
+                    except (ValueError, KeyError):
+                        continue  # partially written last line
+
+    def _save_checkpoints(self):
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._checkpoints, f, indent=1)
+            os.replace(tmp_path, self.checkpoint_path)  # atomic: a crash never leaves half a file
+
+    def _append(self, records: List[Dict[str, Any]]) -> int:
+        """Append records whose id is new; returns how many were written."""
+        with self._lock:
+            fresh = [r for r in records if r["id"] not in self._seen]
+            if not fresh:
+                return 0
+            payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in fresh).encode("utf-8")
+            with open(self.store_path, "ab") as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.write(payload)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+            self._seen.update(r["id"] for r in fresh)
+            return len(fresh)
+
+    # ----- Harvesting -----
+    def _search_query(self, query: str, checkpoint: Dict[str, Any]) -> str:
+        search = f"{query} lang:en"
+        if checkpoint.get("newest_id"):
+            search += f" since_id:{checkpoint['newest_id']}"
+        run = checkpoint.get("run")
+        if run and run.get("oldest_id"):
+            search += f" max_id:{run['oldest_id'] - 1}"
+        return search
+
+    def harvest_query(self, query: str, limit: int, progress: Dict[str, Any]):
+        with self._lock:
+            checkpoint = self._checkpoints.setdefault(query, {})
+            run = checkpoint.setdefault("run", {})
+            run["fetched"] = 0  # `limit` applies to this call, not to the run being continued
+        batch: List[Dict[str, Any]] = []
+
+        def flush():
+            written = self._append(batch)
+            with self._lock:
+                progress["written"] += written
+                progress["duplicates"] += len(batch) - written
+            batch.clear()
+            self._save_checkpoints()
+
+        exhausted = True
+        try:
+            for tweet in sntwitter.TwitterSearchScraper(self._search_query(query, checkpoint)).get_items():
+                if run["fetched"] >= limit:
+                    exhausted = False
+                    break
+                batch.append(tweet_to_record(tweet, query))
+                with self._lock:
+                    run["newest_id"] = max(run.get("newest_id") or 0, tweet.id)
+                    run["oldest_id"] = min(run.get("oldest_id") or tweet.id, tweet.id)
+                    run["fetched"] += 1
+                    progress["fetched"] += 1
+                if len(batch) >= CHECKPOINT_EVERY:
+                    flush()
+        except BaseException:
+            flush()  # keep what was fetched so the resumed run starts below it
+            raise
+
+        with self._lock:
+            progress["exhausted"] = exhausted
+            if exhausted:
+                # Everything down to the old mark is in: fold the run into the high-water mark
+                if run.get("newest_id"):
+                    checkpoint["newest_id"] = max(checkpoint.get("newest_id") or 0, run["newest_id"])
+                checkpoint.pop("run", None)
+                checkpoint["finished_at"] = time.time()
+            # Otherwise the run stays open and the next harvest continues below its oldest id
+        flush()
+
+    def start(self, queries: Iterable[str], limit_per_query: int, workers: int = MAX_WORKERS) -> Dict[str, Any]:
+        """
+        Harvest `queries` in a background pool; returns the job record.
+        Queries already being harvested by another job are skipped (status
+        "skipped", with that job's id), since both would advance the same
+        checkpoint.
+        """
+        queries = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "job_id": job_id,
+            "status": "running",
+            "started_at": datetime.utcnow().isoformat(),
+            "queries": {},
+        }
+        with self._lock:
+            claimed = []
+            for q in queries:
+                if q in self._running:
+                    job["queries"][q] = {"status": "skipped", "running_in": self._running[q]}
+                else:
+                    self._running[q] = job_id
+                    claimed.append(q)
+                    job["queries"][q] = {"status": "pending", "fetched": 0, "written": 0, "duplicates": 0}
+            queries = claimed
+            self.jobs[job_id] = job
+            while len(self.jobs) > MAX_JOBS:
+                self.jobs.pop(next(iter(self.jobs)))
+
+        def run_one(query: str):
+            progress = job["queries"][query]
+            progress["status"] = "running"
+            try:
+                self.harvest_query(query, limit_per_query, progress)
+                progress["status"] = "done"
+            except Exception as e:
+                # The checkpoint keeps the partial run; the next harvest resumes it
+                progress["status"] = "error"
+                progress["error"] = str(e)
+                logger.warning(f"Harvest of '{query}' failed: {e}")
+                self._save_checkpoints()
+            finally:
+                with self._lock:
+                    self._running.pop(query, None)
+
+        def run_all():
+            if not queries:
+                job["status"] = "done"
+                job["finished_at"] = datetime.utcnow().isoformat()
+                return
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(queries) or 1)),
+                                    thread_name_prefix="tweet-harvest") as pool:
+                list(pool.map(run_one, queries))
+            job["status"] = "done"
+            job["finished_at"] = datetime.utcnow().isoformat()
+
+        threading.Thread(target=run_all, name=f"tweet-harvest-{job_id}", daemon=True).start()
+        return job
+
+    def checkpoints(self) -> Dict[str, Any]:
+        with self._lock:
+            return json.loads(json.dumps(self._checkpoints))
+
+    def results(self, query: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recently harvested records, optionally for one query."""
+        if not os.path.exists(self.store_path):
+            return []
+        out: "deque[Dict[str, Any]]" = deque(maxlen=limit)
+        with open(self.store_path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if query is None or record.get("query") == query:
+                    out.append(record)
+        return list(reversed(out))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"tweets": len(self._seen), "queries": len(self._checkpoints),
+                    "store_bytes": os.path.getsize(self.store_path) if os.path.exists(self.store_path) else 0}
+
+
+tweet_harvester = TweetHarvester()
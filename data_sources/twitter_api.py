@@ -28,11 +28,15 @@ def get_tweets(query: str, limit: int = 10):
     except Exception as e:
         return {"error": str(e)}
 import os
-import requests
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
 from dotenv import load_dotenv
 from datetime import datetime
 
+from osint_fastapi_app.data_sources.twitter_client import twitter_client, TwitterRateLimited, TwitterAPIError
+from osint_fastapi_app.data_sources.tweet_harvester import tweet_harvester
+
 load_dotenv()
 router = APIRouter()
 
@@ -40,45 +44,34 @@ BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
 if not BEARER_TOKEN:
     raise ValueError("Twitter Bearer Token not found in environment variables")
 
-TWITTER_SEARCH_URL = "https://api.twitter.com/2/tweets/search/recent"
-
 @router.get("/tweets")
 def get_tweets(query: str):
-    headers = {
-        "Authorization": f"Bearer {BEARER_TOKEN}"
-    }
     params = {
         "query": query,
         "max_results": 10,
         "tweet.fields": "created_at,author_id,lang"
     }
 
-    response = requests.get(TWITTER_SEARCH_URL, headers=headers, params=params)
-
-    # If we hit a rate limit
-    if response.status_code == 429:
-        reset_timestamp = response.headers.get("x-rate-limit-reset")
-        if reset_timestamp:
-            reset_time = datetime.fromtimestamp(int(reset_timestamp))
-            wait_seconds = int((reset_time - datetime.now()).total_seconds())
+    try:
+        data = twitter_client.search_recent(params)
+    except TwitterRateLimited as e:
+        # If we hit a rate limit
+        reset_time = datetime.fromtimestamp(e.reset_at)
+        wait_seconds = e.retry_after
 
         # Convert seconds to minutes and seconds
-            minutes, seconds = divmod(wait_seconds, 60)
-            human_readable = f"{minutes} minutes and {seconds} seconds"
-
-            return {
-                "error": "Rate limit reached",
-                "retry_after_seconds": wait_seconds,
-                "retry_after_human": human_readable,
-                "retry_at": reset_time.strftime("%I:%M:%S %p")  # e.g. "06:40:30 PM"
-            }
-        raise HTTPException(status_code=429, detail="Rate limit reached. Try again later.")
-
-
-    if not response.ok:
-        raise HTTPException(status_code=response.status_code, detail=response.text)
+        minutes, seconds = divmod(wait_seconds, 60)
+        human_readable = f"{minutes} minutes and {seconds} seconds"
+
+        return {
+            "error": "Rate limit reached",
+            "retry_after_seconds": wait_seconds,
+            "retry_after_human": human_readable,
+            "retry_at": reset_time.strftime("%I:%M:%S %p")  # e.g. "06:40:30 PM"
+        }
+    except TwitterAPIError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-    data = response.json()
     tweets = data.get("data", [])
 
     if not tweets:
@@ -94,3 +87,39 @@ def get_tweets(query: str):
         }
         for t in tweets
     ]
+
+
+# ----------------------------
+# snscrape harvesting
+# ----------------------------
+class HarvestIn(BaseModel):
+    queries: List[str]
+    limit_per_query: int = 500
+    workers: int = 4
+
+
+@router.post("/tweets/harvest")
+def start_harvest(data: HarvestIn):
+    """Harvest many queries concurrently; resumes each query from its checkpoint."""
+    if not any(q.strip() for q in data.queries):
+        raise HTTPException(status_code=400, detail="At least one query is required")
+    job = tweet_harvester.start(data.queries, max(1, min(data.limit_per_query, 10000)),
+                                max(1, min(data.workers, 16)))
+    skipped = {q: p["running_in"] for q, p in job["queries"].items() if p["status"] == "skipped"}
+    return {"job_id": job["job_id"], "status": job["status"],
+            "queries": [q for q in job["queries"] if q not in skipped], "skipped": skipped}
+
+
+@router.get("/tweets/harvest/status")
+def harvest_status(job_id: Optional[str] = None):
+    if job_id is None:
+        return {"store": tweet_harvester.stats(), "checkpoints": tweet_harvester.checkpoints()}
+    job = tweet_harvester.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown harvest job")
+    return job
+
+
+@router.get("/tweets/harvest/results")
+def harvest_results(query: Optional[str] = None, limit: int = Query(100, ge=1, le=5000)):
+    return {"query": query, "tweets": tweet_harvester.results(query, limit)}
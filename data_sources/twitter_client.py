@@ -0,0 +1,175 @@
+# osint_fastapi_app/data_sources/twitter_client.py
+import os
+import time
+import threading
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+from dotenv import load_dotenv
+
+from osint_fastapi_app.data_sources.rate_limit import RateLimiter
+from osint_fastapi_app.data_sources.search_cache import search_cache
+
+load_dotenv()
+
+# -------------------------
+# Config
+# -------------------------
+BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
+API_BASE = "https://api.twitter.com/2"
+SEARCH_RECENT_PATH = "/tweets/search/recent"
+# App-auth recent search allows 450 requests per 15 minutes; lower tiers allow fewer
+SEARCH_REQUESTS_PER_WINDOW = int(os.getenv("TWITTER_SEARCH_REQUESTS_PER_15MIN", "450"))
+WINDOW_SECONDS = 15 * 60
+MAX_WAIT = float(os.getenv("TWITTER_MAX_WAIT", "5"))   # longest a caller queues for a token
+TIMEOUT = 15
+MAX_PAGE_SIZE = 100   # recent search page size is 10..100
+
+
+class TwitterRateLimited(Exception):
+    def __init__(self, reset_at: float, message: str = "Rate limit reached"):
+        super().__init__(message)
+        self.reset_at = reset_at
+
+    @property
+    def retry_after(self) -> int:
+        return max(0, int(self.reset_at - time.time()))
+
+
+class TwitterAPIError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+# -------------------------
+# Client
+# -------------------------
+class TwitterClient:
+    """
+    One bearer-token client for every Twitter v2 endpoint in the app.
+
+    - a token bucket spreads requests over the 15-minute window instead of
+      spending the whole quota in a burst
+    - x-rate-limit-limit / -remaining / -reset headers are tracked per path;
+      once remaining hits 0 calls fail fast until the reset, without a 429
+    - identical searches share the search cache: short TTL, and concurrent
+      identical queries make one upstream call
+    """
+
+    def __init__(self, bearer_token: Optional[str] = BEARER_TOKEN,
+                 requests_per_window: int = SEARCH_REQUESTS_PER_WINDOW):
+        self.bearer_token = bearer_token
+        self.limiter = RateLimiter(rate=requests_per_window / WINDOW_SECONDS, burst=min(15, requests_per_window))
+        self.session = requests.Session()
+        self.windows: Dict[str, Dict[str, Any]] = {}  # path -> {limit, remaining, reset}
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _record_window(self, path: str, headers):
+        try:
+            window = {
+                "limit": int(headers["x-rate-limit-limit"]),
+                "remaining": int(headers["x-rate-limit-remaining"]),
+                "reset": float(headers["x-rate-limit-reset"]),
+            }
+        except (KeyError, ValueError):
+            return
+        with self._lock:
+            self.windows[path] = window
+        if path == SEARCH_RECENT_PATH and window["limit"] > 0:
+            # Pace to the quota this app actually has, which depends on the API tier
+            self.limiter.set_rate(window["limit"] / WINDOW_SECONDS)
+
+    def _check_window(self, path: str):
+        with self._lock:
+            window = self.windows.get(path)
+        if window and window["remaining"] <= 0 and window["reset"] > time.time():
+            raise TwitterRateLimited(window["reset"])
+
+    def get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Uncached GET of a v2 endpoint. Raises TwitterRateLimited / TwitterAPIError."""
+        if not self.bearer_token:
+            raise TwitterAPIError(500, "Twitter Bearer Token not set in .env")
+        self._check_window(path)
+        if not self.limiter.acquire(max_wait=MAX_WAIT):
+            raise TwitterRateLimited(time.time() + 1.0 / self.limiter.snapshot()["rate_per_second"],
+                                     "Request budget exhausted")
+
+        res = self.session.get(
+            f"{API_BASE}{path}", params=params, timeout=TIMEOUT,
+            headers={"Authorization": f"Bearer {self.bearer_token}"},
+        )
+        with self._lock:
+            self.calls += 1
+        self._record_window(path, res.headers)
+        if res.status_code == 429:
+            reset = res.headers.get("x-rate-limit-reset")
+            raise TwitterRateLimited(float(reset) if reset else time.time() + WINDOW_SECONDS)
+        if not res.ok:
+            raise TwitterAPIError(res.status_code, res.text)
+        return res.json()
+
+    def search_recent(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Cached recent search; `params` are the v2 query parameters including `query`."""
+        # The exact query stays in the key params: operators such as OR are case-sensitive
+        return search_cache.get_or_fetch(
+            "twitter", params["query"], params,
+            lambda: self.get(SEARCH_RECENT_PATH, params),
+            cache_if=lambda data: "meta" in data,
+        )
+
+    def iter_search_pages(self, params: Dict[str, Any], max_tweets: int,
+                          deadline: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield raw recent-search pages of up to MAX_PAGE_SIZE tweets, following
+        meta.next_token until `max_tweets` tweets or the monotonic `deadline`.
+        The last page is cut to exactly `max_tweets`; a cut page carries
+        meta.truncated and no next_token. Pages are not cached. Rate-limit errors propagate to the caller
+        after the pages already yielded.
+        """
+        fetched = 0
+        next_token = None
+        while fetched < max_tweets:
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            page_params = dict(params, max_results=max(10, min(MAX_PAGE_SIZE, max_tweets - fetched)))
+            if next_token:
+                page_params["next_token"] = next_token
+            page = self.get(SEARCH_RECENT_PATH, page_params)
+            tweets = page.get("data", [])
+            remaining = max_tweets - fetched
+            if len(tweets) > remaining:
+                # The API returns at least 10: drop the surplus, and the token that would skip past it
+                tweets = tweets[:remaining]
+                authors = {t.get("author_id") for t in tweets}
+                includes = dict(page.get("includes", {}))
+                if "users" in includes:
+                    includes["users"] = [u for u in includes["users"] if u["id"] in authors]
+                meta = {k: v for k, v in page.get("meta", {}).items() if k != "next_token"}
+                page = dict(page, data=tweets, includes=includes, meta=dict(meta, truncated=True))
+            fetched += len(tweets)
+            yield page
+            next_token = page.get("meta", {}).get("next_token")
+            if not next_token:
+                return
+
+    def budget(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            windows = {
+                path: dict(w, resets_in_seconds=max(0, int(w["reset"] - now)))
+                for path, w in self.windows.items()
+            }
+            calls = self.calls
+        return {
+            "windows": windows,
+            "token_bucket": self.limiter.snapshot(),
+            "upstream_calls": calls,
+            "cache": search_cache.stats(),
+        }
+
+
+# Shared by every Twitter API endpoint
+twitter_client = TwitterClient()
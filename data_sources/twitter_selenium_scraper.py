@@ -1,31 +1,39 @@
+import os
+import time
 from fastapi import APIRouter
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from osint_fastapi_app.data_sources.browser_pool import browser_pool
+from osint_fastapi_app.data_sources.search_cache import search_cache
 
 router = APIRouter()
 
-@router.get("/twitter-trends")
-def get_twitter_trends(location: str = "pakistan"):
-    try:
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
+# Point at a local copy to test or benchmark without the network, e.g.
+# TRENDS24_URL_TEMPLATE=file:///.../data_sources/fixtures/trends24.html
+TRENDS24_URL_TEMPLATE = os.getenv("TRENDS24_URL_TEMPLATE", "https://trends24.in/{location}/")
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "trends24.html")
+TREND_SELECTOR = ".trend-card__list a"
+WAIT_SECONDS = 15
 
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
 
-        url = f"https://trends24.in/{location.lower().replace(' ', '-')}/"
+def scrape_trends(location: str, url_template: str = TRENDS24_URL_TEMPLATE):
+    """Top 10 trends for `location`, waiting for the list to render rather than sleeping."""
+    url = url_template.format(location=location.lower().replace(' ', '-'))
+    with browser_pool.session() as driver:
         driver.get(url)
-        time.sleep(5)  # Let JS load
+        WebDriverWait(driver, WAIT_SECONDS).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, TREND_SELECTOR))
+        )
+        trend_elements = driver.find_elements(By.CSS_SELECTOR, TREND_SELECTOR)
+        return [trend.text for trend in trend_elements][:10]
 
-        trend_elements = driver.find_elements(By.CSS_SELECTOR, ".trend-card__list a")
-        trends = [trend.text for trend in trend_elements][:10]
 
-        driver.quit()
+@router.get("/twitter-trends")
+def get_twitter_trends(location: str = "pakistan"):
+    try:
+        trends = search_cache.get_or_fetch("trends24", location, None, lambda: scrape_trends(location))
 
         return {
             "source": "trends24",
@@ -37,4 +45,19 @@ def get_twitter_trends(location: str = "pakistan"):
         return {"error": str(e)}
 
 
-#FOR TWITTER HASHTAGS
\ No newline at end of file
+@router.get("/twitter-trends/pool")
+def get_browser_pool_stats():
+    return browser_pool.stats()
+
+
+#FOR TWITTER HASHTAGS
+
+if __name__ == "__main__":
+    # Benchmark against the local fixture: python -m osint_fastapi_app.data_sources.twitter_selenium_scraper
+    fixture_url = "file://" + FIXTURE_PATH
+    for i in range(5):
+        start = time.perf_counter()
+        trends = scrape_trends("pakistan", fixture_url)
+        print(f"run {i + 1}: {len(trends)} trends in {time.perf_counter() - start:.2f}s")
+    print(browser_pool.stats())
+    browser_pool.close()
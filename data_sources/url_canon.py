@@ -0,0 +1,129 @@
+# osint_fastapi_app/data_sources/url_canon.py
+import re
+import hashlib
+import urllib.parse
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Query parameters that only carry tracking/share context
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid",
+    "si", "feature", "ref", "ref_src", "ref_url", "share_id", "context",
+    "pp", "ab_channel", "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+}
+
+YOUTUBE_HOSTS = {"youtube.com", "m.youtube.com", "music.youtube.com", "youtube-nocookie.com", "youtu.be"}
+REDDIT_HOSTS = {"reddit.com", "old.reddit.com", "new.reddit.com", "np.reddit.com", "i.reddit.com", "redd.it"}
+TWITTER_HOSTS = {"twitter.com", "mobile.twitter.com", "x.com", "mobile.x.com"}
+
+_YT_ID = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+
+def _host(parsed: urllib.parse.ParseResult) -> str:
+    host = (parsed.hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def youtube_video_id(url: str) -> Optional[str]:
+    """Video id from watch, youtu.be, shorts, embed and live URLs."""
+    parsed = urllib.parse.urlparse(url)
+    host = _host(parsed)
+    if host not in YOUTUBE_HOSTS:
+        return None
+    parts = [p for p in parsed.path.split("/") if p]
+    if host == "youtu.be":
+        candidate = parts[0] if parts else ""
+    elif parts[:1] == ["watch"]:
+        candidate = urllib.parse.parse_qs(parsed.query).get("v", [""])[0]
+    elif len(parts) >= 2 and parts[0] in ("shorts", "embed", "live", "v"):
+        candidate = parts[1]
+    else:
+        return None
+    return candidate if _YT_ID.match(candidate) else None
+
+
+def _reddit_canonical(parsed: urllib.parse.ParseResult) -> Optional[str]:
+    parts = [p for p in parsed.path.split("/") if p]
+    if _host(parsed) == "redd.it" and parts:
+        return f"https://www.reddit.com/comments/{parts[0].lower()}/"
+    # /r/<sub>/comments/<id>/<slug>/ -> /r/<sub>/comments/<id>/
+    if len(parts) >= 4 and parts[0].lower() == "r" and parts[2] == "comments":
+        return f"https://www.reddit.com/r/{parts[1].lower()}/comments/{parts[3].lower()}/"
+    if len(parts) >= 2 and parts[0] == "comments":
+        return f"https://www.reddit.com/comments/{parts[1].lower()}/"
+    return None
+
+
+def _status_canonical(parsed: urllib.parse.ParseResult) -> Optional[str]:
+    m = re.match(r"^/([^/]+)/status(?:es)?/(\d+)", parsed.path)
+    if m:
+        return f"https://twitter.com/{m.group(1).lower()}/status/{m.group(2)}"
+    return None
+
+
+def canonicalize_url(url: str, nitter_hosts: Iterable[str] = ()) -> str:
+    """
+    Stable form of a result URL so the same item from different variants,
+    mirrors or share links compares equal:
+    - YouTube watch/shorts/embed/youtu.be -> https://www.youtube.com/watch?v=<id>
+    - Reddit (old./np./redd.it, with slug) -> https://www.reddit.com/r/<sub>/comments/<id>/
+    - Nitter mirrors and x.com status URLs -> https://twitter.com/<user>/status/<id>
+    - otherwise: lowercase scheme/host, drop fragment, tracking params, trailing slash
+    """
+    if not url or url == "#":
+        return url
+    try:
+        parsed = urllib.parse.urlparse(url.strip())
+    except ValueError:
+        return url
+    host = _host(parsed)
+
+    vid = youtube_video_id(url)
+    if vid:
+        return f"https://www.youtube.com/watch?v={vid}"
+    if host in REDDIT_HOSTS:
+        canonical = _reddit_canonical(parsed)
+        if canonical:
+            return canonical
+    nitter = {(urllib.parse.urlparse(h).hostname or h).lower() for h in nitter_hosts}
+    if host in TWITTER_HOSTS or host in nitter or "nitter" in host:
+        canonical = _status_canonical(parsed)
+        if canonical:
+            return canonical
+
+    query = [
+        (k, v) for k, v in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    ]
+    path = parsed.path.rstrip("/") or "/"
+    return urllib.parse.urlunparse((
+        (parsed.scheme or "https").lower(),
+        (parsed.netloc or "").lower(),
+        path, "", urllib.parse.urlencode(query), "",
+    ))
+
+
+def item_key(item: Dict[str, Any]) -> str:
+    """Hash identifying a search result: its canonical link, or its text when it has no link."""
+    link = item.get("link") or ""
+    if link and link != "#":
+        basis = "url:" + link
+    else:
+        text = item.get("title") or item.get("text") or ""
+        basis = "text:" + re.sub(r"\s+", " ", text).strip().casefold()
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()
+
+
+def dedupe_items(items: Iterable[Dict[str, Any]], seen: Optional[Set[str]] = None,
+                 nitter_hosts: Iterable[str] = ()) -> List[Dict[str, Any]]:
+    """Canonicalize links and drop items already in `seen` (which is updated in place)."""
+    seen = set() if seen is None else seen
+    out = []
+    for item in items:
+        if item.get("link"):
+            item = dict(item, link=canonicalize_url(item["link"], nitter_hosts))
+        key = item_key(item)
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(item)
+    return out
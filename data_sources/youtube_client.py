@@ -0,0 +1,230 @@
+# osint_fastapi_app/data_sources/youtube_client.py
+import os
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from dotenv import load_dotenv
+
+from osint_fastapi_app.data_sources.search_cache import search_cache
+
+try:
+    from zoneinfo import ZoneInfo
+    _QUOTA_TZ = ZoneInfo("America/Los_Angeles")  # the daily quota resets at midnight Pacific
+except Exception:
+    _QUOTA_TZ = None
+
+load_dotenv()
+
+# -------------------------
+# Config
+# -------------------------
+API_BASE = "https://www.googleapis.com/youtube/v3"
+YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "")
+DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+ETAG_CACHE_ENTRIES = int(os.getenv("YOUTUBE_ETAG_CACHE_ENTRIES", "1000"))
+TIMEOUT = 12
+VIDEOS_PER_CALL = 50   # videos.list / channels.list accept up to 50 ids
+
+# Units charged per call, by resource (YouTube Data API v3 quota table)
+QUOTA_COSTS = {
+    "search": 100,
+    "videos": 1,
+    "channels": 1,
+    "playlistItems": 1,
+    "commentThreads": 1,
+}
+
+
+class YouTubeQuotaExceeded(Exception):
+    pass
+
+
+class YouTubeAPIError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class QuotaMeter:
+    """Units charged by the calls made with it: one request's share of the daily quota."""
+
+    def __init__(self):
+        self.units = 0
+        self._lock = threading.Lock()
+
+    def add(self, units: int):
+        with self._lock:
+            self.units += units
+
+
+def _quota_day() -> str:
+    return datetime.now(_QUOTA_TZ).strftime("%Y-%m-%d")
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# -------------------------
+# Client
+# -------------------------
+class YouTubeClient:
+    """
+    One entry point for YouTube Data API v3 calls.
+
+    - every call is charged against a daily unit budget, per resource, and
+      refused locally once the budget (or a quotaExceeded error) says the
+      key is spent
+    - responses are kept with their ETag; repeats are sent with
+      If-None-Match and a 304 returns the kept body without a download
+    - search results additionally go through the shared search cache
+    - videos_by_id() fetches statistics for up to 50 ids per call
+    """
+
+    def __init__(self, api_key: str = YOUTUBE_API_KEY, daily_quota: int = DAILY_QUOTA,
+                 etag_entries: int = ETAG_CACHE_ENTRIES):
+        self.api_key = api_key
+        self.daily_quota = daily_quota
+        self.etag_entries = etag_entries
+        self.session = requests.Session()
+        self._etags: "OrderedDict[Tuple[str, str], Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._day = _quota_day()
+        self._used: Dict[str, int] = {}
+        self._calls: Dict[str, int] = {}
+        self._not_modified = 0
+        self._exhausted = False
+        self._lock = threading.Lock()
+
+    # ----- Quota -----
+    def _roll_day(self):
+        today = _quota_day()
+        if today != self._day:
+            self._day, self._used, self._calls, self._exhausted = today, {}, {}, False
+
+    def _charge(self, resource: str) -> int:
+        cost = QUOTA_COSTS.get(resource, 1)
+        with self._lock:
+            self._roll_day()
+            if self._exhausted or sum(self._used.values()) + cost > self.daily_quota:
+                raise YouTubeQuotaExceeded(f"YouTube quota exhausted for {self._day} ({resource} costs {cost} units)")
+            self._used[resource] = self._used.get(resource, 0) + cost
+            self._calls[resource] = self._calls.get(resource, 0) + 1
+        return cost
+
+    def quota(self) -> Dict[str, Any]:
+        with self._lock:
+            self._roll_day()
+            used = sum(self._used.values())
+            return {
+                "day": self._day,
+                "daily_quota": self.daily_quota,
+                "used": used,
+                "remaining": max(0, self.daily_quota - used),
+                "exhausted": self._exhausted,
+                "units_by_resource": dict(self._used),
+                "calls_by_resource": dict(self._calls),
+                "not_modified": self._not_modified,
+                "etag_entries": len(self._etags),
+            }
+
+    # ----- Requests -----
+    def call(self, resource: str, params: Dict[str, Any], api_key: Optional[str] = None,
+             meter: Optional[QuotaMeter] = None) -> Dict[str, Any]:
+        """
+        GET `resource` with `params` (without the key); the units charged are
+        also added to `meter`. Raises YouTubeAPIError / YouTubeQuotaExceeded.
+        """
+        key = api_key or self.api_key
+        if not key:
+            raise YouTubeAPIError(400, "YOUTUBE_API_KEY not set in environment.")
+        cache_key = (resource, json.dumps(params, sort_keys=True, default=str))
+        with self._lock:
+            cached = self._etags.get(cache_key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+
+        cost = self._charge(resource)
+        if meter is not None:
+            meter.add(cost)
+        res = self.session.get(f"{API_BASE}/{resource}", params=dict(params, key=key),
+                               headers=headers, timeout=TIMEOUT)
+        if res.status_code == 304 and cached:
+            with self._lock:
+                self._not_modified += 1
+                self._etags.move_to_end(cache_key)
+            return cached[1]
+        try:
+            data = res.json()
+        except ValueError:
+            data = {}
+        if not res.ok:
+            error = data.get("error", {}) if isinstance(data, dict) else {}
+            reasons = {e.get("reason") for e in error.get("errors", [])}
+            if "quotaExceeded" in reasons or "dailyLimitExceeded" in reasons:
+                with self._lock:
+                    self._exhausted = True
+                raise YouTubeQuotaExceeded(error.get("message", "YouTube quota exceeded"))
+            raise YouTubeAPIError(res.status_code, error.get("message") or res.text[:300])
+
+        etag = data.get("etag") or res.headers.get("ETag")
+        if etag:
+            with self._lock:
+                self._etags[cache_key] = (etag, data)
+                self._etags.move_to_end(cache_key)
+                while len(self._etags) > self.etag_entries:
+                    self._etags.popitem(last=False)
+        return data
+
+    # ----- Endpoints -----
+    def search(self, query: str, max_results: int = 10, api_key: Optional[str] = None,
+               **extra: Any) -> Dict[str, Any]:
+        """search.list for videos (100 units), shared through the search cache."""
+        cache_params = {"maxResults": max_results, "type": "video", **extra}
+        return search_cache.get_or_fetch(
+            "youtube", query, cache_params,
+            lambda: self.call("search", {"part": "snippet", "q": query, **cache_params}, api_key=api_key),
+            cache_if=lambda data: "items" in data,
+        )
+
+    def videos_by_id(self, video_ids: Iterable[str], part: str = "statistics",
+                     api_key: Optional[str] = None, meter: Optional[QuotaMeter] = None) -> Dict[str, Dict[str, Any]]:
+        """videos.list for any number of ids, 50 per call (1 unit each). Returns id -> item."""
+        ids = list(dict.fromkeys(v for v in video_ids if v))
+        out: Dict[str, Dict[str, Any]] = {}
+        for chunk in _chunks(ids, VIDEOS_PER_CALL):
+            data = self.call("videos", {"part": part, "id": ",".join(chunk), "maxResults": len(chunk)},
+                             api_key=api_key, meter=meter)
+            for item in data.get("items", []):
+                out[item["id"]] = item
+        return out
+
+    def channels_by_id(self, channel_ids: Iterable[str], part: str = "snippet,statistics,contentDetails",
+                       api_key: Optional[str] = None, meter: Optional[QuotaMeter] = None) -> Dict[str, Dict[str, Any]]:
+        """channels.list for any number of ids, 50 per call. Returns id -> item."""
+        ids = list(dict.fromkeys(c for c in channel_ids if c))
+        out: Dict[str, Dict[str, Any]] = {}
+        for chunk in _chunks(ids, VIDEOS_PER_CALL):
+            data = self.call("channels", {"part": part, "id": ",".join(chunk), "maxResults": len(chunk)},
+                             api_key=api_key, meter=meter)
+            for item in data.get("items", []):
+                out[item["id"]] = item
+        return out
+
+
+def video_stats(item: Optional[Dict[str, Any]]) -> Dict[str, Optional[int]]:
+    """views / likes / comments from a videos.list item (None when hidden or missing)."""
+    stats = (item or {}).get("statistics", {})
+    as_int = lambda v: int(v) if v is not None else None
+    return {
+        "views": as_int(stats.get("viewCount")),
+        "likes": as_int(stats.get("likeCount")),
+        "comments": as_int(stats.get("commentCount")),
+    }
+
+
+# Shared by every YouTube integration
+youtube_client = YouTubeClient()
@@ -1,14 +1,22 @@
+import json
 import logging
 import os
 import tempfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator
 import requests
 from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import yt_dlp
 
 # Import your classifier function
-from osint_fastapi_app.classifier import classify_text
+from osint_fastapi_app.classifier import classify_texts
+from osint_fastapi_app.data_sources.youtube_client import (
+    youtube_client, video_stats, YouTubeQuotaExceeded, YouTubeAPIError,
+)
+from osint_fastapi_app.data_sources.transcript_cache import transcript_cache, video_id_from_url
 
 # Logging
 logging.basicConfig(level=logging.INFO)
@@ -22,9 +30,130 @@ YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "AIzaSyANv9Sl58eelH4O2AWIK9uTWq9G
 # ===========================
 # 📌 Endpoint: Monitor YouTube
 # ===========================
+MAX_POSTS = 500            # search.list pages of 50 at 100 units each
+PAGE_SIZE = 50
+MAX_TRANSCRIPTS = 10
+TRANSCRIPT_WORKERS = 4
+TRANSCRIPT_CLASSIFY_CHARS = int(os.getenv("YOUTUBE_TRANSCRIPT_CLASSIFY_CHARS", "5000"))
+
+
+def _label(classification: dict) -> str:
+    if classification.get("is_hate_speech"):
+        return f"Hate Speech ({classification.get('category', 'N/A')})"
+    return "Safe"
+
+
+def _annotate_page(items: list) -> list:
+    """One search page -> monitor results: one videos.list call and one classifier batch."""
+    items = [item for item in items if item.get("id", {}).get("videoId")]
+    # One videos.list call (1 unit) for the statistics of the whole page
+    try:
+        stats = youtube_client.videos_by_id([item["id"]["videoId"] for item in items], api_key=YOUTUBE_API_KEY)
+    except (YouTubeQuotaExceeded, YouTubeAPIError, requests.exceptions.RequestException) as e:
+        logger.warning(f"Video statistics unavailable: {e}")
+        stats = {}
+    classifications = classify_texts(
+        [f"{item['snippet']['title']} {item['snippet'].get('description', '')}" for item in items]
+    )
+
+    results = []
+    for item, classification_result in zip(items, classifications):
+        video_id = item["id"]["videoId"]
+        snippet = item["snippet"]
+        results.append({
+            "video_id": video_id,
+            "title": snippet["title"],
+            "channel": snippet["channelTitle"],
+            "published_at": snippet["publishedAt"],
+            "description": snippet.get("description", ""),
+            "thumbnail": snippet["thumbnails"]["high"]["url"],
+            "video_url": f"https://www.youtube.com/watch?v={video_id}",
+            **video_stats(stats.get(video_id)),
+            "hate_speech_label": _label(classification_result),
+            "confidence": classification_result.get("confidence", 0.0),
+            "explanation": str(classification_result.get("explanation", ""))  # convert to string
+        })
+    return results
+
+
+def _iter_pages(keyword: str, max_posts: int) -> Iterator[list]:
+    """
+    Annotated results page by page, following nextPageToken past the
+    50-per-call limit. Each page is a cached search.list call; quota and
+    API errors propagate after the pages already yielded.
+    """
+    fetched = 0
+    page_token = None
+    while fetched < max_posts:
+        if page_token is None:
+            # First page keeps the key shared with /social-graph and the search cache
+            data = youtube_client.search(keyword, min(max_posts, PAGE_SIZE), api_key=YOUTUBE_API_KEY)
+        else:
+            data = youtube_client.search(keyword, PAGE_SIZE, api_key=YOUTUBE_API_KEY, pageToken=page_token)
+        items = data.get("items", [])[:max_posts - fetched]
+        fetched += len(items)
+        yield _annotate_page(items)
+        page_token = data.get("nextPageToken")
+        if not page_token or not items:
+            return
+
+
+def _transcript_result(video_id: str) -> dict:
+    """Transcript (through the shared cache) classified on its own."""
+    try:
+        transcript = transcript_cache.get(video_id)
+    except Exception as e:
+        return {"video_id": video_id, "available": False, "error": str(e)}
+    if not transcript["text"]:
+        return {"video_id": video_id, "available": False, "source": transcript["source"]}
+    classification = classify_texts([transcript["text"][:TRANSCRIPT_CLASSIFY_CHARS]])[0]
+    return {
+        "video_id": video_id,
+        "available": True,
+        "source": transcript["source"],
+        "language": transcript["language"],
+        "cached": transcript["cached"],
+        "hate_speech_label": _label(classification),
+        "confidence": classification.get("confidence", 0.0),
+        "explanation": str(classification.get("explanation", "")),
+    }
+
+
+def _monitor_events(keyword: str, max_posts: int, transcripts: int) -> Iterator[dict]:
+    """
+    {"type": "video"} events as each page is classified, then
+    {"type": "transcript"} for the top `transcripts` videos as their
+    transcripts finish (fetched in the background from the first page on),
+    then one {"type": "done"} event.
+    """
+    count = 0
+    error = None
+    quota_exceeded = False
+    pending = []
+    with ThreadPoolExecutor(max_workers=TRANSCRIPT_WORKERS) as pool:
+        try:
+            for page in _iter_pages(keyword, max_posts):
+                for result in page:
+                    if count < transcripts:
+                        pending.append(pool.submit(_transcript_result, result["video_id"]))
+                    count += 1
+                    yield dict(result, type="video")
+        except (YouTubeQuotaExceeded, YouTubeAPIError, requests.exceptions.RequestException) as e:
+            logger.error(f"Error fetching YouTube data: {str(e)}")
+            error = str(e)
+            quota_exceeded = isinstance(e, YouTubeQuotaExceeded)
+        for future in as_completed(pending):
+            yield dict(future.result(), type="transcript")
+    logger.info(f"Fetched {count} videos for keyword: {keyword}")
+    yield {"type": "done", "keyword": keyword, "total_results": count,
+           "transcripts": len(pending), "error": error, "quota_exceeded": quota_exceeded}
+
+
 @router.get("/monitor/youtube")
 def youtube_monitor(keyword: str = Query(..., description="Search keyword for YouTube videos"),
-                    max_posts: int = Query(10, description="Maximum number of videos to fetch")):
+                    max_posts: int = Query(10, ge=1, le=MAX_POSTS, description="Maximum number of videos to fetch"),
+                    transcripts: int = Query(0, ge=0, le=MAX_TRANSCRIPTS,
+                                             description="Also classify the transcripts of the top N videos")):
     """
     Fetch YouTube videos for a search keyword and classify them for hate speech.
     Returns a frontend-safe JSON structure.
@@ -32,54 +161,48 @@ def youtube_monitor(keyword: str = Query(..., description="Search keyword for Yo
     if not YOUTUBE_API_KEY or YOUTUBE_API_KEY == "YOUR_API_KEY_HERE":
         return {"error": "YouTube API key not found. Set YOUTUBE_API_KEY in environment."}
 
-    url = (
-        f"https://www.googleapis.com/youtube/v3/search"
-        f"?part=snippet&maxResults={max_posts}&q={keyword}&key={YOUTUBE_API_KEY}&type=video"
-    )
+    results = {}
+    error = None
+    quota_exceeded = False
+    for event in _monitor_events(keyword, max_posts, transcripts):
+        kind = event.pop("type")
+        if kind == "video":
+            results[event["video_id"]] = event
+        elif kind == "transcript":
+            results[event["video_id"]]["transcript"] = event
+        else:
+            error, quota_exceeded = event["error"], event["quota_exceeded"]
 
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-
-        results = []
-        for item in data.get("items", []):
-            video_id = item["id"]["videoId"]
-            snippet = item["snippet"]
-
-            text_to_classify = f"{snippet['title']} {snippet.get('description', '')}"
-
-            # Call classifier
-            classification_result = classify_text(text_to_classify)
-
-            # Simplify for frontend
-            label = "Safe"
-            if classification_result.get("is_hate_speech"):
-                label = f"Hate Speech ({classification_result.get('category', 'N/A')})"
-
-            results.append({
-                "title": snippet["title"],
-                "channel": snippet["channelTitle"],
-                "published_at": snippet["publishedAt"],
-                "description": snippet.get("description", ""),
-                "thumbnail": snippet["thumbnails"]["high"]["url"],
-                "video_url": f"https://www.youtube.com/watch?v={video_id}",
-                "hate_speech_label": label,
-                "confidence": classification_result.get("confidence", 0.0),
-                "explanation": str(classification_result.get("explanation", ""))  # convert to string
-            })
-
-        logger.info(f"Fetched {len(results)} videos for keyword: {keyword}")
-        return {
-            "tool": "YouTube Monitor",
-            "keyword": keyword,
-            "total_results": len(results),
-            "results": results
-        }
+    if error and not results:
+        if quota_exceeded:
+            return {"error": error, "quota": youtube_client.quota()}
+        return {"error": error}
+    response = {
+        "tool": "YouTube Monitor",
+        "keyword": keyword,
+        "total_results": len(results),
+        "results": list(results.values())
+    }
+    if error:
+        response.update(partial=True, error=error)
+    return response
 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching YouTube data: {str(e)}")
-        return {"error": str(e)}
+
+@router.get("/monitor/youtube/stream")
+def youtube_monitor_stream(keyword: str = Query(..., description="Search keyword for YouTube videos"),
+                           max_posts: int = Query(100, ge=1, le=MAX_POSTS),
+                           transcripts: int = Query(0, ge=0, le=MAX_TRANSCRIPTS)):
+    """Same results as /monitor/youtube as NDJSON lines, streamed page by page."""
+    if not YOUTUBE_API_KEY or YOUTUBE_API_KEY == "YOUR_API_KEY_HERE":
+        return {"error": "YouTube API key not found. Set YOUTUBE_API_KEY in environment."}
+    lines = (json.dumps(event) + "\n" for event in _monitor_events(keyword, max_posts, transcripts))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@router.get("/monitor/youtube/quota")
+def youtube_quota():
+    """Units spent today against the YouTube Data API daily quota, by call type."""
+    return dict(youtube_client.quota(), transcripts=transcript_cache.stats())
 
 
 # ===============================
@@ -139,6 +262,10 @@ async def transcribe_youtube(req: TranscribeRequest):
         ]
 
         full_text = " ".join([seg["text"] for seg in safe_segments])
+        video_id = video_id_from_url(req.url)
+        if video_id and full_text.strip():
+            # Whisper output is better than captions: later transcript lookups reuse it
+            transcript_cache.put(video_id, full_text.strip(), info.get("language"), "whisper")
 
         return {
             "url": req.url,
@@ -1,15 +1,242 @@
 # osint_fastapi_app/data_sources/youtube_profile_monitor.py
 import os
-import requests
+import re
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
 from fastapi import APIRouter, Query
 from dotenv import load_dotenv
 
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: fall back to the in-process lock only
+    fcntl = None
+
+from osint_fastapi_app.data_sources.youtube_client import (
+    youtube_client, QuotaMeter, YouTubeQuotaExceeded, YouTubeAPIError,
+)
+
 router = APIRouter()
 load_dotenv()  # loads variables from .env file
 
 # Get API key from environment
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "")
 
+BASE_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+os.makedirs(DATA_DIR, exist_ok=True)
+CHANNEL_CACHE_PATH = os.getenv("YOUTUBE_CHANNEL_CACHE", os.path.join(DATA_DIR, "youtube_channels.json"))
+MAX_CHANNELS = 50        # one channels.list call
+MAX_WORKERS = 8
+CHANNEL_ID_RE = re.compile(r"^UC[\w-]{22}$")
+HANDLE_RE = re.compile(r"^@?[\w.-]{3,30}$")
+
+
+# -------------------------
+# Channel name -> ID directory
+# -------------------------
+class ChannelDirectory:
+    """
+    Persistent channel name -> channel ID map (channel IDs never change).
+
+    Resolution is tried cheapest first: a literal UC... ID costs nothing,
+    a handle costs one channels.list unit, and only then a search (100
+    units). A resolved name is never looked up again, across restarts.
+    Misses are not stored, so a channel created later is still found.
+
+    The file is shared by all workers: a miss re-reads it if another
+    worker changed it, and saves merge with it under a file lock.
+    """
+
+    def __init__(self, path: str = CHANNEL_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._names: Dict[str, Dict[str, Any]] = {}
+        self._mtime = None
+        self._reload()
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return name.strip().casefold()
+
+    def _reload(self):
+        """Merge in names other workers saved since the last read. Caller holds self._lock (or is __init__)."""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        with open(self.path, encoding="utf-8") as f:
+            self._names = {**json.load(f), **self._names}
+        self._mtime = mtime
+
+    def _save(self):
+        """Write the merged directory. Caller holds self._lock."""
+        with open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._mtime = None
+                self._reload()
+                tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._names, f, indent=1)
+                os.replace(tmp_path, self.path)
+                self._mtime = os.stat(self.path).st_mtime
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, name: str) -> Optional[str]:
+        key = self._key(name)
+        with self._lock:
+            if key not in self._names:
+                self._reload()
+            entry = self._names.get(key)
+        return entry["id"] if entry else None
+
+    def remember(self, name: str, channel_id: str, via: str):
+        with self._lock:
+            self._names[self._key(name)] = {"id": channel_id, "via": via, "resolved_at": time.time()}
+            self._save()
+
+    def resolve(self, name: str, meter: Optional[QuotaMeter] = None) -> Optional[str]:
+        name = name.strip()
+        if CHANNEL_ID_RE.match(name):
+            return name
+        cached = self.get(name)
+        if cached:
+            return cached
+
+        if HANDLE_RE.match(name):
+            handle = name if name.startswith("@") else f"@{name}"
+            data = youtube_client.call("channels", {"part": "id", "forHandle": handle},
+                                       api_key=YOUTUBE_API_KEY, meter=meter)
+            items = data.get("items", [])
+            if items:
+                self.remember(name, items[0]["id"], "handle")
+                return items[0]["id"]
+
+        data = youtube_client.call("search", {
+            "part": "snippet",
+            "q": name,
+            "type": "channel",
+            "maxResults": 1,
+        }, api_key=YOUTUBE_API_KEY, meter=meter)
+        items = data.get("items", [])
+        if not items:
+            return None
+        channel_id = items[0]["snippet"]["channelId"]
+        self.remember(name, channel_id, "search")
+        return channel_id
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"channels": len(self._names), "path": self.path}
+
+
+channel_directory = ChannelDirectory()
+
+
+def uploads_playlist_id(channel_id: str) -> str:
+    """A channel's uploads playlist is its ID with the UC prefix swapped for UU."""
+    return f"UU{channel_id[2:]}"
+
+
+def latest_uploads(channel_id: str, max_videos: int, meter: Optional[QuotaMeter] = None) -> List[Dict[str, Any]]:
+    """Newest uploads via playlistItems (1 unit) instead of search?channelId (100 units)."""
+    data = youtube_client.call("playlistItems", {
+        "part": "snippet,contentDetails",
+        "playlistId": uploads_playlist_id(channel_id),
+        "maxResults": max_videos,
+    }, api_key=YOUTUBE_API_KEY, meter=meter)
+    latest = []
+    for it in data.get("items", []):
+        sn = it["snippet"]
+        vid = it["contentDetails"]["videoId"]
+        latest.append({
+            "title": sn["title"],
+            "link": f"https://www.youtube.com/watch?v={vid}",
+            "thumbnail": sn.get("thumbnails", {}).get("medium", {}).get("url", ""),
+            "published_at": it["contentDetails"].get("videoPublishedAt", sn.get("publishedAt")),
+        })
+    return latest
+
+
+def channel_summary(channel: Dict[str, Any], latest: List[Dict[str, Any]]) -> Dict[str, Any]:
+    snippet = channel.get("snippet", {})
+    stats = channel.get("statistics", {})
+    return {
+        "name": snippet.get("title", ""),
+        "description": snippet.get("description", ""),
+        "subscribers": stats.get("subscriberCount", "N/A"),
+        "videos": stats.get("videoCount"),
+        "views": stats.get("viewCount"),
+        "profile_pic": snippet.get("thumbnails", {}).get("default", {}).get("url", ""),
+        "url": f"https://www.youtube.com/channel/{channel['id']}",
+        "latest_videos": latest,
+    }
+
+
+def monitor_channels(names: List[str], max_videos: int = 5) -> Dict[str, Any]:
+    """
+    Summaries for many channels: names are resolved concurrently, then one
+    batched channels.list and one playlistItems call per channel run at
+    the same time (uploads playlist IDs follow from the channel IDs).
+    """
+    names = list(dict.fromkeys(n.strip() for n in names if n.strip()))[:MAX_CHANNELS]
+    meter = QuotaMeter()
+    errors: Dict[str, str] = {}
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        resolving = {name: pool.submit(channel_directory.resolve, name, meter) for name in names}
+        ids: Dict[str, str] = {}
+        for name, future in resolving.items():
+            try:
+                channel_id = future.result()
+            except (YouTubeQuotaExceeded, YouTubeAPIError, OSError) as e:
+                errors[name] = str(e)
+                continue
+            if channel_id:
+                ids[name] = channel_id
+            else:
+                errors[name] = f"No channel found for '{name}'."
+
+        unique_ids = list(dict.fromkeys(ids.values()))
+        channels_future = pool.submit(youtube_client.channels_by_id, unique_ids, "snippet,statistics",
+                                      YOUTUBE_API_KEY, meter)
+        uploads = {cid: pool.submit(latest_uploads, cid, max_videos, meter) for cid in unique_ids}
+
+        try:
+            channels = channels_future.result()
+        except (YouTubeQuotaExceeded, YouTubeAPIError, OSError) as e:
+            return {"error": f"YouTube monitor failed: {e}", "errors": errors}
+
+        results = []
+        for name, channel_id in ids.items():
+            channel = channels.get(channel_id)
+            if channel is None:
+                errors[name] = f"Channel {channel_id} not found."
+                continue
+            try:
+                latest = uploads[channel_id].result()
+            except (YouTubeQuotaExceeded, YouTubeAPIError, OSError) as e:
+                # Private or empty uploads playlist: the summary is still useful
+                latest = []
+                errors[name] = f"Latest videos unavailable: {e}"
+            results.append(dict(channel_summary(channel, latest), query=name))
+
+    return {
+        "channels": results,
+        "errors": errors,
+        "quota_units_used": meter.units,
+    }
+
+
 @router.get("/youtube-channel-monitor")
 def youtube_channel_monitor(channel_name: str = Query(..., alias="channel_name")):
     """
@@ -19,71 +246,28 @@ def youtube_channel_monitor(channel_name: str = Query(..., alias="channel_name")
     if not YOUTUBE_API_KEY:
         return {"error": "YOUTUBE_API_KEY not set in environment."}
 
-    try:
-        # Step 1: search for channel
-        search = requests.get(
-            "https://www.googleapis.com/youtube/v3/search",
-            params={
-                "part": "snippet",
-                "q": channel_name,
-                "type": "channel",
-                "maxResults": 1,
-                "key": YOUTUBE_API_KEY
-            }, timeout=12
-        ).json()
-
-        items = search.get("items", [])
-        if not items:
-            return {"error": f"No channel found for '{channel_name}'."}
+    result = monitor_channels([channel_name])
+    if "error" in result:
+        return {"error": result["error"]}
+    if not result["channels"]:
+        return {"error": result["errors"].get(channel_name.strip(), f"No channel found for '{channel_name}'.")}
+    summary = result["channels"][0]
+    summary.pop("query", None)
+    return summary
 
-        channel_id = items[0]["snippet"]["channelId"]
-        channel_title = items[0]["snippet"]["title"]
-        channel_desc = items[0]["snippet"].get("description", "")
-        channel_thumb = items[0]["snippet"]["thumbnails"].get("default", {}).get("url", "")
-
-        # Step 2: channel stats
-        chans = requests.get(
-            "https://www.googleapis.com/youtube/v3/channels",
-            params={
-                "part": "statistics,snippet",
-                "id": channel_id,
-                "key": YOUTUBE_API_KEY
-            }, timeout=12
-        ).json()
-        stats = (chans.get("items") or [{}])[0].get("statistics", {})
-        subs = stats.get("subscriberCount", "N/A")
-
-        # Step 3: latest videos
-        vids = requests.get(
-            "https://www.googleapis.com/youtube/v3/search",
-            params={
-                "part": "snippet",
-                "channelId": channel_id,
-                "order": "date",
-                "maxResults": 5,
-                "type": "video",
-                "key": YOUTUBE_API_KEY
-            }, timeout=12
-        ).json()
-
-        latest = []
-        for it in vids.get("items", []):
-            vid = it["id"]["videoId"]
-            sn = it["snippet"]
-            latest.append({
-                "title": sn["title"],
-                "link": f"https://www.youtube.com/watch?v={vid}",
-                "thumbnail": sn["thumbnails"].get("medium", {}).get("url", "")
-            })
-
-        return {
-            "name": channel_title,
-            "description": channel_desc,
-            "subscribers": subs,
-            "profile_pic": channel_thumb,
-            "url": f"https://www.youtube.com/channel/{channel_id}",
-            "latest_videos": latest
-        }
-
-    except Exception as e:
-        return {"error": f"YouTube monitor failed: {e}"}
+
+@router.get("/youtube-channel-monitor/batch")
+def youtube_channel_monitor_batch(
+    channels: List[str] = Query(..., description="Channel names, handles or IDs (repeat or comma-separate)"),
+    max_videos: int = Query(5, ge=1, le=50),
+):
+    """Summaries + latest videos for up to 50 channels in one call."""
+    if not YOUTUBE_API_KEY:
+        return {"error": "YOUTUBE_API_KEY not set in environment."}
+    names = [n for value in channels for n in value.split(",")]
+    return monitor_channels(names, max_videos)
+
+
+@router.get("/youtube-channel-monitor/directory")
+def youtube_channel_directory():
+    return channel_directory.stats()
@@ -0,0 +1,162 @@
+# osint_fastapi_app/data_sources/youtube_search.py
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from youtubesearchpython import VideosSearch
+
+from osint_fastapi_app.data_sources.search_cache import search_cache, normalize_query
+
+# -------------------------
+# Config
+# -------------------------
+CURSOR_TTL = float(os.getenv("YOUTUBE_SEARCH_CURSOR_TTL", "1800"))   # seconds a page token stays usable
+MAX_CURSORS = int(os.getenv("YOUTUBE_SEARCH_MAX_CURSORS", "500"))
+MAX_PAGE = 20
+
+
+class PageTokenExpired(Exception):
+    pass
+
+
+def video_to_dict(video: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": video["title"],
+        "duration": video.get("duration"),
+        "link": video["link"],
+        "views": (video.get("viewCount") or {}).get("short"),
+        "thumbnails": video.get("thumbnails", []),
+        "channel": (video.get("channel") or {}).get("name"),
+    }
+
+
+class _Cursor:
+    """One scraper session; it can only move forward, one page at a time."""
+
+    def __init__(self, query: str, limit: int):
+        self.query = query
+        self.limit = limit
+        self.search: Optional[VideosSearch] = None
+        self.page = -1
+        self.exhausted = False
+        self.used_at = time.time()
+        self.lock = threading.Lock()
+
+
+# -------------------------
+# Paged search
+# -------------------------
+class YouTubeSearch:
+    """
+    Scraped YouTube search with cached, resumable pages.
+
+    Pages are cached in the shared search cache under (query, limit,
+    page), so repeated and typeahead-style queries are served without a
+    scrape, and identical concurrent queries share one. Page 0 opens a
+    scraper session (cursor); the returned `next_page_token` names the
+    cursor and the page after it, and following it advances that same
+    session. Cursors are dropped after CURSOR_TTL or past MAX_CURSORS; a
+    cached first page whose cursor is gone counts as a miss.
+    """
+
+    def __init__(self, cursor_ttl: float = CURSOR_TTL, max_cursors: int = MAX_CURSORS):
+        self.cursor_ttl = cursor_ttl
+        self.max_cursors = max_cursors
+        self._cursors: "OrderedDict[str, _Cursor]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _new_cursor(self, query: str, limit: int) -> Tuple[str, _Cursor]:
+        cursor_id = uuid.uuid4().hex[:16]
+        cursor = _Cursor(query, limit)
+        now = time.time()
+        with self._lock:
+            self._cursors[cursor_id] = cursor
+            while self._cursors:
+                oldest_id, oldest = next(iter(self._cursors.items()))
+                if len(self._cursors) <= self.max_cursors and now - oldest.used_at < self.cursor_ttl:
+                    break
+                self._cursors.pop(oldest_id)
+        return cursor_id, cursor
+
+    def _get_cursor(self, cursor_id: str) -> _Cursor:
+        with self._lock:
+            cursor = self._cursors.get(cursor_id)
+            if cursor is None or time.time() - cursor.used_at >= self.cursor_ttl:
+                self._cursors.pop(cursor_id, None)
+                raise PageTokenExpired("Page token expired; repeat the search from the first page.")
+            self._cursors.move_to_end(cursor_id)
+            cursor.used_at = time.time()
+            return cursor
+
+    def _has_cursor(self, cursor_id: str) -> bool:
+        with self._lock:
+            cursor = self._cursors.get(cursor_id)
+            return cursor is not None and time.time() - cursor.used_at < self.cursor_ttl
+
+    @staticmethod
+    def _advance(cursor: _Cursor, page: int) -> List[Dict[str, Any]]:
+        """Move `cursor` to `page` (forward only) and return that page's videos."""
+        with cursor.lock:
+            if page < cursor.page:
+                raise PageTokenExpired("Page is no longer cached; repeat the search from the first page.")
+            if cursor.search is None:
+                cursor.search = VideosSearch(cursor.query, limit=cursor.limit)
+                cursor.page = 0
+            while cursor.page < page and not cursor.exhausted:
+                if not cursor.search.next():
+                    cursor.exhausted = True
+                    return []
+                cursor.page += 1
+            if cursor.exhausted and cursor.page < page:
+                return []
+            return [video_to_dict(v) for v in cursor.search.result().get("result", [])]
+
+    def _page(self, cursor_id: str, cursor: _Cursor, page: int) -> Dict[str, Any]:
+        videos = self._advance(cursor, page)
+        has_more = bool(videos) and page + 1 < MAX_PAGE
+        return {
+            "results": videos,
+            "page": page,
+            "next_page_token": f"{cursor_id}:{page + 1}" if has_more else None,
+        }
+
+    def search(self, query: str, limit: int = 5, page_token: Optional[str] = None) -> Dict[str, Any]:
+        """One page of results. Raises PageTokenExpired for unknown, stale or malformed tokens."""
+        if page_token:
+            cursor_id, _, page_str = page_token.partition(":")
+            if not page_str.isdigit():
+                raise PageTokenExpired("Malformed page token.")
+            page = int(page_str)
+            cursor = self._get_cursor(cursor_id)
+            if cursor.limit != limit or normalize_query(cursor.query) != normalize_query(query):
+                raise PageTokenExpired("Page token belongs to a different search.")
+            return search_cache.get_or_fetch(
+                "youtube_scrape", query, {"limit": limit, "cursor": cursor_id, "page": page},
+                lambda: self._page(cursor_id, cursor, page),
+                cache_if=lambda data: bool(data["results"]),
+            )
+
+        def first_page():
+            cursor_id, cursor = self._new_cursor(query, limit)
+            return self._page(cursor_id, cursor, 0)
+
+        params = {"limit": limit, "page": 0}
+        data = search_cache.get_or_fetch("youtube_scrape", query, params, first_page,
+                                         cache_if=lambda page: bool(page["results"]))
+        token = data["next_page_token"]
+        if token and not self._has_cursor(token.partition(":")[0]):
+            # Its cursor was evicted: the cached page would hand out a dead token
+            search_cache.invalidate("youtube_scrape", query, params)
+            data = search_cache.get_or_fetch("youtube_scrape", query, params, first_page,
+                                             cache_if=lambda page: bool(page["results"]))
+        return data
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"cursors": len(self._cursors), "cursor_ttl": self.cursor_ttl}
+
+
+youtube_search = YouTubeSearch()
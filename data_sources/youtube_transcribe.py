@@ -9,6 +9,8 @@ from yt_dlp import YoutubeDL
 import json
 import time
 
+from osint_fastapi_app.data_sources.transcript_cache import transcript_cache, video_id_from_url
+
 router = APIRouter(prefix="/youtube", tags=["YouTube Transcription"])
 
 
@@ -71,13 +73,18 @@ def transcribe_youtube(req: YTRequest):
                 "full_text": ""
             }
 
+        full_text = " ".join([s["text"] for s in segs_list]).strip()
+        video_id = video_id_from_url(req.url)
+        if video_id:
+            transcript_cache.put(video_id, full_text, info.language, "whisper")
+
         return {
             "url": req.url,
             "language": info.language,
             "language_probability": float(info.language_probability),
             "duration": float(info.duration),
             "segments": segs_list,
-            "full_text": " ".join([s["text"] for s in segs_list]).strip()
+            "full_text": full_text
         }
 
     except Exception as e:
@@ -2,8 +2,9 @@ from dotenv import load_dotenv
 import os
 from pathlib import Path
 import time
-import feedparser
-from fastapi import FastAPI, Request, Form, Query, APIRouter
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import FastAPI, Request, Form, Query, APIRouter, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse, FileResponse
@@ -34,11 +35,14 @@ from osint_fastapi_app.data_sources import image_text_ocr
 from osint_fastapi_app.data_sources.graph_routes import router as graph_router
 from osint_fastapi_app.classification_routes import router as classification_router
 from osint_fastapi_app.data_sources import phone_lookup, github_monitor, social_graph
+from osint_fastapi_app.data_sources.feed_fetcher import feed_poller, load_feed_list
+from osint_fastapi_app.data_sources.rss_index import rss_index
+from osint_fastapi_app.data_sources.custom_feed import custom_feed_cache
 
 # YouTube Search
-from youtubesearchpython import VideosSearch
+from fastapi.concurrency import run_in_threadpool
+from osint_fastapi_app.data_sources.youtube_search import youtube_search, PageTokenExpired
 import requests
-from osint_fastapi_app.classifier import classify_text
 
 # ⚙️ FastAPI App Initialization
 app = FastAPI(title="OSINT FastAPI App", version="1.0.0")
@@ -115,44 +119,58 @@ def maigret_scan(username: str):
 # ----------------------------
 # RSS Feed Endpoints
 # ----------------------------
-RSS_FEEDS = [
+DEFAULT_RSS_FEEDS = [
     "https://rss.nytimes.com/services/xml/rss/nyt/Technology.xml",
     "http://feeds.bbci.co.uk/news/technology/rss.xml",
     "https://www.theverge.com/rss/index.xml"
 ]
+RSS_FEEDS = list(load_feed_list("RSS_SEARCH_FEEDS_FILE", {url: url for url in DEFAULT_RSS_FEEDS}).values())
+
+feed_poller.register(RSS_FEEDS)
+
+def _parse_date(value: Optional[str], name: str) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be an ISO 8601 date, e.g. 2024-05-01")
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
 
 @app.get("/api/rss")
-def get_rss_posts(keyword: str = Query(...), max_posts: int = 5):
-    results = []
-    for feed_url in RSS_FEEDS:
-        feed = feedparser.parse(feed_url)
-        for entry in feed.entries:
-            if keyword.lower() in entry.title.lower() or keyword.lower() in entry.summary.lower():
-                results.append({
-                    "title": entry.title,
-                    "link": entry.link,
-                    "summary": entry.summary,
-                    "published": entry.get("published")
-                })
-            if len(results) >= max_posts:
-                break
-        if len(results) >= max_posts:
-            break
-    return results
+def get_rss_posts(keyword: str = Query(...), max_posts: int = 5,
+                  since: Optional[str] = None, until: Optional[str] = None):
+    """Ranked keyword search over the indexed entries of RSS_FEEDS, optionally within a publish-date window."""
+    feed_poller.snapshot(RSS_FEEDS)  # fetches feeds never polled yet, bounded by RSS_DEADLINE
+    hits = rss_index.search(
+        keyword, limit=max_posts,
+        since=_parse_date(since, "since"), until=_parse_date(until, "until"),
+        feeds=RSS_FEEDS,
+    )
+    return [
+        {
+            "title": entry["title"],
+            "link": entry["link"],
+            "summary": entry["summary"],
+            "published": entry["published"] or None
+        }
+        for entry in hits
+    ]
+
+@app.get("/api/rss/index")
+def get_rss_index_stats():
+    return rss_index.stats()
 
 @app.get("/api/rss/custom")
 def get_custom_rss(feed_url: str = Query(...), max_posts: int = 5):
+    """First `max_posts` entries of any feed; the download stops once they are parsed."""
     decoded_url = unquote(feed_url)
-    feed = feedparser.parse(decoded_url)
-    results = []
-    for entry in feed.entries[:max_posts]:
-        results.append({
-            "title": entry.title,
-            "link": entry.link,
-            "summary": entry.get("summary", ""),
-            "published": entry.get("published", "")
-        })
-    return results
+    try:
+        return custom_feed_cache.fetch(decoded_url, max(1, min(max_posts, 200)))
+    except requests.RequestException as e:
+        raise HTTPException(status_code=502, detail=f"Could not fetch feed: {e}")
 
 # ----------------------------
 # YouTube Search Router
@@ -160,75 +178,21 @@ def get_custom_rss(feed_url: str = Query(...), max_posts: int = 5):
 youtube_search_router = APIRouter(prefix="/youtube", tags=["YouTube"])
 
 @youtube_search_router.get("/search")
-def search_youtube(query: str = Query(..., description="Search term for YouTube"), limit: int = 5):
+async def search_youtube(query: str = Query(..., description="Search term for YouTube"),
+                         limit: int = Query(5, ge=1, le=50),
+                         page_token: Optional[str] = Query(None, description="next_page_token from a previous page")):
+    """Scraped search; pages are cached and identical concurrent queries share one scrape."""
     try:
-        videos_search = VideosSearch(query, limit=limit)
-        results = videos_search.result()
-        videos = [
-            {
-                "title": video["title"],
-                "duration": video.get("duration"),
-                "link": video["link"],
-                "views": video.get("viewCount", {}).get("short"),
-                "thumbnails": video.get("thumbnails", []),
-                "channel": video.get("channel", {}).get("name"),
-            }
-            for video in results["result"]
-        ]
-        return {"query": query, "results": videos}
+        # The scraper is blocking: keep it off the event loop
+        page = await run_in_threadpool(youtube_search.search, query, limit, page_token)
+    except PageTokenExpired as e:
+        raise HTTPException(status_code=410, detail=str(e))
     except Exception as e:
         return {"error": str(e)}
+    return {"query": query, **page}
 
 app.include_router(youtube_search_router)
 
-# ----------------------------
-# YouTube Monitor with Hate Speech Classification
-# ----------------------------
-YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "")
-
-youtube_monitor_router2 = APIRouter(prefix="/monitor", tags=["YouTube Monitor"])
-
-@youtube_monitor_router2.get("/youtube")
-def youtube_monitor(keyword: str = Query(..., description="Search keyword for YouTube videos")):
-    if not YOUTUBE_API_KEY:
-        return {"error": "YouTube API key not found in environment variables"}
-    url = (
-        "https://www.googleapis.com/youtube/v3/search"
-        f"?part=snippet&maxResults=10&q={keyword}&key={YOUTUBE_API_KEY}&type=video"
-    )
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        results = []
-        for item in data.get("items", []):
-            video_id = item["id"]["videoId"]
-            snippet = item["snippet"]
-            text_to_classify = f"{snippet['title']} {snippet.get('description', '')}"
-            classification_result = classify_text(text_to_classify)
-            label = f"Hate Speech ({classification_result['category']})" if classification_result["is_hate_speech"] else "Safe"
-            results.append({
-                "title": snippet["title"],
-                "channel": snippet["channelTitle"],
-                "published_at": snippet["publishedAt"],
-                "description": snippet.get("description", ""),
-                "thumbnail": snippet["thumbnails"]["high"]["url"],
-                "video_url": f"https://www.youtube.com/watch?v={video_id}",
-                "hate_speech_label": label,
-                "confidence": classification_result["confidence"],
-                "explanation": classification_result["explanation"]
-            })
-        return {
-            "tool": "YouTube Monitor",
-            "keyword": keyword,
-            "total_results": len(results),
-            "results": results
-        }
-    except requests.exceptions.RequestException as e:
-        return {"error": str(e)}
-
-app.include_router(youtube_monitor_router2)
-
 # ----------------------------
 # Serve React Frontend
 # ----------------------------